@@ -1,9 +1,37 @@
-from typing import List, Dict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
 from app.ai.embeddings import cosine_similarity
 from app.core.logging import get_logger
+from app.services.skill_vocabulary import jaccard_scores, skill_vocabulary
 
 logger = get_logger(__name__)
 
+# Component weights of the overall match score
+SEMANTIC_WEIGHT = 0.5
+SKILLS_WEIGHT = 0.3
+EXPERIENCE_WEIGHT = 0.1
+LOCATION_WEIGHT = 0.1
+
+EXPERIENCE_LEVELS = ["entry", "mid", "senior", "lead", "executive"]
+_LEVEL_INDEX = {level: idx for idx, level in enumerate(EXPERIENCE_LEVELS)}
+_UNKNOWN_LEVEL = len(EXPERIENCE_LEVELS)
+
+
+def _build_experience_table() -> np.ndarray:
+    """Experience scores indexed by (seeker level, job level); the last row/column is unknown."""
+    size = len(EXPERIENCE_LEVELS) + 1
+    table = np.full((size, size), 0.5)
+    for seeker_idx in range(len(EXPERIENCE_LEVELS)):
+        for job_idx in range(len(EXPERIENCE_LEVELS)):
+            distance = abs(seeker_idx - job_idx)
+            table[seeker_idx, job_idx] = {0: 1.0, 1: 0.7, 2: 0.4}.get(distance, 0.1)
+    return table
+
+
+EXPERIENCE_SCORES = _build_experience_table()
+
 
 def jaccard_similarity(set1: List[str], set2: List[str]) -> float:
     """Calculate Jaccard similarity between two sets"""
@@ -19,27 +47,26 @@ def jaccard_similarity(set1: List[str], set2: List[str]) -> float:
     return intersection / union if union > 0 else 0.0
 
 
+def skill_jaccard_similarity(set1: List[str], set2: List[str]) -> float:
+    """Jaccard similarity of two skill lists after taxonomy normalization"""
+    if not set1 or not set2:
+        return 0.0
+    
+    # set1 holds the job's skills; set2 (profile input) is not registered
+    bits1, size1 = skill_vocabulary.encode_sets([set1], register=True)
+    bits2, size2 = skill_vocabulary.encode_sets([set2])
+    return float(jaccard_scores(bits1[0], bits2, size1[0], size2)[0])
+
+
 def match_experience_level(seeker_experience: str, job_level: str) -> float:
     """Match experience levels"""
-    levels = ["entry", "mid", "senior", "lead", "executive"]
-    
-    try:
-        seeker_idx = levels.index(seeker_experience.lower())
-        job_idx = levels.index(job_level.lower())
-        
-        # Perfect match
-        if seeker_idx == job_idx:
-            return 1.0
-        # Close match (±1 level)
-        elif abs(seeker_idx - job_idx) == 1:
-            return 0.7
-        # Acceptable match (±2 levels)
-        elif abs(seeker_idx - job_idx) == 2:
-            return 0.4
-        else:
-            return 0.1
-    except ValueError:
-        return 0.5  # Default if levels not found
+    # 1.0 for the same level, 0.7 / 0.4 for one / two levels apart, 0.1
+    # beyond that and 0.5 when either level is unknown
+    return float(EXPERIENCE_SCORES[_level_index(seeker_experience), _level_index(job_level)])
+
+
+def _level_index(level: Optional[str]) -> int:
+    return _LEVEL_INDEX.get((level or "").lower(), _UNKNOWN_LEVEL)
 
 
 def match_location(seeker_preferences: dict, job_location: dict) -> float:
@@ -84,7 +111,7 @@ def calculate_match_score(
     # 2. Skills Match (30%)
     job_skills = job_data.get("skills_required", [])
     profile_skills = profile_data.get("skills", [])
-    skills_score = jaccard_similarity(job_skills, profile_skills)
+    skills_score = skill_jaccard_similarity(job_skills, profile_skills)
     
     # 3. Experience Level Match (10%)
     experience_score = match_experience_level(
@@ -100,10 +127,10 @@ def calculate_match_score(
     
     # Weighted combination
     final_score = (
-        semantic_score * 0.5 +
-        skills_score * 0.3 +
-        experience_score * 0.1 +
-        location_score * 0.1
+        semantic_score * SEMANTIC_WEIGHT +
+        skills_score * SKILLS_WEIGHT +
+        experience_score * EXPERIENCE_WEIGHT +
+        location_score * LOCATION_WEIGHT
     ) * 100
     
     return {
@@ -115,6 +142,171 @@ def calculate_match_score(
     }
 
 
+def _batch_jaccard(
+    query_skills: List[str], candidate_skills: Sequence[List[str]], candidates_are_jobs: bool = False
+) -> np.ndarray:
+    """
+    Jaccard similarity of ``query_skills`` against every candidate skill list.
+
+    Only the job side is registered in the skill vocabulary: the query when
+    scoring profiles for a job, the candidates when scoring jobs for a profile.
+    """
+    if not query_skills:
+        return np.zeros(len(candidate_skills))
+    # Encode the job side first so the other side can match skills it registers
+    if candidates_are_jobs:
+        candidates, candidate_sizes = skill_vocabulary.encode_sets(candidate_skills, register=True)
+        query, query_size = skill_vocabulary.encode_sets([query_skills])
+    else:
+        query, query_size = skill_vocabulary.encode_sets([query_skills], register=True)
+        candidates, candidate_sizes = skill_vocabulary.encode_sets(candidate_skills)
+    return jaccard_scores(query[0], candidates, query_size[0], candidate_sizes)
+
+
+def _batch_cosine(
+    query_embedding: Optional[List[float]],
+    candidate_embeddings: Optional[Sequence[Optional[List[float]]]],
+    count: int,
+) -> np.ndarray:
+    """
+    Cosine similarity of one embedding against many.
+
+    Mirrors ``calculate_match_score``: 0.5 when either embedding is missing
+    and 0.0 when the dimensions disagree or a vector has zero magnitude.
+    """
+    scores = np.full(count, 0.5)
+    if not query_embedding or candidate_embeddings is None:
+        return scores
+
+    query = np.asarray(query_embedding, dtype=np.float64)
+    rows = [idx for idx, vector in enumerate(candidate_embeddings) if vector]
+    matching_rows = [idx for idx in rows if len(candidate_embeddings[idx]) == len(query)]
+    scores[rows] = 0.0
+    if not matching_rows:
+        return scores
+
+    matrix = np.asarray([candidate_embeddings[idx] for idx in matching_rows], dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    dots = matrix @ query
+    scores[matching_rows] = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+    return scores
+
+
+def _location_scores(preferences: dict, job_locations: Sequence[dict]) -> np.ndarray:
+    """Location scores of one seeker's preferences against many job locations."""
+    seeker_relocates = preferences.get("willing_to_relocate", False)
+    preferred_locs = [loc.lower() for loc in preferences.get("preferred_locations", [])]
+
+    # Each distinct city is matched against the preferences once
+    city_scores: Dict[str, float] = {}
+    scores = np.empty(len(job_locations))
+    for idx, job_location in enumerate(job_locations):
+        if job_location.get("is_remote", False):
+            scores[idx] = 1.0
+            continue
+        if seeker_relocates:
+            scores[idx] = 0.8
+            continue
+        job_city = job_location.get("city", "").lower()
+        if job_city not in city_scores:
+            matched = any(loc in job_city or job_city in loc for loc in preferred_locs)
+            city_scores[job_city] = 1.0 if matched else 0.3
+        scores[idx] = city_scores[job_city]
+    return scores
+
+
+def _score_breakdowns(
+    semantic: np.ndarray,
+    skills: np.ndarray,
+    experience: np.ndarray,
+    location: np.ndarray,
+) -> List[Dict[str, float]]:
+    total = (
+        semantic * SEMANTIC_WEIGHT +
+        skills * SKILLS_WEIGHT +
+        experience * EXPERIENCE_WEIGHT +
+        location * LOCATION_WEIGHT
+    ) * 100
+    columns = zip(
+        total.tolist(),
+        (semantic * 100).tolist(),
+        (skills * 100).tolist(),
+        (experience * 100).tolist(),
+        (location * 100).tolist(),
+    )
+    return [
+        {
+            "total_score": round(total_score, 2),
+            "semantic_score": round(semantic_score, 2),
+            "skills_score": round(skills_score, 2),
+            "experience_score": round(experience_score, 2),
+            "location_score": round(location_score, 2),
+        }
+        for total_score, semantic_score, skills_score, experience_score, location_score in columns
+    ]
+
+
+def score_jobs_for_profile(
+    profile_data: dict,
+    jobs_data: Sequence[dict],
+    profile_embedding: List[float] = None,
+    job_embeddings: Sequence[Optional[List[float]]] = None,
+) -> List[Dict[str, float]]:
+    """
+    Score one profile against many jobs in a single vectorized pass.
+
+    Returns one breakdown per job, in order, identical to calling
+    ``calculate_match_score`` for each pair.
+    """
+    if not jobs_data:
+        return []
+
+    semantic = _batch_cosine(profile_embedding, job_embeddings, len(jobs_data))
+    skills = _batch_jaccard(
+        profile_data.get("skills", []),
+        [job.get("skills_required", []) for job in jobs_data],
+        candidates_are_jobs=True,
+    )
+    seeker_level = _level_index(profile_data.get("experience_level", "mid"))
+    job_levels = np.array([_level_index(job.get("experience_level", "mid")) for job in jobs_data])
+    experience = EXPERIENCE_SCORES[seeker_level, job_levels]
+    location = _location_scores(
+        profile_data.get("preferences", {}),
+        [job.get("location", {}) for job in jobs_data],
+    )
+    return _score_breakdowns(semantic, skills, experience, location)
+
+
+def score_profiles_for_job(
+    job_data: dict,
+    profiles_data: Sequence[dict],
+    job_embedding: List[float] = None,
+    profile_embeddings: Sequence[Optional[List[float]]] = None,
+) -> List[Dict[str, float]]:
+    """
+    Score many profiles against one job, e.g. for an employer's applicants.
+
+    Returns one breakdown per profile, in order.
+    """
+    if not profiles_data:
+        return []
+
+    semantic = _batch_cosine(job_embedding, profile_embeddings, len(profiles_data))
+    skills = _batch_jaccard(
+        job_data.get("skills_required", []),
+        [profile.get("skills", []) for profile in profiles_data],
+    )
+    job_level = _level_index(job_data.get("experience_level", "mid"))
+    seeker_levels = np.array([_level_index(profile.get("experience_level", "mid")) for profile in profiles_data])
+    experience = EXPERIENCE_SCORES[seeker_levels, job_level]
+    job_location = job_data.get("location", {})
+    location = np.array([
+        match_location(profile.get("preferences", {}), job_location)
+        for profile in profiles_data
+    ])
+    return _score_breakdowns(semantic, skills, experience, location)
+
+
 def generate_match_explanation(scores: Dict[str, float]) -> str:
     """Generate human-readable explanation of match"""
     explanations = []
@@ -22,6 +22,7 @@ from app.models.application import (
 )
 from app.models.job import Job
 from app.models.user import User
+from app.services.match_worker import match_score_worker
 from app.services.notifications import dispatch_status_notifications
 from app.services.logging import logger as event_logger
 from app.schemas.events import BaseEvent, EventType
@@ -79,6 +80,9 @@ async def apply_to_job(
     )
     await application.insert()
     
+    # Match score is computed off the request path
+    match_score_worker.enqueue_application(str(application.id))
+    
     # Log event
     event_logger.log_application_submitted(
         candidate_id=str(current_user.id),
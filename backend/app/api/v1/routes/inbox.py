@@ -13,6 +13,12 @@ from app.models.user import User
 
 INBOX_STATUSES = ["applied", "viewed", "shortlisted", "interview", "rejected"]
 
+# "match" is served by the (job_id, ai_match_score) index when filtered by job
+INBOX_SORTS = {
+    "recent": [("updated_at", -1)],
+    "match": [("ai_match_score", -1), ("updated_at", -1)],
+}
+
 
 class InboxCounts(BaseModel):
     applied: int = 0
@@ -28,6 +34,7 @@ class InboxItem(BaseModel):
     candidate_email: Optional[str]
     status: str
     updated_at: datetime
+    ai_match_score: Optional[float] = None
 
 
 class InboxResponse(BaseModel):
@@ -45,12 +52,15 @@ router = APIRouter()
 @router.get("/applications", response_model=InboxResponse)
 async def list_applications(
     status_filter: str = Query("all", alias="status"),
+    job_id: Optional[str] = None,
+    sort_by: str = Query("recent", pattern="^(recent|match)$"),
     current_user: User = Depends(require_role("employer")),
 ):
     if status_filter != "all" and status_filter not in INBOX_STATUSES:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status filter")
 
-    applications = await Application.find_all().to_list()
+    query = {"job_id": job_id} if job_id else {}
+    applications = await Application.find(query).sort(INBOX_SORTS[sort_by]).to_list()
     counts = Counter(app.status for app in applications)
     counts_payload = InboxCounts(
         **{status_name: counts.get(status_name, 0) for status_name in INBOX_STATUSES}
@@ -70,6 +80,7 @@ async def list_applications(
                 candidate_email=user.email if user else None,
                 status=app.status,
                 updated_at=app.updated_at,
+                ai_match_score=app.ai_match_score,
             )
         )
 
@@ -102,4 +113,5 @@ async def update_application_status(
         candidate_email=user.email if user else None,
         status=app.status,
         updated_at=app.updated_at,
+        ai_match_score=app.ai_match_score,
     )
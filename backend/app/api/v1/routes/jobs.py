@@ -12,6 +12,8 @@ from beanie import PydanticObjectId
 from app.models.job import Job, JobCreate, JobUpdate, JobResponse, JobStatus
 from app.api.deps import require_role, get_current_user
 from app.models.user import User
+from app.services.geo import assign_job_coordinates
+from app.services.match_worker import match_score_worker
 from app.services.logging import logger as event_logger
 from app.schemas.events import BaseEvent, EventType, EventSeverity
 
@@ -103,6 +105,7 @@ async def create_job(
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow()
     )
+    assign_job_coordinates(job)
     await job.insert()
     
     # Log the event
@@ -145,8 +148,11 @@ async def update_job(
     if update_data:
         for field, value in update_data.items():
             setattr(job, field, value)
+        if update_data.keys() & {"location", "city", "state"}:
+            assign_job_coordinates(job)
         job.updated_at = datetime.utcnow()
         await job.save()
+        match_score_worker.recompute_job(str(job.id))
         
         # Log the event
         event_logger.log_event(
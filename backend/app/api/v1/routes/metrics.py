@@ -7,10 +7,10 @@ and observability dashboards.
 from datetime import datetime, timedelta
 from typing import Optional
 
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends
 from pydantic import BaseModel
 
-from app.services.metrics import metrics_service, KPIMetrics, TimeSeriesMetric
+from app.services.metrics import metrics_service, KPIMetrics, TimeSeriesMetric, TIME_SERIES_METRICS
 from app.api.deps import get_current_user
 from app.models.user import User
 
@@ -51,7 +51,7 @@ async def get_kpis(
     employers see their own metrics.
     """
     # Calculate KPIs
-    kpis = metrics_service.get_kpis(
+    kpis = await metrics_service.query_kpis(
         start_date=start_date,
         end_date=end_date,
     )
@@ -74,7 +74,8 @@ async def get_ctr_timeseries(
     """
     bucket_size = timedelta(hours=bucket_hours)
     
-    time_series = metrics_service.get_ctr_time_series(
+    time_series = await metrics_service.query_time_series(
+        "ctr",
         start_date=start_date,
         end_date=end_date,
         bucket_size=bucket_size,
@@ -97,7 +98,8 @@ async def get_conversion_timeseries(
     """
     bucket_size = timedelta(hours=bucket_hours)
     
-    time_series = metrics_service.get_conversion_time_series(
+    time_series = await metrics_service.query_time_series(
+        "conversion",
         start_date=start_date,
         end_date=end_date,
         bucket_size=bucket_size,
@@ -106,6 +108,33 @@ async def get_conversion_timeseries(
     return TimeSeriesResponse(data=time_series)
 
 
+@router.get("/{metric}/timeseries", response_model=TimeSeriesResponse)
+async def get_metric_timeseries(
+    metric: str,
+    start_date: Optional[datetime] = Query(None, description="Start date for time series"),
+    end_date: Optional[datetime] = Query(None, description="End date for time series"),
+    bucket_hours: int = Query(24, description="Time bucket size in hours", ge=1, le=168),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get any metric listed in ``TIME_SERIES_METRICS`` over time.
+    
+    Counts (views, clicks, applications, shortlists) and ratios
+    (ctr, conversion) share the same bucketing.
+    """
+    if metric not in TIME_SERIES_METRICS:
+        raise HTTPException(status_code=404, detail=f"Unknown metric: {metric}")
+    
+    time_series = await metrics_service.query_time_series(
+        metric,
+        start_date=start_date,
+        end_date=end_date,
+        bucket_size=timedelta(hours=bucket_hours),
+    )
+    
+    return TimeSeriesResponse(data=time_series)
+
+
 @router.get("/health")
 async def metrics_health():
     """
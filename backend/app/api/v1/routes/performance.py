@@ -6,11 +6,14 @@ and SLA compliance.
 """
 from typing import List, Dict
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.middleware.performance import get_latency_metrics, get_endpoint_metrics, LATENCY_BUDGETS, ERROR_RATE_BUDGET
 from app.api.deps import require_role
+from app.models.job import Job
 from app.models.user import User
+from app.services.query_profiler import annotate_slow_queries, query_profiler
+from app.services.resume_jobs import resume_parse_queue
 
 router = APIRouter(prefix="/performance", tags=["performance"])
 
@@ -154,3 +157,80 @@ async def get_budget_violations(
         "violation_count": len(violations),
         "violations": violations
     }
+
+
+@router.get("/queries")
+async def get_query_metrics(
+    limit: int = Query(50, ge=1, le=500, description="Number of recent requests to return"),
+    current_user: User = Depends(require_role("admin"))
+):
+    """
+    Get MongoDB query statistics.
+    
+    Returns cumulative totals per collection and command, plus per-request
+    query counts and database time keyed by correlation ID.
+    Requires admin role.
+    """
+    return {
+        "slow_query_threshold_ms": query_profiler.slow_threshold_ms,
+        "totals": query_profiler.summary(),
+        "requests": [stats.to_dict() for stats in query_profiler.recent_requests(limit)],
+    }
+
+
+@router.get("/queries/slow")
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=100, description="Number of samples to return"),
+    explain: bool = Query(False, description="Re-run samples under explain to count examined documents"),
+    current_user: User = Depends(require_role("admin"))
+):
+    """
+    Get recent slow query samples with their filter shapes.
+    
+    With ``explain=true`` each sample is re-run under explain to report
+    documents examined versus returned.
+    Requires admin role.
+    """
+    samples = query_profiler.slow_queries(limit)
+    if explain:
+        client = Job.get_motor_collection().database.client
+        samples = await annotate_slow_queries(client, samples)
+    
+    return {
+        "slow_query_count": len(samples),
+        "slow_queries": [sample.to_dict() for sample in samples],
+    }
+
+
+@router.get("/queries/{correlation_id}")
+async def get_request_query_metrics(
+    correlation_id: str,
+    current_user: User = Depends(require_role("admin"))
+):
+    """
+    Get MongoDB query statistics for a single request.
+    
+    Requires admin role.
+    
+    Args:
+        correlation_id: The X-Correlation-ID of the request
+    """
+    stats = query_profiler.get_request_stats(correlation_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No queries recorded for this correlation ID")
+    
+    return stats.to_dict()
+
+
+@router.get("/resume-parsing")
+async def get_resume_parsing_metrics(
+    current_user: User = Depends(require_role("admin"))
+):
+    """
+    Get resume parsing queue metrics.
+    
+    Returns the current queue depth, parses in flight, completed and failed
+    counts, and P50/P95/P99 parse latency and queue wait.
+    Requires admin role.
+    """
+    return resume_parse_queue.metrics()
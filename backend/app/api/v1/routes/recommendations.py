@@ -8,11 +8,16 @@ from app.core.config import settings
 from app.models.job import Job
 from app.models.profile import Profile
 from app.models.user import User
-from app.schemas.recommendations import Recommendation, RecommendationResponse
+from app.schemas.recommendations import (
+    CandidateRecommendation,
+    CandidateRecommendationResponse,
+    Recommendation,
+    RecommendationResponse,
+)
 from app.services.embedding import embed_text
-from app.services.indexer import ensure_job_tokens, index_job, index_jobs
-from app.services.normalization import normalize_text_chunks, tokenize
-from app.services.scoring import build_query_tokens, rank_jobs
+from app.services.indexer import ensure_job_tokens, index_job, index_jobs, profile_index_loader
+from app.services.profile_index import profile_index
+from app.services.scoring import analyze_query, rank_jobs
 
 router = APIRouter()
 
@@ -52,9 +57,9 @@ async def get_recommendations(
     profile_titles = profile.titles if profile else []
     extra_text = query
     if profile and profile.raw_text:
-        extra_text = normalize_text_chunks(profile.raw_text, extra_text or "")
+        extra_text = f"{profile.raw_text} {extra_text or ''}"
 
-    query_tokens = build_query_tokens(profile_skills, profile_titles, extra_text)
+    query_text, query_tokens = analyze_query(profile_skills, profile_titles, extra_text)
 
     if not query_tokens:
         raise HTTPException(
@@ -62,7 +67,6 @@ async def get_recommendations(
             detail="No profile data or query provided for recommendations.",
         )
 
-    query_text = normalize_text_chunks(" ".join(profile_skills), " ".join(profile_titles), extra_text or "")
     query_vector = embed_text(query_text) if query_text else []
 
     jobs = await Job.find_all().to_list()
@@ -113,3 +117,66 @@ async def get_recommendations(
     ]
 
     return RecommendationResponse(results=recommendations)
+
+
+@router.get("/jobs/{job_id}/candidates", response_model=CandidateRecommendationResponse)
+async def get_candidate_recommendations(
+    job_id: str,
+    limit: int = Query(settings.recommendation_limit, ge=1, le=50),
+    current_user: User = Depends(require_role("employer")),
+):
+    job = await Job.get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if str(job.employer_id) != str(current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view candidates for this job")
+
+    if not ensure_job_tokens(job):
+        await index_job(job)
+    # Built on first use and refreshed in the background once stale; uploads
+    # handled by this worker are indexed immediately
+    await profile_index_loader.ensure_loaded(lambda: Profile.find_all().to_list())
+
+    matches = profile_index.search(
+        job.tokens,
+        query_vector=job.embedding,
+        limit=limit,
+        bm25_weight=settings.scoring_bm25_weight,
+        vector_weight=settings.scoring_vector_weight,
+    )
+    if not matches:
+        return CandidateRecommendationResponse(job_id=job_id, results=[])
+
+    profiles = await Profile.find({"user_id": {"$in": [match.profile_id for match in matches]}}).to_list()
+    profiles_by_user = {str(profile.user_id): profile for profile in profiles}
+    job_skills = set(job.skills or [])
+
+    results = []
+    for match in matches:
+        profile = profiles_by_user.get(match.profile_id)
+        if profile is None:
+            continue
+        explanations = [
+            {"label": skill, "weight": 1.0, "source": "skill"}
+            for skill in profile.skills
+            if skill in job_skills
+        ]
+        explanations.extend(
+            {"label": term, "weight": 0.5, "source": "token"}
+            for term in match.matched_terms[:5]
+        )
+        if match.vector_score:
+            explanations.append({"label": "Semantic match", "weight": match.vector_score, "source": "vector"})
+        results.append(
+            CandidateRecommendation(
+                user_id=match.profile_id,
+                score=match.score,
+                bm25_score=match.bm25_score,
+                vector_score=match.vector_score,
+                skills=profile.skills,
+                titles=profile.titles,
+                explanations=explanations,
+            )
+        )
+
+    return CandidateRecommendationResponse(job_id=job_id, results=results)
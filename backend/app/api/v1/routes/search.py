@@ -4,7 +4,6 @@ Job search and filter endpoints.
 Provides comprehensive search functionality with advanced filters
 for job seekers to find relevant opportunities.
 """
-from datetime import datetime, timedelta
 from typing import List, Optional
 
 from fastapi import APIRouter, Query
@@ -20,6 +19,7 @@ from app.models.job import (
     JobStatus
 )
 from app.api.v1.routes.jobs import job_to_response
+from app.services.search_query import build_search_query
 
 router = APIRouter()
 
@@ -70,7 +70,7 @@ class JobSearchFilters(BaseModel):
     page_size: int = Field(20, description="Results per page", ge=1, le=100)
     
     # Sort
-    sort_by: str = Field("relevance", description="Sort order", pattern="^(relevance|newest|salary)$")
+    sort_by: str = Field("relevance", description="Sort order", pattern="^(relevance|newest|salary|distance)$")
 
 
 class PaginationResponse(BaseModel):
@@ -149,7 +149,7 @@ async def search_jobs(
     page_size: int = Query(20, description="Results per page", ge=1, le=100),
     
     # Sort
-    sort_by: str = Query("relevance", description="Sort order (relevance, newest, salary)"),
+    sort_by: str = Query("relevance", description="Sort order (relevance, newest, salary, distance)"),
 ):
     """
     Advanced job search with comprehensive filters.
@@ -157,127 +157,41 @@ async def search_jobs(
     Supports keyword search, location filtering, salary ranges, work types,
     experience levels, company ratings, and more.
     """
-    # Build query
-    query = {"status": JobStatus.ACTIVE}
-    
-    # Keyword search - search in title, description, and skills
-    if q:
-        query["$or"] = [
-            {"title": {"$regex": q, "$options": "i"}},
-            {"description": {"$regex": q, "$options": "i"}},
-            {"skills": {"$in": [q]}}
-        ]
-    
-    # Location search
-    if location:
-        location_query = {
-            "$or": [
-                {"location": {"$regex": location, "$options": "i"}},
-                {"city": {"$regex": location, "$options": "i"}},
-                {"state": {"$regex": location, "$options": "i"}}
-            ]
-        }
-        # Merge with existing query
-        if "$or" in query:
-            query["$and"] = [{"$or": query["$or"]}, location_query]
-            del query["$or"]
-        else:
-            query.update(location_query)
-    
-    # Easy apply filter
-    if easy_apply:
-        query["easy_apply"] = True
-    
-    # Remote filter
-    if remote_only:
-        query["work_type"] = WorkType.REMOTE
-    elif work_types:
-        work_types_list = [wt.strip() for wt in work_types.split(",")]
-        query["work_type"] = {"$in": work_types_list}
-    
-    # Salary filter
-    if hide_without_salary:
-        query["salary_min"] = {"$ne": None}
-    elif salary_min is not None or salary_max is not None:
-        salary_conditions = []
-        if salary_min is not None:
-            # Job's max salary should be >= our minimum
-            salary_conditions.append({"salary_max": {"$gte": salary_min}})
-        if salary_max is not None:
-            # Job's min salary should be <= our maximum
-            salary_conditions.append({"salary_min": {"$lte": salary_max}})
-        
-        if salary_conditions:
-            if "$and" in query:
-                query["$and"].extend(salary_conditions)
-            else:
-                query["$and"] = salary_conditions
-    
-    # Date posted filter
-    if posted_within and posted_within != "any":
-        hours_map = {"24h": 24, "7d": 168, "30d": 720}
-        hours = hours_map.get(posted_within, 720)
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
-        query["posted_at"] = {"$gte": cutoff}
-    
-    # Company rating
-    if min_rating:
-        query["company_rating"] = {"$gte": min_rating}
-    
-    # Experience level
-    if experience_levels:
-        exp_levels_list = [el.strip() for el in experience_levels.split(",")]
-        query["experience_level"] = {"$in": exp_levels_list}
-    
-    # Job types
-    if job_types:
-        job_types_list = [jt.strip() for jt in job_types.split(",")]
-        query["job_type"] = {"$in": job_types_list}
-    
-    # Cities
-    if cities:
-        cities_list = [c.strip() for c in cities.split(",")]
-        query["city"] = {"$in": cities_list}
-    
-    # States
-    if states:
-        states_list = [s.strip() for s in states.split(",")]
-        query["state"] = {"$in": states_list}
-    
-    # Companies
-    if companies:
-        companies_list = [c.strip() for c in companies.split(",")]
-        query["company_name"] = {"$in": companies_list}
-    
-    # Company sizes
-    if company_sizes:
-        sizes_list = [cs.strip() for cs in company_sizes.split(",")]
-        query["company_size"] = {"$in": sizes_list}
-    
-    # Industries
-    if industries:
-        industries_list = [i.strip() for i in industries.split(",")]
-        query["industry"] = {"$in": industries_list}
-    
-    # Skills
-    if skills:
-        skills_list = [s.strip() for s in skills.split(",")]
-        query["skills"] = {"$all": skills_list}
+    search_query = build_search_query(
+        q=q,
+        location=location,
+        radius=radius,
+        easy_apply=easy_apply,
+        remote_only=remote_only,
+        salary_min=salary_min,
+        salary_max=salary_max,
+        hide_without_salary=hide_without_salary,
+        posted_within=posted_within,
+        min_rating=min_rating,
+        company_sizes=company_sizes,
+        companies=companies,
+        industries=industries,
+        work_types=work_types,
+        job_types=job_types,
+        experience_levels=experience_levels,
+        cities=cities,
+        states=states,
+        skills=skills,
+        sort_by=sort_by,
+    )
+    query = search_query.filter
+    sort = search_query.sort
+    find_query = search_query.find_filter()
     
     # Calculate pagination
     skip = (page - 1) * page_size
     
-    # Sorting
-    sort_options = {
-        "relevance": [("posted_at", -1)],  # Default: newest first
-        "newest": [("posted_at", -1)],
-        "salary": [("salary_max", -1), ("salary_min", -1)]
-    }
-    sort = sort_options.get(sort_by, [("posted_at", -1)])
-    
     # Execute query
     total_count = await Job.find(query).count()
-    jobs = await Job.find(query).sort(sort).skip(skip).limit(page_size).to_list()
+    jobs_query = Job.find(find_query)
+    if sort:
+        jobs_query = jobs_query.sort(sort)
+    jobs = await jobs_query.skip(skip).limit(page_size).to_list()
     
     # Calculate pagination metadata
     total_pages = (total_count + page_size - 1) // page_size
@@ -289,6 +203,8 @@ async def search_jobs(
         filters_applied["keywords"] = q
     if location:
         filters_applied["location"] = location
+        if "geo_location" in query:
+            filters_applied["radius"] = radius
     if easy_apply:
         filters_applied["easy_apply"] = True
     if remote_only:
@@ -1,71 +1,172 @@
-import shutil
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Optional
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from pydantic import BaseModel
 
 from app.api.deps import require_role
 from app.core.config import settings
 from app.models.profile import Profile, ProfilePublic
 from app.models.user import User
-from app.services.parsing import SUPPORTED_EXTENSIONS, ResumeParsingError, parse_resume
+from app.services.indexer import index_profile
+from app.services.logging import logger as event_logger
+from app.services.match_worker import match_score_worker
+from app.services.parsing import SUPPORTED_EXTENSIONS, ParsedResume
+from app.services.resume_jobs import ResumeParseJob, ResumeParseStatus, resume_parse_queue
+from app.services.storage import EmptyUploadError, UploadTooLargeError, store_upload
 
 router = APIRouter()
 
 
-@router.post("/resume", response_model=ProfilePublic)
-async def upload_resume(
-    file: UploadFile = File(...),
-    current_user: User = Depends(require_role("seeker")),
-):
-    filename = file.filename or ""
-    extension = Path(filename).suffix.lower()
-    if not filename or not extension:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Filename with extension required")
-    if extension not in SUPPORTED_EXTENSIONS:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Unsupported resume format: {extension}",
-        )
+class ResumeParseJobResponse(BaseModel):
+    job_id: str
+    status: ResumeParseStatus
+    status_url: str
+    submitted_at: datetime
+    finished_at: Optional[datetime] = None
+    parse_ms: Optional[float] = None
+    cache_hit: bool = False
+    error: Optional[str] = None
+    profile: Optional[ProfilePublic] = None
 
-    storage_dir = Path(settings.resume_storage_dir)
-    storage_dir.mkdir(parents=True, exist_ok=True)
 
-    dest_path = storage_dir / f"{current_user.id}_{int(datetime.utcnow().timestamp())}{extension}"
-    try:
-        file.file.seek(0)
-        with dest_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        if dest_path.stat().st_size == 0:
-            dest_path.unlink(missing_ok=True)
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file is empty")
-    finally:
-        await file.close()
+def _job_response(job: ResumeParseJob, profile: Optional[ProfilePublic] = None) -> ResumeParseJobResponse:
+    return ResumeParseJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        status_url=f"/api/v1/uploads/resume/jobs/{job.job_id}",
+        submitted_at=job.submitted_at,
+        finished_at=job.finished_at,
+        parse_ms=job.parse_ms,
+        cache_hit=job.cache_hit,
+        error=job.error,
+        profile=profile,
+    )
 
-    try:
-        parsed = parse_resume(dest_path)
-    except ResumeParsingError as exc:
-        dest_path.unlink(missing_ok=True)
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+def _profile_matches(profile: Profile, parsed: ParsedResume, resume_path: Path) -> bool:
+    return (
+        profile.resume_path == str(resume_path)
+        and profile.skills == parsed.skills
+        and profile.titles == parsed.titles
+        and profile.raw_text == parsed.raw_text
+    )
+
+
+async def _discard_failed_upload(job: ResumeParseJob, created_file: bool) -> None:
+    """
+    Delete a resume that failed to parse, unless something else still needs it.
+
+    Uploads are stored by content hash, so a deduplicated upload shares its
+    file with an earlier upload: the profile's current resume or a job that
+    is still parsing it.
+    """
+    if not created_file or resume_parse_queue.in_use(job.path, exclude=job):
+        return
+    if await Profile.find_one(Profile.resume_path == job.path):
+        return
+    Path(job.path).unlink(missing_ok=True)
+
+
+async def _apply_parsed_resume(job: ResumeParseJob, created_file: bool = False) -> None:
+    """Update the seeker's profile once their resume has been parsed."""
+    resume_path = Path(job.path)
+    parsed = job.result
+    if parsed is None:
+        await _discard_failed_upload(job, created_file)
+        return
 
     now = datetime.utcnow()
-    profile = await Profile.find_one(Profile.user_id == str(current_user.id))
+    profile = await Profile.find_one(Profile.user_id == job.user_id)
+    if profile and _profile_matches(profile, parsed, resume_path):
+        # Same resume uploaded again: nothing to write, reindex or rescore
+        return
     if profile:
         profile.skills = parsed.skills
         profile.titles = parsed.titles
         profile.raw_text = parsed.raw_text
-        profile.resume_path = str(dest_path)
+        profile.resume_path = str(resume_path)
         profile.parsed_at = now
         await profile.save()
     else:
         profile = Profile(
-            user_id=str(current_user.id),
+            user_id=job.user_id,
             skills=parsed.skills,
             titles=parsed.titles,
             raw_text=parsed.raw_text,
-            resume_path=str(dest_path),
+            resume_path=str(resume_path),
             parsed_at=now,
         )
         await profile.insert()
 
-    return ProfilePublic.from_document(profile)
+    index_profile(profile)
+
+    # Rescore any applications made with the previous resume
+    match_score_worker.recompute_profile(job.user_id)
+
+
+@router.post("/resume", response_model=ResumeParseJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def upload_resume(
+    file: UploadFile = File(...),
+    current_user: User = Depends(require_role("seeker")),
+):
+    filename = file.filename or ""
+    extension = Path(filename).suffix.lower()
+    if not filename or not extension:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Filename with extension required")
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported resume format: {extension}",
+        )
+
+    try:
+        await file.seek(0)
+        stored = await store_upload(
+            file,
+            Path(settings.resume_storage_dir),
+            name_prefix=str(current_user.id),
+            extension=extension,
+            max_size=settings.MAX_UPLOAD_SIZE,
+        )
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)) from exc
+    except EmptyUploadError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    finally:
+        await file.close()
+
+    # Parsing runs in the resume parsing pool; poll the status URL for the result
+    job = resume_parse_queue.submit(
+        str(current_user.id),
+        stored.path,
+        on_complete=partial(_apply_parsed_resume, created_file=not stored.deduplicated),
+        content_hash=stored.sha256,
+    )
+    event_logger.log_resume_uploaded(
+        candidate_id=str(current_user.id),
+        resume_id=job.job_id,
+        file_size=stored.size,
+        file_type=extension.lstrip("."),
+    )
+
+    return _job_response(job)
+
+
+@router.get("/resume/jobs/{job_id}", response_model=ResumeParseJobResponse)
+async def get_resume_parse_job(
+    job_id: str,
+    current_user: User = Depends(require_role("seeker")),
+):
+    job = resume_parse_queue.get(job_id)
+    if not job or job.user_id != str(current_user.id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Resume parse job not found")
+
+    profile = None
+    if job.status == ResumeParseStatus.COMPLETED:
+        document = await Profile.find_one(Profile.user_id == job.user_id)
+        if document:
+            profile = ProfilePublic.from_document(document)
+    return _job_response(job, profile)
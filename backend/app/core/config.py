@@ -38,6 +38,29 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 5 * 1024 * 1024  # 5MB
     ALLOWED_RESUME_TYPES: list = ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
+    RESUME_PARSE_WORKERS: int = 2  # Processes in the resume parsing pool
+    RESUME_PDF_MAX_PAGES: int = 20  # Pages read per PDF resume (0 = no cap)
+    RESUME_PDF_MAX_CHARS: int = 100_000  # Stop reading a PDF after this much text (0 = no cap)
+    RESUME_PDF_PARALLEL_MIN_PAGES: int = 8  # Split PDFs with this many pages to read across the parsing pool
+    ANALYZER_STOPWORDS: bool = True  # Drop English stopwords from BM25 tokens
+    ANALYZER_STEMMING: bool = True  # Fold plural and "-ing" forms
+    ANALYZER_SKILL_BIGRAMS: bool = True  # Add tokens for two-word skills ("machine_learning")
+    SKILL_TAXONOMY_PATH: Optional[str] = None  # TSV skill taxonomy; defaults to app/data/skill_taxonomy.tsv
+    PROFILE_INDEX_REFRESH_SECONDS: float = 300.0  # Rebuild the candidate index from MongoDB once it is this old
+    
+    # Metrics event store
+    METRICS_EVENT_STORE: str = "mongo"  # "mongo" (server-side KPI queries), "file" or "memory"
+    METRICS_EVENT_DIR: str = "./metrics_events"  # Segment directory for the "file" store
+    METRICS_SEGMENT_MAX_BYTES: int = 16 * 1024 * 1024  # Rotate event segments at this size
+    METRICS_RETENTION_DAYS: int = 90  # Events and rollups older than this are dropped
+    METRICS_MINUTE_ROLLUP_HOURS: int = 48  # Minute rollups kept this long; older windows resolve to the hour
+    METRICS_MEMORY_MAX_EVENTS: int = 10_000  # Recent raw events kept in memory
+    METRICS_SYNC_INTERVAL_SECONDS: float = 5.0  # How often workers flush and read each other's events
+    
+    # SLA budget alerts
+    SLA_EVALUATION_INTERVAL_SECONDS: float = 10.0  # How often latency/error budgets are checked
+    SLA_REALERT_SECONDS: float = 900.0  # Repeat an ongoing breach alert at most this often
+    PERFORMANCE_MAX_UNMATCHED_ENDPOINTS: int = 200  # Distinct unmatched paths tracked; the rest share one
     
     # CORS
     CORS_ORIGINS: list = ["http://localhost:3000", "http://localhost:3001"]
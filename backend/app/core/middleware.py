@@ -1,174 +1,207 @@
 """
 Middleware for request tracking and logging.
+
+All middleware here are pure ASGI classes rather than ``BaseHTTPMiddleware``
+subclasses: they wrap ``send`` to see the status code and add headers, so
+no extra task or response stream is created per request and streaming
+responses pass through unchanged.
+
+``ObservabilityMiddleware`` does the work of ``LoggingMiddleware``,
+``MetricsMiddleware`` and ``PerformanceMonitoringMiddleware`` in a single
+layer with one timer and one ``send`` wrapper; it is the one the app
+installs.
 """
 import time
 import traceback
-from typing import Callable
+from typing import List, Optional, Tuple
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.middleware.performance import record_request
+from app.schemas.events import BaseEvent, EventType, EventSeverity
 from app.services.logging import logger, set_correlation_id, clear_correlation_id
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    """First value of a (lowercase) request header."""
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _user_id(scope: Scope) -> Optional[str]:
+    """ID of the authenticated user, if a dependency stored one on request.state."""
+    user = scope.get("state", {}).get("user")
+    return str(user.id) if user is not None else None
+
+
+def _add_headers(message: Message, headers: List[Tuple[bytes, bytes]]):
+    message["headers"] = list(message.get("headers", ())) + headers
+
+
+def _log_request(scope: Scope, status_code: int, duration: float, correlation_id: str):
+    """Log request/response details for error responses."""
+    if status_code < 400:
+        return
+
+    user_id = _user_id(scope)
+    metadata = {
+        "method": scope["method"],
+        "path": scope["path"],
+        "status_code": status_code,
+        "duration": duration,
+        "correlation_id": correlation_id,
+        "user_agent": _header(scope, b"user-agent"),
+    }
+    if user_id:
+        metadata["user_id"] = user_id
+
+    logger.log_event(BaseEvent(
+        event_type=EventType.ERROR_OCCURRED,
+        severity=EventSeverity.ERROR if status_code >= 500 else EventSeverity.WARNING,
+        correlation_id=correlation_id,
+        actor_id=user_id,
+        metadata=metadata,
+    ))
+
+
+def _log_error(scope: Scope, error: Exception):
+    """Log an exception raised by the application."""
+    stack_trace = "".join(traceback.format_exception(
+        type(error), error, error.__traceback__
+    ))
+    logger.log_error(
+        error_type=type(error).__name__,
+        error_message=str(error),
+        stack_trace=stack_trace,
+        request_path=scope["path"],
+        request_method=scope["method"],
+        user_id=_user_id(scope),
+    )
+
+
+class LoggingMiddleware:
     """
     Middleware for structured logging with correlation IDs.
-    
+
     Automatically tracks requests with correlation IDs and logs
     request/response metadata and errors.
     """
-    
+
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Process request with correlation ID tracking."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Generate or extract correlation ID
-        correlation_id = request.headers.get("X-Correlation-ID")
-        correlation_id = set_correlation_id(correlation_id)
-        
-        # Track request start time
-        start_time = time.time()
-        
+        correlation_id = set_correlation_id(_header(scope, b"x-correlation-id"))
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                _add_headers(message, [(b"x-correlation-id", correlation_id.encode("latin-1"))])
+            await send(message)
+
         try:
-            # Process request
-            response = await call_next(request)
-            
-            # Calculate duration
-            duration = time.time() - start_time
-            
-            # Log request/response
-            self._log_request(request, response, duration, correlation_id)
-            
-            # Add correlation ID to response headers
-            response.headers["X-Correlation-ID"] = correlation_id
-            
-            return response
-        
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            # Calculate duration
-            duration = time.time() - start_time
-            
-            # Log error
-            self._log_error(request, e, duration, correlation_id)
-            
-            # Re-raise exception to be handled by FastAPI error handlers
+            # Re-raised to be handled by the server's error handling
+            _log_error(scope, e)
             raise
-        
+        else:
+            _log_request(scope, status_code, time.perf_counter() - start_time, correlation_id)
         finally:
-            # Clear correlation ID from context
             clear_correlation_id()
-    
-    def _log_request(
-        self,
-        request: Request,
-        response: Response,
-        duration: float,
-        correlation_id: str,
-    ):
-        """Log request/response details."""
-        # Extract user ID if available
-        user_id = None
-        if hasattr(request.state, "user"):
-            user_id = str(request.state.user.id)
-        
-        # Build metadata
-        metadata = {
-            "method": request.method,
-            "path": request.url.path,
-            "status_code": response.status_code,
-            "duration": duration,
-            "correlation_id": correlation_id,
-            "user_agent": request.headers.get("user-agent"),
-        }
-        
-        if user_id:
-            metadata["user_id"] = user_id
-        
-        # Log based on status code
-        if response.status_code >= 500:
-            from app.schemas.events import BaseEvent, EventType, EventSeverity
-            event = BaseEvent(
-                event_type=EventType.ERROR_OCCURRED,
-                severity=EventSeverity.ERROR,
-                correlation_id=correlation_id,
-                actor_id=user_id,
-                metadata=metadata,
-            )
-            logger.log_event(event)
-        elif response.status_code >= 400:
-            from app.schemas.events import BaseEvent, EventType, EventSeverity
-            event = BaseEvent(
-                event_type=EventType.ERROR_OCCURRED,
-                severity=EventSeverity.WARNING,
-                correlation_id=correlation_id,
-                actor_id=user_id,
-                metadata=metadata,
-            )
-            logger.log_event(event)
-    
-    def _log_error(
-        self,
-        request: Request,
-        error: Exception,
-        duration: float,
-        correlation_id: str,
-    ):
-        """Log error details."""
-        # Extract user ID if available
-        user_id = None
-        if hasattr(request.state, "user"):
-            user_id = str(request.state.user.id)
-        
-        # Get stack trace
-        stack_trace = "".join(traceback.format_exception(
-            type(error), error, error.__traceback__
-        ))
-        
-        # Log error event
-        logger.log_error(
-            error_type=type(error).__name__,
-            error_message=str(error),
-            stack_trace=stack_trace,
-            request_path=request.url.path,
-            request_method=request.method,
-            user_id=user_id,
-        )
-
-
-class MetricsMiddleware(BaseHTTPMiddleware):
+
+
+class MetricsMiddleware:
     """
     Middleware for collecting performance metrics.
-    
+
     Tracks request counts, response times, and status codes
     for monitoring and alerting.
     """
-    
+
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
         self.request_count = 0
         self.error_count = 0
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Track request metrics."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         self.request_count += 1
-        
-        start_time = time.time()
-        
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                if message["status"] >= 400:
+                    self.error_count += 1
+                # Time until the response headers are sent
+                duration = time.perf_counter() - start_time
+                _add_headers(message, [(b"x-response-time", f"{duration:.4f}".encode())])
+            await send(message)
+
         try:
-            response = await call_next(request)
-            
-            if response.status_code >= 400:
-                self.error_count += 1
-            
-            # Add timing header
-            duration = time.time() - start_time
-            response.headers["X-Response-Time"] = f"{duration:.4f}"
-            
-            return response
-        
-        except Exception as e:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
             self.error_count += 1
             raise
+
+
+class ObservabilityMiddleware:
+    """
+    Correlation IDs, request logging, request counters, the response time
+    header and per-endpoint latency tracking in one pure ASGI layer.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.request_count = 0
+        self.error_count = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        correlation_id = set_correlation_id(_header(scope, b"x-correlation-id"))
+        self.request_count += 1
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration = time.perf_counter() - start_time
+                _add_headers(message, [
+                    (b"x-correlation-id", correlation_id.encode("latin-1")),
+                    (b"x-response-time", f"{duration:.4f}".encode()),
+                ])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            status_code = 500
+            _log_error(scope, e)
+            raise
+        else:
+            _log_request(scope, status_code, time.perf_counter() - start_time, correlation_id)
+        finally:
+            if status_code >= 400:
+                self.error_count += 1
+            record_request(scope, (time.perf_counter() - start_time) * 1000, status_code)
+            clear_correlation_id()
@@ -7,13 +7,14 @@ from app.models.user import User
 from app.models.job import Job
 from app.models.application import Application
 from app.models.profile import Profile
-from app.models.event import EventLog
+from app.models.event import EventLog, MetricEvent
+from app.services.query_profiler import query_profiler
 
 
 async def init_db():
     load_dotenv()
     uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
     db_name = os.getenv("DATABASE_NAME", "job_portal")
-    client = AsyncIOMotorClient(uri)
+    client = AsyncIOMotorClient(uri, event_listeners=[query_profiler])
     db = client[db_name]
-    await init_beanie(database=db, document_models=[User, Job, Application, Profile, EventLog])
+    await init_beanie(database=db, document_models=[User, Job, Application, Profile, EventLog, MetricEvent])
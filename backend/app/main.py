@@ -6,10 +6,19 @@ from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.logging import setup_logging, get_logger
+from app.core.middleware import ObservabilityMiddleware
 from app.models.user import User
 from app.models.profile import JobSeekerProfile, EmployerProfile
 from app.models.job import Job
 from app.models.application import Application, Notification
+from app.models.event import MetricEvent
+from app.middleware.performance import sla_evaluator
+from app.services.indexer import backfill_job_coordinates
+from app.services.match_worker import match_score_worker
+from app.services.metrics import metrics_service
+from app.services.parsing import load_matchers
+from app.services.query_profiler import query_profiler
+from app.services.resume_jobs import resume_parse_queue
 
 # Import routers (will create these next)
 from app.api.v1 import auth, seekers, employers, jobs, applications
@@ -28,7 +37,7 @@ async def lifespan(app: FastAPI):
     
     # Initialize MongoDB
     try:
-        client = AsyncIOMotorClient(settings.MONGODB_URL)
+        client = AsyncIOMotorClient(settings.MONGODB_URL, event_listeners=[query_profiler])
         await init_beanie(
             database=client[settings.DATABASE_NAME],
             document_models=[
@@ -38,6 +47,7 @@ async def lifespan(app: FastAPI):
                 Job,
                 Application,
                 Notification,
+                MetricEvent,
             ]
         )
         logger.info("Database initialized successfully")
@@ -45,10 +55,26 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {e}")
         raise
     
+    # Jobs saved before geo_location existed would never match radius searches
+    backfilled = await backfill_job_coordinates()
+    if backfilled:
+        logger.info(f"Geocoded {backfilled} jobs missing geo_location")
+    
+    # Build the skill/title matchers before the parse pool forks workers
+    load_matchers()
+    match_score_worker.start()
+    await metrics_service.load()
+    metrics_service.start()
+    sla_evaluator.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down JobPortal API...")
+    await match_score_worker.stop()
+    await metrics_service.stop()
+    await sla_evaluator.stop()
+    await resume_parse_queue.stop()
     client.close()
 
 
@@ -70,6 +96,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request logging, correlation IDs and latency tracking
+app.add_middleware(ObservabilityMiddleware)
+
 
 # Health check
 @app.get("/health")
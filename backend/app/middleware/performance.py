@@ -4,39 +4,67 @@ Performance monitoring middleware for latency and error tracking (ST-013).
 Tracks request latency (P50, P95, P99) and error rates per endpoint
 to ensure SLA compliance.
 """
+import asyncio
+import re
 import time
-from typing import Callable, Dict, List
-from collections import defaultdict, deque
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.config import settings
+from app.core.logging import get_logger
 from app.services.logging import logger as event_logger
 from app.schemas.events import BaseEvent, EventType, EventSeverity
+from app.services.sketches import SlidingHistogram
+
+logger = get_logger(__name__)
+
+# Endpoint key shared by unmatched paths beyond the tracker's limit
+OVERFLOW_ENDPOINT = "__other__"
 
 
 class LatencyTracker:
     """
     Tracks latency metrics for endpoints.
     
-    Maintains sliding window of latency measurements and calculates
-    percentiles (P50, P95, P99).
+    Maintains a sliding window of latency measurements per endpoint as a
+    log-bucket histogram (``SlidingHistogram``) and calculates percentiles
+    (P50, P95, P99) from it. Recording is O(1) and a percentile query walks
+    the histogram buckets instead of sorting the window; results are within
+    0.5% of the exact value.
+    
+    Each endpoint key costs a histogram. Route templates are bounded by the
+    app's routes, but paths of unmatched requests (e.g. a scanner probing
+    random URLs) are not: with ``max_unmatched_endpoints`` set, unmatched
+    keys first seen after that many are tracked together under
+    ``OVERFLOW_ENDPOINT``. Matched keys are never merged, so their SLA
+    budgets keep being evaluated.
     """
     
-    def __init__(self, window_size: int = 1000):
+    def __init__(self, window_size: int = 1000, slots: int = 10, max_unmatched_endpoints: Optional[int] = None):
         """
         Initialize latency tracker.
         
         Args:
             window_size: Maximum number of measurements to keep per endpoint
+            slots: Sub-histograms the window rotates through; the window
+                holds between ``window_size * (slots - 1) / slots`` and
+                ``window_size`` measurements
+            max_unmatched_endpoints: Maximum number of distinct keys for
+                requests that matched no route (no limit if None)
         """
-        self.latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window_size))
+        self.max_unmatched_endpoints = max_unmatched_endpoints
+        self._unmatched: Set[str] = set()
+        self.latencies: Dict[str, SlidingHistogram] = defaultdict(
+            lambda: SlidingHistogram(window_size, slots)
+        )
         self.error_counts: Dict[str, int] = defaultdict(int)
         self.request_counts: Dict[str, int] = defaultdict(int)
     
-    def add_measurement(self, endpoint: str, latency_ms: float, status_code: int):
+    def add_measurement(self, endpoint: str, latency_ms: float, status_code: int, matched: bool = True):
         """
         Add a latency measurement for an endpoint.
         
@@ -44,13 +72,43 @@ class LatencyTracker:
             endpoint: The endpoint path
             latency_ms: Latency in milliseconds
             status_code: HTTP status code
+            matched: False when ``endpoint`` is a normalized path of a
+                request no route matched
         """
-        self.latencies[endpoint].append(latency_ms)
+        if not matched and endpoint not in self._unmatched:
+            if self.max_unmatched_endpoints is not None and len(self._unmatched) >= self.max_unmatched_endpoints:
+                endpoint = OVERFLOW_ENDPOINT
+            else:
+                self._unmatched.add(endpoint)
+        self.latencies[endpoint].add(latency_ms)
         self.request_counts[endpoint] += 1
         
         if status_code >= 400:
             self.error_counts[endpoint] += 1
     
+    def clear(self):
+        """Drop all measurements."""
+        self.latencies.clear()
+        self.error_counts.clear()
+        self.request_counts.clear()
+        self._unmatched.clear()
+    
+    def get_percentiles(self, endpoint: str, percentiles: Sequence[float]) -> List[float]:
+        """
+        Calculate several percentile latencies for an endpoint in one pass.
+        
+        Args:
+            endpoint: The endpoint path
+            percentiles: Percentiles to calculate (e.g., 50, 95, 99)
+            
+        Returns:
+            Percentile latencies in milliseconds, or 0 if no data
+        """
+        histogram = self.latencies.get(endpoint)
+        if not histogram:
+            return [0.0] * len(percentiles)
+        return histogram.percentiles(percentiles)
+    
     def get_percentile(self, endpoint: str, percentile: int) -> float:
         """
         Calculate percentile latency for an endpoint.
@@ -62,15 +120,7 @@ class LatencyTracker:
         Returns:
             Percentile latency in milliseconds, or 0 if no data
         """
-        if endpoint not in self.latencies or not self.latencies[endpoint]:
-            return 0.0
-        
-        sorted_latencies = sorted(self.latencies[endpoint])
-        index = int(len(sorted_latencies) * percentile / 100)
-        if index >= len(sorted_latencies):
-            index = len(sorted_latencies) - 1
-        
-        return sorted_latencies[index]
+        return self.get_percentiles(endpoint, [percentile])[0]
     
     def get_error_rate(self, endpoint: str) -> float:
         """
@@ -82,10 +132,12 @@ class LatencyTracker:
         Returns:
             Error rate as a decimal (0.0 to 1.0)
         """
-        if self.request_counts[endpoint] == 0:
+        # .get: looking up an untracked endpoint must not add a key
+        requests = self.request_counts.get(endpoint, 0)
+        if requests == 0:
             return 0.0
         
-        return self.error_counts[endpoint] / self.request_counts[endpoint]
+        return self.error_counts.get(endpoint, 0) / requests
     
     def get_metrics(self, endpoint: str) -> Dict:
         """
@@ -97,14 +149,15 @@ class LatencyTracker:
         Returns:
             Dictionary with latency percentiles and error rate
         """
+        p50, p95, p99 = self.get_percentiles(endpoint, (50, 95, 99))
         return {
             "endpoint": endpoint,
-            "request_count": self.request_counts[endpoint],
-            "error_count": self.error_counts[endpoint],
+            "request_count": self.request_counts.get(endpoint, 0),
+            "error_count": self.error_counts.get(endpoint, 0),
             "error_rate": self.get_error_rate(endpoint),
-            "latency_p50_ms": self.get_percentile(endpoint, 50),
-            "latency_p95_ms": self.get_percentile(endpoint, 95),
-            "latency_p99_ms": self.get_percentile(endpoint, 99),
+            "latency_p50_ms": p50,
+            "latency_p95_ms": p95,
+            "latency_p99_ms": p99,
         }
     
     def get_all_metrics(self) -> List[Dict]:
@@ -121,7 +174,10 @@ class LatencyTracker:
 
 
 # Global latency tracker instance
-latency_tracker = LatencyTracker(window_size=1000)
+latency_tracker = LatencyTracker(
+    window_size=1000,
+    max_unmatched_endpoints=settings.PERFORMANCE_MAX_UNMATCHED_ENDPOINTS,
+)
 
 
 # SLA Budgets per endpoint (in milliseconds)
@@ -137,143 +193,261 @@ LATENCY_BUDGETS = {
 ERROR_RATE_BUDGET = 0.01  # 1% error budget
 
 
-class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
+# Path segments that identify a resource rather than name an endpoint
+_ID_SEGMENT = re.compile(
+    r"""
+    (?<=/)
+    (?:
+        \d+                                                 # numeric ID
+      | [0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}  # UUID
+      | (?=[^/]*\d)[\w.~-]{16,}                             # ObjectId, token or other long ID
+      | (?=[^/]*\d)[\w.~]+(?:-[\w.~]+)+                     # slug with a number in it
+    )
+    (?=/|$)
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def normalize_endpoint(path: str) -> str:
+    """
+    Normalize endpoint path for metrics grouping.
+    
+    Replaces ID-like path segments (numbers, ObjectIds, UUIDs, long tokens
+    and slugs containing digits) with ``:id``. Only used for requests that
+    did not match a route; matched requests are keyed by route template.
+    
+    Args:
+        path: The request path
+        
+    Returns:
+        Normalized path
+    """
+    return _ID_SEGMENT.sub(":id", path)
+
+
+def endpoint_key(scope: Scope) -> Tuple[str, bool]:
+    """
+    Metrics key for a finished request.
+    
+    The template of the route that handled the request (e.g.
+    ``/api/v1/jobs/{job_id}``, which FastAPI stores in ``scope["route"]``
+    while routing), or the normalized path for unmatched requests.
+    
+    Args:
+        scope: The ASGI scope of the request, after the app has handled it
+        
+    Returns:
+        Endpoint key and whether it is a route template
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is not None:
+        return template, True
+    return normalize_endpoint(scope["path"]), False
+
+
+def record_request(scope: Scope, latency_ms: float, status_code: int):
+    """
+    Track one request's latency; budgets are checked by the SLA evaluator task.
+    
+    Args:
+        scope: The ASGI scope of the request
+        latency_ms: Latency in milliseconds
+        status_code: HTTP status code sent (500 if the app raised)
+    """
+    endpoint, matched = endpoint_key(scope)
+    latency_tracker.add_measurement(endpoint, latency_ms, status_code, matched=matched)
+
+
+class PerformanceMonitoringMiddleware:
     """
     Middleware to track request latency and error rates.
     
     Measures request duration and tracks metrics per endpoint.
-    Logs warnings when endpoints exceed SLA budgets.
+    SLA budgets are checked in the background by ``sla_evaluator``.
+    
+    Pure ASGI: the response is passed through untouched, so streaming
+    responses keep streaming and latency covers the whole body.
     """
     
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """
-        Process request and track performance metrics.
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        Args:
-            request: The incoming request
-            call_next: Next middleware/handler in chain
-            
-        Returns:
-            The response
-        """
-        # Start timing
-        start_time = time.time()
+        start_time = time.perf_counter()
+        status_code = 500
+        
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
         
-        # Process request
         try:
-            response = await call_next(request)
-            status_code = response.status_code
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            # Track errors
             status_code = 500
-            latency_ms = (time.time() - start_time) * 1000
-            
-            # Log error event
             event_logger.log_error(
                 error_type=type(e).__name__,
                 error_message=str(e),
-                request_path=request.url.path,
-                request_method=request.method,
+                request_path=scope["path"],
+                request_method=scope["method"],
             )
-            
             raise
         finally:
-            # Calculate latency
-            latency_ms = (time.time() - start_time) * 1000
-            
-            # Normalize endpoint (remove IDs and query params)
-            endpoint = self._normalize_endpoint(request.url.path)
-            
-            # Track metrics
-            latency_tracker.add_measurement(endpoint, latency_ms, status_code)
-            
-            # Check SLA budgets
-            self._check_sla_budgets(endpoint, latency_ms, status_code)
-        
-        return response
+            record_request(scope, (time.perf_counter() - start_time) * 1000, status_code)
+
+
+@dataclass
+class AlertState:
+    """Alert state for one endpoint and budget."""
+    
+    active: bool = False
+    last_alert: float = 0.0  # time.monotonic() of the last emitted alert
+    healthy_evaluations: int = 0
+
+
+class SLAEvaluator:
+    """
+    Periodic SLA budget evaluation off the request path.
+    
+    Every ``interval_seconds`` the latency and error budgets of each tracked
+    endpoint are checked. Alerts are deduplicated: a breach is logged when
+    it starts and then at most once per ``realert_seconds`` while it lasts.
+    Hysteresis keeps a metric hovering at its budget from flapping: an alert
+    only clears after ``clear_evaluations`` consecutive checks below
+    ``clear_ratio`` of the budget, and the recovery is logged once.
+    """
+    
+    def __init__(
+        self,
+        tracker: LatencyTracker,
+        interval_seconds: float = 10.0,
+        realert_seconds: float = 900.0,
+        clear_ratio: float = 0.9,
+        clear_evaluations: int = 3,
+    ):
+        self.tracker = tracker
+        self.interval_seconds = interval_seconds
+        self.realert_seconds = realert_seconds
+        self.clear_ratio = clear_ratio
+        self.clear_evaluations = clear_evaluations
+        self.alerts: Dict[Tuple[str, str], AlertState] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
     
-    def _normalize_endpoint(self, path: str) -> str:
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                self.evaluate()
+            except Exception:
+                logger.exception("SLA budget evaluation failed")
+    
+    def evaluate(self, now: Optional[float] = None) -> List[BaseEvent]:
         """
-        Normalize endpoint path for metrics grouping.
-        
-        Removes UUIDs and IDs from paths to group similar endpoints.
+        Check every endpoint against its budgets once.
         
         Args:
-            path: The request path
+            now: Monotonic time of the evaluation (default: time.monotonic())
             
         Returns:
-            Normalized path
+            The alert and recovery events that were logged
         """
-        import re
-        
-        # Replace UUIDs and object IDs with placeholder
-        path = re.sub(r'/[0-9a-f]{24}', '/:id', path)  # MongoDB ObjectIds
-        path = re.sub(r'/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', '/:id', path)  # UUIDs
-        path = re.sub(r'/\d+', '/:id', path)  # Numeric IDs
-        
-        return path
-    
-    def _check_sla_budgets(self, endpoint: str, latency_ms: float, status_code: int):
-        """
-        Check if request exceeds SLA budgets and log if necessary.
-        
-        Args:
-            endpoint: The normalized endpoint path
-            latency_ms: Request latency in milliseconds
-            status_code: HTTP status code
-        """
-        metrics = latency_tracker.get_metrics(endpoint)
-        
-        # Check latency budget
-        if endpoint in LATENCY_BUDGETS:
-            budget = LATENCY_BUDGETS[endpoint]
-            
-            if metrics["latency_p95_ms"] > budget["p95"]:
-                event_logger.log_event(
-                    BaseEvent(
-                        event_type=EventType.SLA_LATENCY_BUDGET_EXCEEDED,
-                        severity=EventSeverity.WARNING,
-                        metadata={
-                            "endpoint": endpoint,
-                            "p95_ms": metrics["latency_p95_ms"],
-                            "budget_p95_ms": budget["p95"],
-                            "current_latency_ms": latency_ms
-                        }
-                    )
-                )
-            
-            if metrics["latency_p99_ms"] > budget["p99"]:
-                event_logger.log_event(
-                    BaseEvent(
-                        event_type=EventType.SLA_LATENCY_BUDGET_EXCEEDED,
-                        severity=EventSeverity.CRITICAL,
-                        metadata={
-                            "endpoint": endpoint,
-                            "p99_ms": metrics["latency_p99_ms"],
-                            "budget_p99_ms": budget["p99"],
-                            "current_latency_ms": latency_ms
-                        }
-                    )
+        now = time.monotonic() if now is None else now
+        emitted: List[BaseEvent] = []
+        for endpoint in list(self.tracker.request_counts):
+            metrics = self.tracker.get_metrics(endpoint)
+            budget = LATENCY_BUDGETS.get(endpoint)
+            if budget:
+                emitted += self._check(
+                    endpoint, "p95", metrics["latency_p95_ms"], budget["p95"],
+                    EventType.SLA_LATENCY_BUDGET_EXCEEDED, EventSeverity.WARNING, metrics, now,
                 )
-        
-        # Check error rate budget
-        if metrics["error_rate"] > ERROR_RATE_BUDGET:
-            event_logger.log_event(
-                BaseEvent(
-                    event_type=EventType.SLA_ERROR_BUDGET_EXCEEDED,
-                    severity=EventSeverity.CRITICAL,
-                    metadata={
-                        "endpoint": endpoint,
-                        "error_rate": metrics["error_rate"],
-                        "error_budget": ERROR_RATE_BUDGET,
-                        "error_count": metrics["error_count"],
-                        "request_count": metrics["request_count"]
-                    }
+                emitted += self._check(
+                    endpoint, "p99", metrics["latency_p99_ms"], budget["p99"],
+                    EventType.SLA_LATENCY_BUDGET_EXCEEDED, EventSeverity.CRITICAL, metrics, now,
                 )
+            emitted += self._check(
+                endpoint, "error_rate", metrics["error_rate"], ERROR_RATE_BUDGET,
+                EventType.SLA_ERROR_BUDGET_EXCEEDED, EventSeverity.CRITICAL, metrics, now,
             )
+        return emitted
+    
+    def _check(
+        self,
+        endpoint: str,
+        name: str,
+        value: float,
+        budget: float,
+        event_type: EventType,
+        severity: EventSeverity,
+        metrics: Dict,
+        now: float,
+    ) -> List[BaseEvent]:
+        state = self.alerts.setdefault((endpoint, name), AlertState())
+        if value > budget:
+            state.healthy_evaluations = 0
+            if state.active and now - state.last_alert < self.realert_seconds:
+                return []
+            state.active = True
+            state.last_alert = now
+        elif not state.active:
+            return []
+        else:
+            if value <= budget * self.clear_ratio:
+                state.healthy_evaluations += 1
+            else:
+                state.healthy_evaluations = 0
+            if state.healthy_evaluations < self.clear_evaluations:
+                return []
+            state.active = False
+            severity = EventSeverity.INFO
+        
+        event = BaseEvent(
+            event_type=event_type,
+            severity=severity,
+            metadata={
+                "endpoint": endpoint,
+                name: value,
+                f"budget_{name}": budget,
+                "resolved": not state.active,
+                "error_count": metrics["error_count"],
+                "request_count": metrics["request_count"],
+            },
+        )
+        event_logger.log_event(event)
+        return [event]
+
+
+# Global SLA evaluator, started with the application
+sla_evaluator = SLAEvaluator(
+    latency_tracker,
+    interval_seconds=settings.SLA_EVALUATION_INTERVAL_SECONDS,
+    realert_seconds=settings.SLA_REALERT_SECONDS,
+)
 
 
 def get_latency_metrics() -> List[Dict]:
@@ -53,6 +53,7 @@ class Application(Document):
     # AI Matching
     ai_match_score: Optional[float] = None  # 0-100
     match_explanation: Optional[str] = None
+    match_scored_at: Optional[datetime] = None  # Set by the match score worker
     
     # Status
     status: ApplicationStatus = ApplicationStatus.SUBMITTED
@@ -78,6 +79,7 @@ class Application(Document):
             "ai_match_score",
             "applied_at",
             [("job_id", 1), ("job_seeker_id", 1)],  # Compound unique index
+            [("job_id", 1), ("ai_match_score", -1)],  # Inbox sorted by match
         ]
 
 
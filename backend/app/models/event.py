@@ -1,9 +1,11 @@
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from beanie import Document
+from beanie import Document, Granularity, TimeSeriesConfig
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
+
 
 class EventLog(Document):
     event_type: str
@@ -23,3 +25,26 @@ class EventCreate(BaseModel):
     subject_id: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
     correlation_id: Optional[str] = None
+
+
+class MetricEventMeta(BaseModel):
+    event_type: str
+    actor_id: Optional[str] = None
+
+
+class MetricEvent(Document):
+    """Metrics event in a time-series collection, aggregated by the KPI endpoints."""
+
+    timestamp: datetime
+    meta: MetricEventMeta
+    time_since_application: Optional[float] = None
+    data: Dict[str, Any] = Field(default_factory=dict)
+
+    class Settings:
+        name = "metric_events"
+        timeseries = TimeSeriesConfig(
+            time_field="timestamp",
+            meta_field="meta",
+            granularity=Granularity.minutes,
+            expire_after_seconds=settings.METRICS_RETENTION_DAYS * 86400,
+        )
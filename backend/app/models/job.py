@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from beanie import Document
 from pydantic import Field, BaseModel, ConfigDict
 from bson import ObjectId
@@ -60,6 +60,7 @@ class Job(Document):
     
     # Location
     location: JobLocation
+    geo_location: Optional[Dict[str, Any]] = None  # GeoJSON point from the city gazetteer
     
     # Employment Details
     industry: Optional[str] = None
@@ -85,12 +86,16 @@ class Job(Document):
     
     class Settings:
         name = "jobs"
+        # Compound indexes follow the Equality-Sort-Range order of the
+        # search query shapes (see app.services.index_advisor).
         indexes = [
             "employer_id",
-            "status",
-            "job_type",
-            "experience_level",
-            "skills_required",
-            "location.city",
-            "posted_at",
+            [("status", 1), ("posted_at", -1), ("salary_max", 1)],
+            [("status", 1), ("salary_max", -1), ("salary_min", -1)],
+            [("status", 1), ("work_type", 1), ("posted_at", -1)],
+            [("status", 1), ("work_type", 1), ("experience_level", 1), ("posted_at", -1)],
+            [("status", 1), ("experience_level", 1), ("posted_at", -1)],
+            [("status", 1), ("job_type", 1), ("posted_at", -1)],
+            [("status", 1), ("company_name", 1), ("posted_at", -1)],
+            [("status", 1), ("geo_location", "2dsphere"), ("posted_at", -1)],
         ]
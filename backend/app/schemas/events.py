@@ -6,7 +6,7 @@ system events, and errors across the application.
 """
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -52,6 +52,9 @@ class EventType(str, Enum):
     # SLA/Performance events
     SLA_LATENCY_BUDGET_EXCEEDED = "sla.latency_budget_exceeded"
     SLA_ERROR_BUDGET_EXCEEDED = "sla.error_budget_exceeded"
+    
+    # Database events
+    DB_SLOW_QUERY = "db.slow_query"
 
 
 class EventSeverity(str, Enum):
@@ -126,6 +129,9 @@ class ResumeEvent(BaseEvent):
     file_size: Optional[int] = None
     file_type: Optional[str] = None
     parsing_duration: Optional[float] = None  # seconds
+    page_count: Optional[int] = None
+    page_timings: Optional[List[float]] = None  # ms per extracted PDF page
+    truncated: Optional[bool] = None  # PDF text stopped at the page or character cap
     success: bool = True
 
 
@@ -23,3 +23,18 @@ class Recommendation(BaseModel):
 
 class RecommendationResponse(BaseModel):
     results: List[Recommendation]
+
+
+class CandidateRecommendation(BaseModel):
+    user_id: str
+    score: float
+    bm25_score: float
+    vector_score: float
+    skills: List[str]
+    titles: List[str]
+    explanations: List[RecommendationExplanation]
+
+
+class CandidateRecommendationResponse(BaseModel):
+    job_id: str
+    results: List[CandidateRecommendation]
@@ -0,0 +1,139 @@
+"""
+Token analyzer chain for BM25 indexing and queries.
+
+Runs after ``tokenize``: optional skill bigrams, then stopword removal,
+then a light stemmer. Stopwords such as "the" and "with" carry no ranking
+signal but make up a large share of job description tokens, so dropping
+them shrinks ``Job.tokens``, the profile index postings and every BM25
+loop. The stemmer only folds plurals and "-ing" forms ("engineers",
+"engineering" -> "engineer"); single-word skills from the taxonomy are
+never stemmed, so "pandas" and "kubernetes" stay intact.
+
+Skill bigrams add one token for adjacent words that form a two-word skill
+alias ("machine learning" -> "machine_learning"), so postings that share
+the phrase outrank ones that only share the words.
+
+Indexed and query tokens must come from the same chain. The analyzer's
+``signature`` is stored with indexed jobs so they are reindexed after the
+configuration changes.
+"""
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.taxonomy import SkillTaxonomy, get_skill_taxonomy
+
+ANALYZER_VERSION = 2
+
+# Standard English stopwords. "it" is kept: "IT support" is a job term.
+STOPWORDS: FrozenSet[str] = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her
+here hers herself him himself his how i if in into is its itself just me more most my myself no nor not
+now of off on once only or other our ours ourselves out over own same she should so some such than that
+the their theirs them themselves then there these they this those through to too under until up very was
+we were what when where which while who whom why will with would you your yours yourself yourselves
+""".split())
+
+BIGRAM_JOINER = "_"
+
+
+def stem(token: str) -> str:
+    """Light English stemmer: plural and "-ing" suffixes only."""
+    if len(token) > 4 and token.endswith("ing") and not token.endswith("thing"):
+        stemmed = token[:-3]
+        # "programming" -> "program", but keep "ss" as in "processing" -> "process"
+        if len(stemmed) > 3 and stemmed[-1] == stemmed[-2] and stemmed[-1] not in "lsz":
+            stemmed = stemmed[:-1]
+        return stemmed if len(stemmed) >= 4 else token
+    if len(token) <= 3 or not token.endswith("s"):
+        return token
+    if token.endswith("ies") and not token.endswith(("eies", "aies")):
+        return token[:-3] + "y"
+    # "classes" -> "class", and "analyses" -> "analysis" to meet the singular
+    if token.endswith("sses"):
+        return token[:-2]
+    if token.endswith("yses"):
+        return token[:-2] + "is"
+    if token.endswith("es") and not token.endswith(("aes", "ees", "oes")):
+        return token[:-1]
+    # "status", "class" and "analysis" are singular already; "apis" is not
+    if token.endswith(("us", "ss", "sis")):
+        return token
+    return token[:-1]
+
+
+class Analyzer:
+    """Configurable stopword / stemming / skill bigram chain."""
+
+    def __init__(
+        self,
+        stopwords: bool = True,
+        stemming: bool = True,
+        skill_bigrams: bool = True,
+        taxonomy: Optional[SkillTaxonomy] = None,
+    ):
+        self.stopwords = stopwords
+        self.stemming = stemming
+        self.skill_bigrams = skill_bigrams
+        self._taxonomy = taxonomy
+        self._bigrams: Optional[Dict[Tuple[str, str], str]] = None
+        self._protected: Optional[FrozenSet[str]] = None
+        self._stems: Dict[str, str] = {}
+
+    @property
+    def signature(self) -> str:
+        flags = [name for name, enabled in (
+            ("stop", self.stopwords), ("stem", self.stemming), ("bigram", self.skill_bigrams)
+        ) if enabled]
+        return f"v{ANALYZER_VERSION}:{'+'.join(flags) or 'plain'}"
+
+    @property
+    def taxonomy(self) -> SkillTaxonomy:
+        return self._taxonomy or get_skill_taxonomy()
+
+    def _load_skill_terms(self) -> None:
+        bigrams: Dict[Tuple[str, str], str] = {}
+        protected = set()
+        for alias, canonical in self.taxonomy.aliases.items():
+            words = alias.split(" ")
+            if len(words) == 1 and alias.isalnum():
+                protected.add(alias)
+            elif len(words) == 2 and all(word.isalnum() for word in words):
+                bigrams[(words[0], words[1])] = canonical.replace(" ", BIGRAM_JOINER)
+        self._bigrams = bigrams
+        self._protected = frozenset(protected)
+
+    def _stem(self, token: str) -> str:
+        stemmed = self._stems.get(token)
+        if stemmed is None:
+            stemmed = token if token in self._protected else stem(token)
+            if len(self._stems) < 100_000:
+                self._stems[token] = stemmed
+        return stemmed
+
+    def analyze(self, tokens: Iterable[str]) -> List[str]:
+        """Apply the chain to ``tokenize`` output."""
+        tokens = tokens if isinstance(tokens, list) else list(tokens)
+        if self._bigrams is None and (self.stemming or self.skill_bigrams):
+            self._load_skill_terms()
+
+        result: List[str] = []
+        for index, token in enumerate(tokens):
+            if self.skill_bigrams and index + 1 < len(tokens):
+                bigram = self._bigrams.get((token, tokens[index + 1]))
+                if bigram is not None:
+                    result.append(bigram)
+            if self.stopwords and token in STOPWORDS:
+                continue
+            result.append(self._stem(token) if self.stemming else token)
+        return result
+
+
+@lru_cache(maxsize=1)
+def get_analyzer() -> Analyzer:
+    return Analyzer(
+        stopwords=settings.ANALYZER_STOPWORDS,
+        stemming=settings.ANALYZER_STEMMING,
+        skill_bigrams=settings.ANALYZER_SKILL_BIGRAMS,
+    )
@@ -1,6 +1,6 @@
 import hashlib
 from functools import lru_cache
-from typing import List
+from typing import List, Sequence
 
 import numpy as np
 
@@ -30,6 +30,25 @@ class LocalEmbeddingClient:
             vector /= norm
         return vector.astype(np.float32).tolist()
 
+    def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed several texts at once; same vectors as calling ``embed`` on each."""
+        rows: List[int] = []
+        indices: List[int] = []
+        weights: List[float] = []
+        for row, text in enumerate(texts):
+            for token in text.split():
+                digest = hashlib.sha256(f"{self.seed}:{token}".encode("utf-8")).digest()
+                rows.append(row)
+                indices.append(digest[0] % self.dimensions)
+                sign = 1 if digest[1] % 2 == 0 else -1
+                weights.append(sign * ((digest[2] / 255.0) + 0.5))
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        np.add.at(matrix, (np.array(rows, dtype=np.intp), np.array(indices, dtype=np.intp)),
+                  np.array(weights, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix.tolist()
+
 
 @lru_cache(maxsize=1)
 def get_embedding_client() -> LocalEmbeddingClient:
@@ -41,3 +60,10 @@ def embed_text(text: str) -> List[float]:
     client = get_embedding_client()
     return client.embed(text)
 
+
+def embed_texts(texts: Sequence[str]) -> List[List[float]]:
+    """Embed a batch of texts in one call to the embedding client."""
+    if not texts:
+        return []
+    return get_embedding_client().embed_many(texts)
+
@@ -0,0 +1,286 @@
+"""
+Durable backends for the metrics event stream.
+
+``MetricsService`` keeps its rollups in memory and hands every event to
+an ``EventStore`` backend selected by ``settings.METRICS_EVENT_STORE``:
+
+- ``memory``: nothing is persisted (tests, single-process development).
+- ``file``: append-only JSON-lines segments in ``METRICS_EVENT_DIR``.
+  Each process writes its own segments and rotates them at
+  ``METRICS_SEGMENT_MAX_BYTES``, so uvicorn workers never interleave
+  writes. Every worker tails the other workers' segments, which lets
+  KPIs on any worker cover events recorded by all of them, and replays
+  the retained segments on startup.
+- ``mongo``: the ``MetricEvent`` time-series collection (timeField
+  ``timestamp``, metaField ``meta`` with event type and actor). Writes are
+  batched and flushed by the sync task; KPIs and time series are computed
+  by server-side aggregation pipelines, so every worker sees every event
+  without replaying them, and a TTL on the collection enforces retention.
+  This is the default, since the API always runs against MongoDB.
+  Time-series collections need MongoDB 5.0; time-to-shortlist percentiles
+  use ``$percentile`` on 7.0+ and a ``$setWindowFields`` rank on older
+  servers (see ``supports_percentile``).
+
+Retention is applied per segment: a segment is deleted once its last
+write is older than the retention window.
+"""
+import asyncio
+import json
+import os
+import socket
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.event import MetricEvent
+
+logger = get_logger(__name__)
+
+SEGMENT_SUFFIX = ".jsonl"
+# First MongoDB release with the $percentile accumulator
+PERCENTILE_MIN_SERVER_VERSION = (7, 0)
+
+
+def _epoch(value: datetime) -> float:
+    """POSIX time for a naive UTC (or aware) datetime."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def parse_event_timestamp(value: Any) -> Optional[datetime]:
+    """Event timestamp (ISO string or datetime) as naive UTC, or None if invalid."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class EventStore:
+    """Backend interface; the base class persists nothing."""
+
+    # True when the backend answers KPI / time series queries itself
+    aggregates = False
+
+    def append(self, event: Dict[str, Any]) -> None:
+        """Record one event. Must not block the event loop for long."""
+
+    async def flush(self) -> None:
+        """Make appended events durable."""
+
+    async def replay(self, since: datetime) -> List[Dict[str, Any]]:
+        """Return retained events from all writers recorded after ``since``."""
+        return []
+
+    async def read_new(self) -> List[Dict[str, Any]]:
+        """Return events other writers recorded since the last call."""
+        return []
+
+    async def prune(self, before: datetime) -> int:
+        """Drop events older than ``before``; returns how many units were removed."""
+        return 0
+
+    async def supports_percentile(self) -> bool:
+        """Whether ``aggregate`` pipelines may use ``$percentile``."""
+        return False
+
+    async def close(self) -> None:
+        await self.flush()
+
+
+class MemoryEventStore(EventStore):
+    """No persistence: events live only in the service's rollups."""
+
+
+class SegmentedFileEventStore(EventStore):
+    """Append-only, size-rotated JSON-lines segments shared by all workers."""
+
+    def __init__(self, directory: Path, segment_max_bytes: int = 16 * 1024 * 1024, writer_id: Optional[str] = None):
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.writer_id = writer_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._sequence = 0
+        self._handle: Optional[IO[str]] = None
+        self._segment: Optional[Path] = None
+        # Read position in each segment written by other workers
+        self._offsets: Dict[Path, int] = {}
+
+    def _is_own(self, path: Path) -> bool:
+        return path.name.startswith(f"{self.writer_id}-")
+
+    def _open_segment(self) -> IO[str]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._sequence += 1
+        self._segment = self.directory / f"{self.writer_id}-{self._sequence:06d}{SEGMENT_SUFFIX}"
+        self._handle = self._segment.open("a", encoding="utf-8")
+        return self._handle
+
+    def append(self, event: Dict[str, Any]) -> None:
+        handle = self._handle or self._open_segment()
+        handle.write(json.dumps(event, default=_json_default) + "\n")
+        if handle.tell() >= self.segment_max_bytes:
+            handle.close()
+            self._handle = None
+
+    async def flush(self) -> None:
+        if self._handle is not None:
+            self._handle.flush()
+
+    def _segments(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def _read_from(self, path: Path, offset: int) -> List[Dict[str, Any]]:
+        """Read complete lines after ``offset``; a line still being written is left for later."""
+        try:
+            with path.open("rb") as handle:
+                handle.seek(offset)
+                data = handle.read()
+        except FileNotFoundError:
+            self._offsets.pop(path, None)
+            return []
+        end = data.rfind(b"\n") + 1
+        self._offsets[path] = offset + end
+        events = []
+        for line in data[:end].splitlines():
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                logger.warning("Skipping corrupt metrics event in %s", path)
+        return events
+
+    def _replay(self, since: datetime) -> List[Dict[str, Any]]:
+        cutoff = _epoch(since)
+        events: List[Dict[str, Any]] = []
+        for path in self._segments():
+            if self._is_own(path):
+                continue
+            if path.stat().st_mtime < cutoff:
+                self._offsets[path] = path.stat().st_size
+                continue
+            events.extend(self._read_from(path, 0))
+        return events
+
+    def _read_new(self) -> List[Dict[str, Any]]:
+        events: List[Dict[str, Any]] = []
+        for path in self._segments():
+            if not self._is_own(path):
+                offset = self._offsets.get(path, 0)
+                if path.stat().st_size > offset:
+                    events.extend(self._read_from(path, offset))
+        return events
+
+    def _prune(self, before: datetime) -> int:
+        cutoff = _epoch(before)
+        removed = 0
+        for path in self._segments():
+            if path == self._segment:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    self._offsets.pop(path, None)
+                    removed += 1
+            except FileNotFoundError:
+                # Another worker pruned it first
+                self._offsets.pop(path, None)
+        return removed
+
+    async def replay(self, since: datetime) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._replay, since)
+
+    async def read_new(self) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._read_new)
+
+    async def prune(self, before: datetime) -> int:
+        return await asyncio.to_thread(self._prune, before)
+
+    async def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+class MongoEventStore(EventStore):
+    """Batched writes into the ``MetricEvent`` time-series collection."""
+
+    aggregates = True
+
+    def __init__(self, max_buffered: int = 10_000):
+        self.max_buffered = max_buffered
+        self._buffer: List[Dict[str, Any]] = []
+        self._server_version: Optional[Tuple[int, ...]] = None
+
+    def append(self, event: Dict[str, Any]) -> None:
+        timestamp = parse_event_timestamp(event.get("timestamp"))
+        if timestamp is None:
+            return
+        event_type = event.get("event_type")
+        data = {
+            key: value for key, value in event.items()
+            if key not in ("timestamp", "event_type", "actor_id", "time_since_application")
+        }
+        # Raw documents in MetricEvent's shape; validating a model per event is not worth it
+        self._buffer.append({
+            "timestamp": timestamp,
+            "meta": {
+                "event_type": str(getattr(event_type, "value", event_type)),
+                "actor_id": event.get("actor_id"),
+            },
+            "time_since_application": event.get("time_since_application"),
+            "data": json.loads(json.dumps(data, default=_json_default)),
+        })
+        if len(self._buffer) > self.max_buffered:
+            # Mongo has been unreachable for a while; keep the newest events
+            del self._buffer[: len(self._buffer) - self.max_buffered]
+
+    async def flush(self) -> None:
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        try:
+            await MetricEvent.get_motor_collection().insert_many(batch, ordered=False)
+        except Exception:
+            self._buffer = batch + self._buffer
+            raise
+
+    async def aggregate(self, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        await self.flush()
+        return await MetricEvent.get_motor_collection().aggregate(pipeline).to_list(None)
+
+    async def server_version(self) -> Tuple[int, ...]:
+        if self._server_version is None:
+            info = await MetricEvent.get_motor_collection().database.command("buildInfo")
+            self._server_version = tuple(info.get("versionArray", ())[:2])
+        return self._server_version
+
+    async def supports_percentile(self) -> bool:
+        return await self.server_version() >= PERCENTILE_MIN_SERVER_VERSION
+
+
+def create_event_store() -> EventStore:
+    """Build the backend configured by ``settings.METRICS_EVENT_STORE``."""
+    backend = settings.METRICS_EVENT_STORE
+    if backend == "memory":
+        return MemoryEventStore()
+    if backend == "file":
+        return SegmentedFileEventStore(Path(settings.METRICS_EVENT_DIR), settings.METRICS_SEGMENT_MAX_BYTES)
+    if backend == "mongo":
+        return MongoEventStore()
+    raise ValueError(f"Unknown METRICS_EVENT_STORE: {backend}")
@@ -0,0 +1,151 @@
+"""
+Offline geocoding and geo query helpers for job location search.
+
+Job coordinates are resolved from a bundled US city gazetteer
+(``app/data/us_cities.csv``) so indexing never calls an external
+geocoding service. Coordinates are stored as GeoJSON points and queried
+through a 2dsphere index.
+"""
+import csv
+import math
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+GAZETTEER_PATH = Path(__file__).resolve().parents[1] / "data" / "us_cities.csv"
+
+EARTH_RADIUS_MILES = 3963.2
+METERS_PER_MILE = 1609.344
+
+# (longitude, latitude), the GeoJSON coordinate order
+Coordinates = Tuple[float, float]
+
+STATE_ABBREVIATIONS = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR",
+    "california": "CA", "colorado": "CO", "connecticut": "CT", "delaware": "DE",
+    "district of columbia": "DC", "florida": "FL", "georgia": "GA", "hawaii": "HI",
+    "idaho": "ID", "illinois": "IL", "indiana": "IN", "iowa": "IA", "kansas": "KS",
+    "kentucky": "KY", "louisiana": "LA", "maine": "ME", "maryland": "MD",
+    "massachusetts": "MA", "michigan": "MI", "minnesota": "MN", "mississippi": "MS",
+    "missouri": "MO", "montana": "MT", "nebraska": "NE", "nevada": "NV",
+    "new hampshire": "NH", "new jersey": "NJ", "new mexico": "NM", "new york": "NY",
+    "north carolina": "NC", "north dakota": "ND", "ohio": "OH", "oklahoma": "OK",
+    "oregon": "OR", "pennsylvania": "PA", "rhode island": "RI", "south carolina": "SC",
+    "south dakota": "SD", "tennessee": "TN", "texas": "TX", "utah": "UT",
+    "vermont": "VT", "virginia": "VA", "washington": "WA", "west virginia": "WV",
+    "wisconsin": "WI", "wyoming": "WY",
+}
+
+
+def _city_key(city: str, state: Optional[str] = None) -> str:
+    key = city.strip().lower()
+    if state:
+        key = f"{key}|{_normalize_state(state)}"
+    return key
+
+
+def _normalize_state(state: str) -> str:
+    cleaned = state.strip()
+    return STATE_ABBREVIATIONS.get(cleaned.lower(), cleaned.upper())
+
+
+@lru_cache(maxsize=1)
+def load_gazetteer(path: Path = GAZETTEER_PATH) -> Dict[str, Coordinates]:
+    """
+    Load the city gazetteer keyed by ``city|ST`` and by bare city name.
+
+    Rows are ordered by population, so a bare city name resolves to the
+    largest city with that name.
+    """
+    gazetteer: Dict[str, Coordinates] = {}
+    with path.open(newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            coordinates = (float(row["longitude"]), float(row["latitude"]))
+            gazetteer.setdefault(_city_key(row["city"], row["state"]), coordinates)
+            gazetteer.setdefault(_city_key(row["city"]), coordinates)
+    return gazetteer
+
+
+def geocode(
+    location: Optional[str] = None,
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+) -> Optional[Coordinates]:
+    """
+    Resolve a location to ``(longitude, latitude)`` using the gazetteer.
+
+    Accepts either a free-form ``"City, ST"`` string or separate city and
+    state values. Returns None when the location is unknown (e.g. "Remote").
+    """
+    if not city and location:
+        parts = [part.strip() for part in location.split(",") if part.strip()]
+        if parts:
+            city = parts[0]
+            if len(parts) > 1 and not state:
+                state = parts[1]
+    if not city:
+        return None
+
+    gazetteer = load_gazetteer()
+    if state:
+        coordinates = gazetteer.get(_city_key(city, state))
+        if coordinates:
+            return coordinates
+    return gazetteer.get(_city_key(city))
+
+
+def geo_point(coordinates: Coordinates) -> Dict[str, Any]:
+    """Build a GeoJSON point from ``(longitude, latitude)``."""
+    longitude, latitude = coordinates
+    return {"type": "Point", "coordinates": [longitude, latitude]}
+
+
+def haversine_miles(origin: Coordinates, destination: Coordinates) -> float:
+    """Great-circle distance in miles between two ``(longitude, latitude)`` pairs."""
+    lon1, lat1 = map(math.radians, origin)
+    lon2, lat2 = map(math.radians, destination)
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+def geo_within_radius(coordinates: Coordinates, radius_miles: float) -> Dict[str, Any]:
+    """``$geoWithin`` condition matching points within ``radius_miles``."""
+    return {
+        "$geoWithin": {
+            "$centerSphere": [list(coordinates), radius_miles / EARTH_RADIUS_MILES]
+        }
+    }
+
+
+def near_sphere(coordinates: Coordinates, radius_miles: float) -> Dict[str, Any]:
+    """``$nearSphere`` condition returning points within ``radius_miles`` nearest first."""
+    return {
+        "$nearSphere": {
+            "$geometry": geo_point(coordinates),
+            "$maxDistance": radius_miles * METERS_PER_MILE,
+        }
+    }
+
+
+def assign_job_coordinates(job: Any) -> bool:
+    """
+    Geocode a job's location onto its ``geo_location`` field.
+
+    Returns True if coordinates were found. Jobs whose location cannot be
+    resolved have ``geo_location`` cleared so they drop out of radius
+    searches instead of keeping stale coordinates.
+    """
+    location = getattr(job, "location", None)
+    city = getattr(job, "city", None)
+    state = getattr(job, "state", None)
+    if location is not None and not isinstance(location, str):
+        # Structured location (e.g. JobLocation) rather than "City, ST"
+        city = city or getattr(location, "city", None)
+        state = state or getattr(location, "state", None)
+        location = None
+
+    coordinates = geocode(location=location, city=city, state=state)
+    job.geo_location = geo_point(coordinates) if coordinates else None
+    return coordinates is not None
@@ -0,0 +1,235 @@
+"""
+Index advisor for job search queries.
+
+Replays the query shapes produced by the search endpoint, proposes
+compound indexes ordered by the Equality-Sort-Range (ESR) rule, and checks
+MongoDB ``explain()`` output for collection scans.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.services.search_query import SearchQuery, build_search_query
+
+IndexKeys = List[Tuple[str, Any]]
+
+RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte", "$ne", "$nin"}
+EQUALITY_OPERATORS = {"$eq", "$in", "$all"}
+GEO_OPERATORS = {"$geoWithin", "$geoIntersects", "$near", "$nearSphere"}
+
+# Filter combinations the search page issues most often. Each entry is a set
+# of keyword arguments for ``build_search_query``.
+COMMON_SEARCH_SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "remote_only": {"remote_only": True},
+    "work_types": {"work_types": "remote,hybrid"},
+    "experience_levels": {"experience_levels": "mid,senior"},
+    "job_types": {"job_types": "full_time"},
+    "companies": {"companies": "Stripe,Figma"},
+    "posted_within": {"posted_within": "7d"},
+    "salary_min": {"salary_min": 100000},
+    "salary_sort": {"sort_by": "salary"},
+    "location_radius": {"location": "Austin, TX", "radius": 25},
+    "remote_senior_recent": {
+        "work_types": "remote",
+        "experience_levels": "senior",
+        "posted_within": "7d",
+    },
+}
+
+
+@dataclass
+class QueryShape:
+    """Fields of a query grouped by how an index can serve them."""
+
+    equality: List[str] = field(default_factory=list)
+    geo: List[str] = field(default_factory=list)
+    sort: IndexKeys = field(default_factory=list)
+    range: List[str] = field(default_factory=list)
+    unindexed: List[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        parts = [
+            f"E={','.join(self.equality) or '-'}",
+            f"G={','.join(self.geo) or '-'}",
+            f"S={','.join(f'{name}:{direction}' for name, direction in self.sort) or '-'}",
+            f"R={','.join(self.range) or '-'}",
+        ]
+        if self.unindexed:
+            parts.append(f"X={','.join(self.unindexed)}")
+        return " ".join(parts)
+
+
+@dataclass
+class IndexAdvice:
+    """Advisor result for one replayed search scenario."""
+
+    scenario: str
+    shape: QueryShape
+    proposed_index: IndexKeys
+    winning_stages: List[str] = field(default_factory=list)
+
+    @property
+    def uses_collscan(self) -> bool:
+        return "COLLSCAN" in self.winning_stages
+
+
+def _add_unique(items: List[str], name: str) -> None:
+    if name not in items:
+        items.append(name)
+
+
+def _classify_conditions(conditions: Dict[str, Any], shape: QueryShape) -> None:
+    for name, condition in conditions.items():
+        if name == "$and":
+            for clause in condition:
+                _classify_conditions(clause, shape)
+            continue
+        if name in ("$or", "$nor"):
+            # Alternatives over different fields cannot be served by a single
+            # compound index; regex alternatives cannot use one at all.
+            for clause in condition:
+                for clause_field in clause:
+                    _add_unique(shape.unindexed, clause_field)
+            continue
+        if not isinstance(condition, dict):
+            _add_unique(shape.equality, name)
+            continue
+        operators = set(condition)
+        if "$regex" in operators:
+            _add_unique(shape.unindexed, name)
+        elif operators & GEO_OPERATORS:
+            _add_unique(shape.geo, name)
+        elif operators & RANGE_OPERATORS:
+            _add_unique(shape.range, name)
+        elif operators & EQUALITY_OPERATORS:
+            _add_unique(shape.equality, name)
+        else:
+            _add_unique(shape.unindexed, name)
+
+
+def extract_shape(search_query: SearchQuery) -> QueryShape:
+    """Classify the fields of a search query into equality, sort and range."""
+    shape = QueryShape(sort=list(search_query.sort))
+    _classify_conditions(search_query.filter, shape)
+    return shape
+
+
+def propose_index(shape: QueryShape) -> IndexKeys:
+    """
+    Propose a compound index for a query shape using the ESR rule.
+
+    Equality fields come first, followed by any 2dsphere geo fields, the
+    sort keys in their sort direction, then range fields. Fields that
+    cannot use an index are left out.
+    """
+    keys: IndexKeys = []
+    seen = set()
+    for name in shape.equality:
+        if name not in seen:
+            keys.append((name, 1))
+            seen.add(name)
+    for name in shape.geo:
+        if name not in seen:
+            keys.append((name, "2dsphere"))
+            seen.add(name)
+    for name, direction in shape.sort:
+        if name not in seen:
+            keys.append((name, direction))
+            seen.add(name)
+    for name in shape.range:
+        if name not in seen:
+            keys.append((name, 1))
+            seen.add(name)
+    return keys
+
+
+def _is_prefix(shorter: IndexKeys, longer: IndexKeys) -> bool:
+    return len(shorter) <= len(longer) and list(longer[: len(shorter)]) == list(shorter)
+
+
+def recommended_indexes(
+    scenarios: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> List[IndexKeys]:
+    """
+    Return the deduplicated index set covering the given search scenarios.
+
+    Indexes that are a key prefix of another proposed index are dropped,
+    since the longer index serves the same queries.
+    """
+    scenarios = scenarios if scenarios is not None else COMMON_SEARCH_SCENARIOS
+    proposals: List[IndexKeys] = []
+    for params in scenarios.values():
+        keys = propose_index(extract_shape(build_search_query(**params)))
+        if keys and keys not in proposals:
+            proposals.append(keys)
+    return [
+        keys for keys in proposals
+        if not any(other != keys and _is_prefix(keys, other) for other in proposals)
+    ]
+
+
+def is_index_covered(keys: IndexKeys, declared: Iterable[Any]) -> bool:
+    """Check whether ``keys`` is a prefix of one of the declared indexes."""
+    for index in declared:
+        if isinstance(index, str):
+            candidate = [(index, 1)]
+        else:
+            candidate = [tuple(key) for key in index]
+        if _is_prefix(list(keys), candidate):
+            return True
+    return False
+
+
+def winning_plan_stages(explain: Dict[str, Any]) -> List[str]:
+    """Collect every stage name in the winning plan of an explain document."""
+    planner = explain.get("queryPlanner", explain)
+    plan = planner.get("winningPlan", {})
+    # Slot-based engine plans nest the classic tree under ``queryPlan``.
+    if "queryPlan" in plan:
+        plan = plan["queryPlan"]
+
+    stages: List[str] = []
+    pending: List[Dict[str, Any]] = [plan]
+    while pending:
+        node = pending.pop()
+        if "stage" in node:
+            stages.append(node["stage"])
+        if "inputStage" in node:
+            pending.append(node["inputStage"])
+        pending.extend(node.get("inputStages", []))
+    return stages
+
+
+async def explain_search(collection: Any, search_query: SearchQuery) -> Dict[str, Any]:
+    """Run ``explain()`` for a search query against a Motor collection."""
+    cursor = collection.find(search_query.find_filter())
+    if search_query.sort:
+        cursor = cursor.sort(search_query.sort)
+    return await cursor.explain()
+
+
+async def audit_search_indexes(
+    collection: Any,
+    scenarios: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> List[IndexAdvice]:
+    """Replay search scenarios against a collection and report their plans."""
+    scenarios = scenarios if scenarios is not None else COMMON_SEARCH_SCENARIOS
+    results: List[IndexAdvice] = []
+    for name, params in scenarios.items():
+        search_query = build_search_query(**params)
+        shape = extract_shape(search_query)
+        explain = await explain_search(collection, search_query)
+        results.append(
+            IndexAdvice(
+                scenario=name,
+                shape=shape,
+                proposed_index=propose_index(shape),
+                winning_stages=winning_plan_stages(explain),
+            )
+        )
+    return results
+
+
+def collscan_scenarios(results: Sequence[IndexAdvice]) -> List[str]:
+    """Names of the scenarios whose winning plan scans the whole collection."""
+    return [result.scenario for result in results if result.uses_collscan]
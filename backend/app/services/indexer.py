@@ -1,37 +1,53 @@
+import asyncio
+import time
 from datetime import datetime
-from typing import Iterable, List, Optional
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
 
+from app.core.config import settings
+from app.core.logging import get_logger
 from app.models.job import Job
-from app.services.embedding import embed_text
+from app.services.analyzer import get_analyzer
+from app.services.embedding import embed_text, embed_texts
+from app.services.geo import assign_job_coordinates
+from app.services.profile_index import profile_index
+from app.services.skill_vocabulary import skill_vocabulary
 from app.services.normalization import (
+    AnalyzedText,
+    analyze_text,
     normalize_skills,
-    normalize_text_chunks,
     normalize_title,
-    tokenize,
 )
 
+logger = get_logger(__name__)
 
-def build_job_text(job: Job, normalized_skills: List[str]) -> str:
-    parts: List[str] = [
+
+def analyze_job(job: Job, normalized_skills: List[str]) -> AnalyzedText:
+    return analyze_text(
         normalize_title(job.title),
-        job.description.strip(),
+        job.description,
         " ".join(normalized_skills),
-    ]
-    if job.location:
-        parts.append(job.location)
-    return normalize_text_chunks(*parts)
+        job.location or "",
+        analyzer=get_analyzer(),
+    )
+
+
+def build_job_text(job: Job, normalized_skills: List[str]) -> str:
+    return analyze_job(job, normalized_skills).text
 
 
 async def index_job(job: Job) -> Job:
     normalized_skills = normalize_skills(job.skills)
-    normalized_text = build_job_text(job, normalized_skills)
-    tokens = tokenize(normalized_text)
+    skill_vocabulary.add(normalized_skills)
+    normalized_text, tokens = analyze_job(job, normalized_skills)
     vector = embed_text(normalized_text) if normalized_text else None
 
     job.skills = normalized_skills
     job.normalized_text = normalized_text
     job.tokens = tokens
+    job.token_analyzer = get_analyzer().signature
     job.embedding = vector
+    assign_job_coordinates(job)
     job.indexed_at = datetime.utcnow()
     await job.save()
     return job
@@ -45,5 +61,125 @@ async def index_jobs(jobs: Iterable[Job]) -> int:
     return count
 
 
+async def backfill_job_coordinates(collection: Any = None) -> int:
+    """
+    Geocode stored jobs that predate ``geo_location``.
+
+    Radius and distance searches filter on ``geo_location``, so jobs saved
+    before it existed would never match a geocoded location. Jobs whose
+    location cannot be resolved are stored with ``geo_location: null`` so
+    later runs skip them. Returns the number of jobs updated.
+    """
+    if collection is None:
+        collection = Job.get_motor_collection()
+    cursor = collection.find(
+        {"geo_location": {"$exists": False}},
+        {"location": 1, "city": 1, "state": 1},
+    )
+    updated = 0
+    async for document in cursor:
+        location = document.get("location")
+        if isinstance(location, dict):
+            location = SimpleNamespace(**location)
+        job = SimpleNamespace(location=location, city=document.get("city"), state=document.get("state"))
+        assign_job_coordinates(job)
+        await collection.update_one(
+            {"_id": document["_id"]}, {"$set": {"geo_location": job.geo_location}}
+        )
+        updated += 1
+    return updated
+
+
 def ensure_job_tokens(job: Job) -> bool:
+    """Whether the job's stored tokens are usable with the current analyzer."""
+    if getattr(job, "token_analyzer", None) != get_analyzer().signature:
+        return False
     return bool(job.tokens and job.normalized_text)
+
+
+def analyze_profile(profile: Any) -> AnalyzedText:
+    return analyze_text(
+        " ".join(normalize_skills(profile.skills or [])),
+        " ".join(normalize_title(title) for title in (profile.titles or [])),
+        profile.raw_text or "",
+        analyzer=get_analyzer(),
+    )
+
+
+def build_profile_text(profile: Any) -> str:
+    return analyze_profile(profile).text
+
+
+def index_profile(profile: Any) -> None:
+    """Add or replace a seeker profile in the candidate matching index."""
+    text, tokens = analyze_profile(profile)
+    embedding = embed_text(text) if text else None
+    profile_index.add(str(profile.user_id), tokens, embedding)
+
+
+def rebuild_profile_index(profiles: Iterable[Any]) -> int:
+    """Rebuild the candidate matching index from stored profiles."""
+    profiles = list(profiles)
+    analyzed = [analyze_profile(profile) for profile in profiles]
+    embeddings = embed_texts([text for text, _ in analyzed])
+    entries = [
+        (str(profile.user_id), tokens, embedding if text else None)
+        for profile, (text, tokens), embedding in zip(profiles, analyzed, embeddings)
+    ]
+    profile_index.rebuild(entries)
+    return len(entries)
+
+
+class ProfileIndexLoader:
+    """
+    Loads ``profile_index`` from stored profiles and keeps it fresh.
+
+    The index is per process: profiles uploaded through another uvicorn
+    worker or imported by ``scripts/ingest_resumes.py`` only reach it through
+    a rebuild. The first caller builds it (concurrent callers wait for that
+    one build); after that a rebuild runs in the background whenever the
+    index is older than ``refresh_seconds``, while searches keep using the
+    current one. Analysis and embedding run in a worker thread.
+    """
+
+    def __init__(self, refresh_seconds: float = 300.0):
+        self.refresh_seconds = refresh_seconds
+        self.loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._refresh: Optional[asyncio.Task] = None
+
+    @property
+    def stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at >= self.refresh_seconds
+
+    async def ensure_loaded(self, load_profiles: Callable[[], Awaitable[List[Any]]]) -> None:
+        """Build the index if it is empty; schedule a refresh if it is stale."""
+        if not profile_index.loaded:
+            await self.rebuild(load_profiles, force=False)
+        elif self.stale and (self._refresh is None or self._refresh.done()):
+            self._refresh = asyncio.create_task(self._refresh_in_background(load_profiles))
+
+    async def rebuild(self, load_profiles: Callable[[], Awaitable[List[Any]]], force: bool = True) -> int:
+        """Rebuild the index from ``load_profiles()``; returns the number of profiles."""
+        async with self._lock:
+            if profile_index.loaded and not force:
+                return len(profile_index)
+            started = time.monotonic()
+            profile_index.track_changes()
+            try:
+                profiles = await load_profiles()
+                count = await asyncio.to_thread(rebuild_profile_index, profiles)
+            except BaseException:
+                profile_index.track_changes(False)
+                raise
+            self.loaded_at = started
+            return count
+
+    async def _refresh_in_background(self, load_profiles: Callable[[], Awaitable[List[Any]]]) -> None:
+        try:
+            await self.rebuild(load_profiles)
+        except Exception:
+            logger.exception("Profile index refresh failed")
+
+
+profile_index_loader = ProfileIndexLoader(settings.PROFILE_INDEX_REFRESH_SECONDS)
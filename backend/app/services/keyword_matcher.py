@@ -0,0 +1,162 @@
+"""
+Compiled multi-keyword matcher for resume parsing.
+
+Keywords are merged into a character trie and emitted as a single regular
+expression, so one pass over the text finds every keyword no matter how
+large the keyword list is. Matches must sit on word boundaries ("ml" does
+not match inside "html"); ``+``, ``#`` and ``.`` count as word characters
+so that "c" does not match "c++" or "c#". A dot followed by a lowercase
+letter or digit continues the word ("node" does not match "node.js"), but
+a dot that ends a sentence does not ("python.Also" still matches "python").
+Matching is case-insensitive apart from that check, so it runs on the
+original text rather than a lowercased copy.
+
+``AliasMatcher`` finds the same matches with dictionary lookups instead of
+a compiled pattern. Building one is just a set construction, so it suits
+vocabularies too large to compile at startup, such as the skill taxonomy.
+"""
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Set
+
+# Characters that continue a keyword; a match may not touch one on either side
+_WORD_CHARS = r"a-z0-9+#"
+_BOUNDARY_BEFORE = rf"(?<![{_WORD_CHARS}])"
+# Case-sensitive: ".js" continues a token, ".Also" starts a new sentence
+_BOUNDARY_AFTER = rf"(?![{_WORD_CHARS}]|(?-i:\.[a-z0-9]))"
+
+_END = ""  # Trie key marking the end of a keyword
+
+# A keyword's first word (or first symbol) where one may start, and the
+# positions where one may end, in the original text
+_HEAD = rf"[{_WORD_CHARS}]+|[^\s{_WORD_CHARS}]"
+_STARTS = re.compile(rf"(?i){_BOUNDARY_BEFORE}(?:{_HEAD})")
+_ENDS = re.compile(rf"(?i)(?:{_BOUNDARY_BEFORE}[{_WORD_CHARS}]+|[^\s{_WORD_CHARS}]){_BOUNDARY_AFTER}")
+_WORD_CHAR_SET = frozenset("abcdefghijklmnopqrstuvwxyz0123456789+#")
+
+
+def _normalize_keyword(keyword: str) -> str:
+    return " ".join(keyword.lower().split())
+
+
+def load_keywords(path: Path) -> List[str]:
+    """Read one keyword per line, skipping blank lines and ``#`` comments."""
+    keywords = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            keyword = line.strip()
+            if keyword and not keyword.startswith("#"):
+                keywords.append(keyword)
+    return keywords
+
+
+def _build_trie(keywords: Iterable[str]) -> Dict:
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[_END] = {}
+    return trie
+
+
+def _escape(char: str) -> str:
+    # Whitespace inside a keyword matches any run of whitespace in the text
+    return r"\s+" if char == " " else re.escape(char)
+
+
+def _trie_pattern(node: Dict) -> str:
+    optional = _END in node
+    branches = [_escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char != _END]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not optional:
+        return branches[0]
+    pattern = "(?:" + "|".join(branches) + ")"
+    # Greedy optional group prefers the longest keyword sharing a prefix
+    return pattern + "?" if optional else pattern
+
+
+class KeywordMatcher:
+    """Find keywords from a fixed vocabulary in text, ignoring case."""
+
+    def __init__(self, keywords: Iterable[str], pattern: Optional[str] = None):
+        self.keywords: Set[str] = {_normalize_keyword(keyword) for keyword in keywords}
+        self.keywords.discard("")
+        # ``pattern`` is a previously built ``self.pattern.pattern``; reusing it skips the trie build
+        self.pattern: Pattern[str] = re.compile(pattern) if pattern is not None else self._compile(self.keywords)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    @staticmethod
+    def _compile(keywords: Set[str]) -> Pattern[str]:
+        if not keywords:
+            return re.compile(r"(?!)")  # Never matches
+        body = _trie_pattern(_build_trie(keywords))
+        return re.compile(f"(?i){_BOUNDARY_BEFORE}({body}){_BOUNDARY_AFTER}")
+
+    @classmethod
+    def from_file(cls, path: Path) -> "KeywordMatcher":
+        return cls(load_keywords(path))
+
+    def find_all(self, text: str) -> Set[str]:
+        """Return the distinct keywords that occur in ``text``."""
+        return {" ".join(match.group(1).lower().split()) for match in self.pattern.finditer(text)}
+
+    def contains_any(self, text: str) -> bool:
+        return self.pattern.search(text) is not None
+
+
+class AliasMatcher:
+    """
+    Find keywords from a fixed vocabulary with set lookups.
+
+    Every position that may start a keyword is tried against the text up
+    to each later position that may end one, and the longest keyword wins,
+    as with ``KeywordMatcher``. Starts whose first word does not begin any
+    keyword are skipped outright. ``prefixes`` holds the keyword prefixes
+    that stop before a non-word character ("react" for "react native",
+    "ci" for "ci/cd"), so a span that is neither a keyword nor such a
+    prefix ends the search from that start.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Set[str] = {_normalize_keyword(keyword) for keyword in keywords}
+        self.keywords.discard("")
+        self.heads: Set[str] = set()
+        self.prefixes: Set[str] = set()
+        head = re.compile(_HEAD)
+        for keyword in self.keywords:
+            self.heads.add(head.match(keyword).group())
+            for position in range(1, len(keyword)):
+                if keyword[position] not in _WORD_CHAR_SET:
+                    self.prefixes.add(keyword[:position])
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _matches(self, text: str) -> Iterator[str]:
+        position = 0
+        for start_match in _STARTS.finditer(text):
+            start = start_match.start()
+            if start < position or start_match.group().lower() not in self.heads:
+                continue
+            longest = None
+            for end_match in _ENDS.finditer(text, start):
+                end = end_match.end()
+                span = _normalize_keyword(text[start:end])
+                if span in self.keywords:
+                    longest = (span, end)
+                if span not in self.prefixes:
+                    break
+            if longest is not None:
+                position = longest[1]
+                yield longest[0]
+
+    def find_all(self, text: str) -> Set[str]:
+        """Return the distinct keywords that occur in ``text``."""
+        return set(self._matches(text))
+
+    def contains_any(self, text: str) -> bool:
+        return next(self._matches(text), None) is not None
@@ -10,7 +10,7 @@ import sys
 import uuid
 from contextvars import ContextVar
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from app.schemas.events import (
     BaseEvent,
@@ -223,6 +223,9 @@ class StructuredLogger:
         resume_id: str,
         parsing_duration: Optional[float] = None,
         success: bool = True,
+        page_count: Optional[int] = None,
+        page_timings: Optional[List[float]] = None,
+        truncated: Optional[bool] = None,
     ):
         """Log a resume parsing event."""
         event = ResumeEvent(
@@ -230,6 +233,9 @@ class StructuredLogger:
             candidate_id=candidate_id,
             resume_id=resume_id,
             parsing_duration=parsing_duration,
+            page_count=page_count,
+            page_timings=page_timings,
+            truncated=truncated,
             success=success,
             severity=EventSeverity.INFO if success else EventSeverity.WARNING,
         )
@@ -0,0 +1,75 @@
+"""
+Applicant match scoring.
+
+Adapts Job and Profile documents to the inputs of ``app.ai.matching`` and
+scores every applicant of a job in one batch. Kept free of database access
+so the background worker and any offline tooling share the same scoring.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+from pydantic import BaseModel
+
+from app.ai.matching import generate_match_explanation, score_profiles_for_job
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def job_match_data(job: Any) -> Dict[str, Any]:
+    """Build the ``job_data`` dict used by the matching functions."""
+    location = getattr(job, "location", None)
+    if isinstance(location, BaseModel):
+        location_data = location.model_dump()
+    elif isinstance(location, str):
+        location_data = {"city": location, "is_remote": "remote" in location.lower()}
+    else:
+        location_data = {}
+    if _enum_value(getattr(job, "work_type", None)) == "remote":
+        location_data["is_remote"] = True
+    location_data["city"] = location_data.get("city") or getattr(job, "city", None) or ""
+
+    return {
+        "skills_required": getattr(job, "skills_required", None) or getattr(job, "skills", None) or [],
+        "experience_level": _enum_value(getattr(job, "experience_level", None)) or "mid",
+        "location": location_data,
+    }
+
+
+def job_match_embedding(job: Any) -> Optional[List[float]]:
+    return getattr(job, "job_embedding", None) or getattr(job, "embedding", None)
+
+
+def profile_match_data(profile: Any) -> Dict[str, Any]:
+    """Build the ``profile_data`` dict used by the matching functions."""
+    preferences = getattr(profile, "preferences", None)
+    if isinstance(preferences, BaseModel):
+        preferences = preferences.model_dump()
+    return {
+        "skills": getattr(profile, "skills", None) or [],
+        "experience_level": _enum_value(getattr(profile, "experience_level", None)) or "mid",
+        "preferences": preferences or {},
+    }
+
+
+def profile_match_embedding(profile: Any) -> Optional[List[float]]:
+    return getattr(profile, "profile_embedding", None) or getattr(profile, "embedding", None)
+
+
+def score_applicants(job: Any, profiles: Sequence[Optional[Any]]) -> List[Dict[str, Any]]:
+    """
+    Score applicant profiles against a job in one batch.
+
+    ``profiles`` may contain None for applicants without a profile; they are
+    scored on an empty profile. Each result holds the ``calculate_match_score``
+    breakdown plus a human-readable ``explanation``.
+    """
+    scores = score_profiles_for_job(
+        job_match_data(job),
+        [profile_match_data(profile) if profile else {} for profile in profiles],
+        job_embedding=job_match_embedding(job),
+        profile_embeddings=[profile_match_embedding(profile) if profile else None for profile in profiles],
+    )
+    for score in scores:
+        score["explanation"] = generate_match_explanation(score)
+    return scores
@@ -0,0 +1,153 @@
+"""
+Background worker that fills ``Application.ai_match_score``.
+
+Applications are queued for scoring when they are created, and every
+application of a job or seeker is queued again when the job or profile
+changes. The worker drains the queue in batches, scores each job's
+applicants together and writes the results with one bulk update.
+"""
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+
+from app.core.logging import get_logger
+from app.models.application import Application
+from app.models.job import Job
+from app.models.profile import Profile
+from app.services.match_scores import score_applicants
+
+logger = get_logger(__name__)
+
+# Work item kinds: a single application, or every application of a job / seeker
+APPLICATION = "application"
+JOB = "job"
+PROFILE = "profile"
+
+WorkItem = Tuple[str, str]
+
+
+class MatchScoreWorker:
+    """Queue-backed worker that computes applicant match scores."""
+
+    def __init__(self, batch_size: int = 100):
+        self.batch_size = batch_size
+        self._queue: "asyncio.Queue[WorkItem]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self.scored_count = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def enqueue_application(self, application_id: str) -> None:
+        """Score a newly created application."""
+        self._queue.put_nowait((APPLICATION, str(application_id)))
+
+    def recompute_job(self, job_id: str) -> None:
+        """Rescore every application to a job after the job changed."""
+        self._queue.put_nowait((JOB, str(job_id)))
+
+    def recompute_profile(self, user_id: str) -> None:
+        """Rescore every application by a seeker after their profile changed."""
+        self._queue.put_nowait((PROFILE, str(user_id)))
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self.process(batch)
+            except Exception:
+                logger.exception("Failed to score %d match score work items", len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def join(self) -> None:
+        """Wait until every queued item has been processed."""
+        await self._queue.join()
+
+    async def process(self, items: Sequence[WorkItem]) -> int:
+        """Score the applications referenced by a batch of work items."""
+        clauses: Dict[str, List[Any]] = defaultdict(list)
+        for kind, key in items:
+            if kind == APPLICATION:
+                clauses["_id"].append(PydanticObjectId(key))
+            elif kind == JOB:
+                clauses["job_id"].append(key)
+            elif kind == PROFILE:
+                clauses["user_id"].append(key)
+        if not clauses:
+            return 0
+
+        query = {"$or": [{field: {"$in": values}} for field, values in clauses.items()]}
+        applications = await Application.find(query).to_list()
+        return await self.score_applications(applications)
+
+    async def score_applications(self, applications: Sequence[Application]) -> int:
+        """Score applications grouped by job and store the results in bulk."""
+        by_job: Dict[str, List[Application]] = defaultdict(list)
+        for application in applications:
+            by_job[str(application.job_id)].append(application)
+        if not by_job:
+            return 0
+
+        job_ids = [PydanticObjectId(job_id) for job_id in by_job]
+        jobs = await Job.find({"_id": {"$in": job_ids}}).to_list()
+        jobs_by_id = {str(job.id): job for job in jobs}
+        user_ids = list({str(application.user_id) for application in applications})
+        profiles = await Profile.find({"user_id": {"$in": user_ids}}).to_list()
+        profiles_by_user = {str(profile.user_id): profile for profile in profiles}
+
+        now = datetime.utcnow()
+        updates = []
+        for job_id, job_applications in by_job.items():
+            job = jobs_by_id.get(job_id)
+            if job is None:
+                continue
+            scores = score_applicants(
+                job,
+                [profiles_by_user.get(str(application.user_id)) for application in job_applications],
+            )
+            for application, score in zip(job_applications, scores):
+                updates.append(
+                    UpdateOne(
+                        {"_id": application.id},
+                        {"$set": {
+                            "ai_match_score": score["total_score"],
+                            "match_explanation": score["explanation"],
+                            "match_scored_at": now,
+                        }},
+                    )
+                )
+
+        if updates:
+            await Application.get_motor_collection().bulk_write(updates, ordered=False)
+        self.scored_count += len(updates)
+        return len(updates)
+
+
+match_score_worker = MatchScoreWorker()
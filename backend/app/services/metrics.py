@@ -5,12 +5,184 @@ Aggregates event data to calculate key performance indicators:
 - Click-through rate (CTR) on recommendations
 - Application conversion rate
 - Time-to-shortlist metrics
+
+``add_event`` folds every event into per-minute, per-hour and per-day
+rollup buckets (event counts by type, a HyperLogLog of actors and a
+``QuantileSketch`` of time-to-shortlist), so ``get_kpis`` merges a few dozen buckets
+instead of scanning every stored event. KPI windows have minute
+resolution: the minutes containing ``start_date`` and ``end_date`` are
+counted in full.
+
+Memory depends on time, not traffic: every bucket has a fixed upper size,
+raw events are only kept for the most recent ``METRICS_MEMORY_MAX_EVENTS``
+and hour and day rollups are pruned to ``METRICS_RETENTION_DAYS``. Minute
+buckets, by far the most numerous, are only kept for
+``METRICS_MINUTE_ROLLUP_HOURS``; window edges older than that are widened
+to whole hours. Events
+are also handed to the configured ``EventStore`` backend, and the
+background sync task reads events recorded by other workers from it.
+With the Mongo backend (the default), ``query_kpis`` and
+``query_time_series`` run as server-side aggregations over the
+``MetricEvent`` time-series collection instead. Time-to-shortlist
+percentiles use ``$percentile`` on MongoDB 7.0+ and fall back to exact
+nearest-rank values picked with ``$setWindowFields`` on older servers.
+
+Time series are built from the same rollups: each series bucket sums the
+event counts of the coarsest rollup buckets tiling it, so series share the
+KPIs' minute resolution and cost no memory per event. Series are declared
+in ``TIME_SERIES_METRICS``.
 """
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+import asyncio
+import math
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, NamedTuple, Optional, Any, Tuple
 from pydantic import BaseModel
 
+from app.core.config import settings
+from app.core.logging import get_logger
 from app.schemas.events import EventType
+from app.services.event_store import (
+    EventStore,
+    MemoryEventStore,
+    create_event_store,
+    parse_event_timestamp,
+)
+from app.services.sketches import HyperLogLog, QuantileSketch
+
+logger = get_logger(__name__)
+
+# Rollup granularities in seconds, finest first
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+ROLLUP_GRANULARITIES = (MINUTE, HOUR, DAY)
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Time-to-shortlist percentiles reported in KPIMetrics
+SHORTLIST_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class SeriesDefinition(NamedTuple):
+    """A time series: count of ``numerator`` events, divided by ``denominator`` events if set."""
+    
+    label: str
+    numerator: str
+    denominator: Optional[str] = None
+
+
+TIME_SERIES_METRICS: Dict[str, SeriesDefinition] = {
+    "ctr": SeriesDefinition(
+        "CTR", EventType.RECOMMENDATION_CLICK.value, EventType.RECOMMENDATION_VIEW.value
+    ),
+    "conversion": SeriesDefinition(
+        "Conversion Rate", EventType.APPLICATION_SUBMITTED.value, EventType.RECOMMENDATION_CLICK.value
+    ),
+    "views": SeriesDefinition("Recommendation Views", EventType.RECOMMENDATION_VIEW.value),
+    "clicks": SeriesDefinition("Recommendation Clicks", EventType.RECOMMENDATION_CLICK.value),
+    "applications": SeriesDefinition("Applications", EventType.APPLICATION_SUBMITTED.value),
+    "shortlists": SeriesDefinition("Shortlists", EventType.INBOX_CANDIDATE_SHORTLISTED.value),
+}
+
+
+def shortlist_rank(quantile: float, count: int) -> int:
+    """1-based nearest-rank position of ``quantile`` among ``count`` sorted values."""
+    return max(1, math.ceil(quantile * count))
+
+
+def _shortlist_facet(percentile_operator: bool) -> List[Dict[str, Any]]:
+    match = {"$match": {
+        "meta.event_type": EventType.INBOX_CANDIDATE_SHORTLISTED.value,
+        "time_since_application": {"$gt": 0},
+    }}
+    if percentile_operator:
+        return [
+            match,
+            {"$group": {
+                "_id": None,
+                "count": {"$sum": 1},
+                "percentiles": {"$percentile": {
+                    "input": "$time_since_application",
+                    "p": list(SHORTLIST_QUANTILES),
+                    "method": "approximate",
+                }},
+            }},
+        ]
+    # Before MongoDB 7.0: number the sorted values and keep the documents at
+    # the nearest-rank position of each quantile (see ``shortlist_rank``)
+    return [
+        match,
+        {"$setWindowFields": {
+            "sortBy": {"time_since_application": 1},
+            "output": {
+                "rank": {"$documentNumber": {}},
+                "count": {"$count": {}, "window": {"documents": ["unbounded", "unbounded"]}},
+            },
+        }},
+        {"$match": {"$expr": {"$in": ["$rank", {"$map": {
+            "input": list(SHORTLIST_QUANTILES),
+            "as": "quantile",
+            "in": {"$max": [1, {"$ceil": {"$multiply": ["$$quantile", "$count"]}}]},
+        }}]}}},
+        {"$group": {
+            "_id": None,
+            "count": {"$first": "$count"},
+            "ranked": {"$push": {"rank": "$rank", "value": "$time_since_application"}},
+        }},
+    ]
+
+
+def kpi_pipeline(
+    start_date: datetime,
+    end_date: datetime,
+    percentile_operator: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Aggregation over ``MetricEvent`` returning the raw inputs for ``KPIMetrics``.
+
+    ``percentile_operator`` selects ``$percentile`` (MongoDB 7.0+, approximate)
+    for time-to-shortlist; otherwise exact nearest-rank values are picked
+    with ``$setWindowFields``.
+    """
+    return [
+        {"$match": {"timestamp": {"$gte": start_date, "$lte": end_date}}},
+        {"$facet": {
+            "counts": [
+                {"$group": {"_id": "$meta.event_type", "count": {"$sum": 1}}},
+            ],
+            "users": [
+                {"$match": {"meta.actor_id": {"$ne": None}}},
+                {"$group": {"_id": "$meta.actor_id"}},
+                {"$count": "unique_users"},
+            ],
+            "shortlist": _shortlist_facet(percentile_operator),
+        }},
+    ]
+
+
+def time_series_pipeline(
+    definition: SeriesDefinition,
+    start_date: datetime,
+    bucket_size: timedelta,
+    bucket_count: int,
+) -> List[Dict[str, Any]]:
+    """Aggregation counting a series' events per bucket; ``_id`` is the bucket index."""
+    event_types = [definition.numerator]
+    if definition.denominator:
+        event_types.append(definition.denominator)
+    bucket_ms = bucket_size.total_seconds() * 1000
+    return [
+        {"$match": {
+            "timestamp": {"$gte": start_date, "$lt": start_date + bucket_count * bucket_size},
+            "meta.event_type": {"$in": event_types},
+        }},
+        {"$group": {
+            "_id": {"$floor": {"$divide": [{"$subtract": ["$timestamp", start_date]}, bucket_ms]}},
+            "numerator": {"$sum": {"$cond": [{"$eq": ["$meta.event_type", definition.numerator]}, 1, 0]}},
+            "denominator": {"$sum": {"$cond": [{"$eq": ["$meta.event_type", definition.denominator]}, 1, 0]}},
+        }},
+    ]
 
 
 class KPIMetrics(BaseModel):
@@ -34,6 +206,9 @@ class KPIMetrics(BaseModel):
     candidates_shortlisted: int = 0
     candidates_rejected: int = 0
     median_time_to_shortlist: Optional[float] = None  # seconds
+    p90_time_to_shortlist: Optional[float] = None  # seconds
+    p99_time_to_shortlist: Optional[float] = None  # seconds
+    time_to_shortlist_exact: bool = True  # False when the percentiles are sketch estimates
     
     # Overall engagement
     total_events: int = 0
@@ -48,23 +223,62 @@ class TimeSeriesMetric(BaseModel):
     label: str
 
 
+class RollupBucket:
+    """Aggregates for all events in one time bucket."""
+
+    __slots__ = ("counts", "users", "shortlist_times")
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.users = HyperLogLog()
+        self.shortlist_times = QuantileSketch()
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
 class MetricsService:
     """
     Service for aggregating and calculating metrics from event logs.
     
-    In MVP, this reads from a simple event store. In production,
-    this would integrate with a time-series database or analytics platform.
+    Aggregates live in memory; ``backend`` persists the raw events and
+    shares them between workers.
     """
     
-    def __init__(self, event_store: Optional[List[Dict[str, Any]]] = None):
+    def __init__(
+        self,
+        event_store: Optional[List[Dict[str, Any]]] = None,
+        backend: Optional[EventStore] = None,
+        max_events: Optional[int] = None,
+        retention: Optional[timedelta] = None,
+        minute_retention: Optional[timedelta] = None,
+    ):
         """
         Initialize metrics service.
         
         Args:
-            event_store: In-memory event store (for MVP). In production,
-                        this would be a database connection.
+            event_store: Events to start with
+            backend: Durable event store (default: in-memory only)
+            max_events: Recent raw events kept in ``event_store``
+            retention: How long rollups and persisted events are kept
+            minute_retention: How long minute rollups are kept
         """
-        self.event_store = event_store or []
+        self.event_store: deque = deque(
+            event_store or (),
+            maxlen=max_events or settings.METRICS_MEMORY_MAX_EVENTS,
+        )
+        self.backend = backend or MemoryEventStore()
+        self.retention = retention or timedelta(days=settings.METRICS_RETENTION_DAYS)
+        self.minute_retention = minute_retention or timedelta(hours=settings.METRICS_MINUTE_ROLLUP_HOURS)
+        # Epoch seconds (hour-aligned) before which minute buckets are dropped
+        self._minute_cutoff = 0
+        self._task: Optional[asyncio.Task] = None
+        self._rollups: Dict[int, Dict[int, RollupBucket]] = {
+            size: {} for size in ROLLUP_GRANULARITIES
+        }
+        for event in self.event_store:
+            self._rollup(event)
     
     def add_event(self, event_dict: Dict[str, Any]):
         """
@@ -74,6 +288,139 @@ class MetricsService:
             event_dict: Event data as dictionary
         """
         self.event_store.append(event_dict)
+        self.backend.append(event_dict)
+        self._rollup(event_dict)
+    
+    def _ingest(self, events: List[Dict[str, Any]]):
+        """Add events another worker already persisted."""
+        for event in events:
+            self.event_store.append(event)
+            self._rollup(event)
+    
+    async def load(self):
+        """Replay retained events from the backend, e.g. on startup."""
+        self._advance_minute_cutoff(datetime.utcnow())
+        self._ingest(await self.backend.replay(datetime.utcnow() - self.retention))
+    
+    async def sync(self):
+        """Flush our events and pick up the ones other workers recorded."""
+        await self.backend.flush()
+        self._ingest(await self.backend.read_new())
+    
+    async def prune(self, now: Optional[datetime] = None) -> int:
+        """Drop rollups and persisted events past retention; returns the rollup buckets dropped."""
+        now = now or datetime.utcnow()
+        cutoff = now - self.retention
+        cutoff_seconds = (cutoff - _EPOCH).total_seconds()
+        self._advance_minute_cutoff(now)
+        expired = 0
+        for size, buckets in self._rollups.items():
+            horizon = max(cutoff_seconds, self._minute_cutoff) if size == MINUTE else cutoff_seconds
+            for key in [key for key in buckets if key + size <= horizon]:
+                del buckets[key]
+                expired += 1
+        await self.backend.prune(cutoff)
+        return expired
+    
+    def _advance_minute_cutoff(self, now: datetime):
+        cutoff = int((now - self.minute_retention - _EPOCH).total_seconds())
+        self._minute_cutoff = max(self._minute_cutoff, cutoff - cutoff % HOUR)
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start(self, interval: Optional[float] = None):
+        """Start the background sync and retention task."""
+        if not self.running:
+            self._task = asyncio.create_task(
+                self._run(interval or settings.METRICS_SYNC_INTERVAL_SECONDS)
+            )
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.backend.close()
+    
+    async def _run(self, interval: float):
+        last_prune = datetime.min
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync()
+                if datetime.utcnow() - last_prune >= timedelta(hours=1):
+                    await self.prune()
+                    last_prune = datetime.utcnow()
+            except Exception:
+                logger.exception("Failed to sync metrics events")
+    
+    def _rollup(self, event: Dict[str, Any]):
+        """Fold one event into its minute, hour and day buckets."""
+        timestamp = self._parse_timestamp(event.get("timestamp", ""))
+        if timestamp == datetime.min:
+            return
+        seconds = int((timestamp - _EPOCH).total_seconds())
+        event_type = event.get("event_type")
+        if isinstance(event_type, EventType):
+            event_type = event_type.value
+        
+        actor_id = event.get("actor_id")
+        shortlist_time = (
+            event.get("time_since_application")
+            if event_type == EventType.INBOX_CANDIDATE_SHORTLISTED
+            else None
+        )
+        for size, buckets in self._rollups.items():
+            key = seconds - seconds % size
+            if size == MINUTE and key < self._minute_cutoff:
+                continue  # Replayed event older than the minute rollups
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = RollupBucket()
+            bucket.counts[event_type] += 1
+            if actor_id:
+                bucket.users.add(str(actor_id))
+            if shortlist_time:
+                bucket.shortlist_times.add(shortlist_time)
+    
+    def _boundary(self, value: datetime, end: bool = False) -> int:
+        """
+        Epoch seconds of the minute boundary at the start of the minute
+        containing ``value`` (or, with ``end``, after it). Boundaries older
+        than the minute rollups move out to the enclosing hour.
+        """
+        seconds = int((value - _EPOCH).total_seconds())
+        seconds -= seconds % MINUTE
+        if end:
+            seconds += MINUTE
+        if seconds < self._minute_cutoff and seconds % HOUR:
+            seconds -= seconds % HOUR
+            if end:
+                seconds += HOUR
+        return seconds
+    
+    def _iter_buckets(self, start: datetime, end: datetime) -> Iterator[RollupBucket]:
+        """
+        Yield the coarsest rollup buckets that exactly tile the minutes
+        from ``start`` through ``end``.
+        """
+        return self._tile(self._boundary(start), self._boundary(end, end=True))
+    
+    def _tile(self, current: int, stop: int) -> Iterator[RollupBucket]:
+        """Yield the coarsest rollup buckets that exactly tile the minute-aligned ``[current, stop)``."""
+        while current < stop:
+            for size in reversed(ROLLUP_GRANULARITIES):
+                if current % size == 0 and current + size <= stop:
+                    break
+            bucket = self._rollups[size].get(current)
+            if bucket is not None:
+                yield bucket
+            current += size
     
     def get_kpis(
         self,
@@ -90,69 +437,55 @@ class MetricsService:
         Returns:
             KPIMetrics object with calculated metrics
         """
-        if end_date is None:
-            end_date = datetime.utcnow()
-        if start_date is None:
-            start_date = end_date - timedelta(days=30)
+        start_date, end_date = self._resolve_period(start_date, end_date)
         
-        # Filter events by time period
-        period_events = [
-            e for e in self.event_store
-            if self._parse_timestamp(e.get("timestamp", "")) >= start_date
-            and self._parse_timestamp(e.get("timestamp", "")) <= end_date
-        ]
+        # Merge the rollup buckets covering the period
+        counts: Counter = Counter()
+        unique_users = HyperLogLog()
+        shortlist_times = QuantileSketch()
+        for bucket in self._iter_buckets(start_date, end_date):
+            counts.update(bucket.counts)
+            unique_users.merge(bucket.users)
+            shortlist_times.merge(bucket.shortlist_times)
         
-        # Initialize metrics
+        # Exact while the window holds few shortlists, KLL estimates beyond
+        return self._build_kpis(
+            start_date,
+            end_date,
+            counts,
+            unique_users.count(),
+            shortlist_times.quantiles(SHORTLIST_QUANTILES),
+            shortlist_times.exact,
+        )
+    
+    @staticmethod
+    def _build_kpis(
+        start_date: datetime,
+        end_date: datetime,
+        counts: Dict[str, int],
+        unique_users: int,
+        shortlist_quantiles: List[Optional[float]],
+        shortlist_exact: bool = True,
+    ) -> KPIMetrics:
+        """Derive KPIs from per-event-type counts and ``SHORTLIST_QUANTILES``."""
+        median, p90, p99 = shortlist_quantiles
         metrics = KPIMetrics(
             period_start=start_date,
             period_end=end_date,
+            recommendation_views=counts.get(EventType.RECOMMENDATION_VIEW.value, 0),
+            recommendation_clicks=counts.get(EventType.RECOMMENDATION_CLICK.value, 0),
+            applications_submitted=counts.get(EventType.APPLICATION_SUBMITTED.value, 0),
+            candidates_viewed=counts.get(EventType.INBOX_CANDIDATE_VIEWED.value, 0),
+            candidates_shortlisted=counts.get(EventType.INBOX_CANDIDATE_SHORTLISTED.value, 0),
+            candidates_rejected=counts.get(EventType.INBOX_CANDIDATE_REJECTED.value, 0),
+            total_events=sum(counts.values()),
+            unique_users=unique_users,
+            median_time_to_shortlist=median,
+            p90_time_to_shortlist=p90,
+            p99_time_to_shortlist=p99,
+            time_to_shortlist_exact=shortlist_exact,
         )
         
-        # Track unique users
-        unique_users = set()
-        
-        # Track time to shortlist
-        application_times = {}  # application_id -> submitted_time
-        shortlist_times = []
-        
-        # Process events
-        for event in period_events:
-            event_type = event.get("event_type")
-            
-            # Track unique users
-            if event.get("actor_id"):
-                unique_users.add(event.get("actor_id"))
-            
-            # Recommendation metrics
-            if event_type == EventType.RECOMMENDATION_VIEW:
-                metrics.recommendation_views += 1
-            elif event_type == EventType.RECOMMENDATION_CLICK:
-                metrics.recommendation_clicks += 1
-            
-            # Application metrics
-            elif event_type == EventType.APPLICATION_SUBMITTED:
-                metrics.applications_submitted += 1
-                application_id = event.get("application_id")
-                if application_id:
-                    application_times[application_id] = self._parse_timestamp(
-                        event.get("timestamp", "")
-                    )
-            
-            # Inbox metrics
-            elif event_type == EventType.INBOX_CANDIDATE_VIEWED:
-                metrics.candidates_viewed += 1
-            elif event_type == EventType.INBOX_CANDIDATE_SHORTLISTED:
-                metrics.candidates_shortlisted += 1
-                # Calculate time to shortlist if available
-                if event.get("time_since_application"):
-                    shortlist_times.append(event.get("time_since_application"))
-            elif event_type == EventType.INBOX_CANDIDATE_REJECTED:
-                metrics.candidates_rejected += 1
-        
-        # Calculate derived metrics
-        metrics.total_events = len(period_events)
-        metrics.unique_users = len(unique_users)
-        
         # CTR = clicks / views
         if metrics.recommendation_views > 0:
             metrics.ctr = metrics.recommendation_clicks / metrics.recommendation_views
@@ -163,144 +496,192 @@ class MetricsService:
                 metrics.applications_submitted / metrics.recommendation_clicks
             )
         
-        # Median time to shortlist
-        if shortlist_times:
-            shortlist_times.sort()
-            mid = len(shortlist_times) // 2
-            if len(shortlist_times) % 2 == 0:
-                metrics.median_time_to_shortlist = (
-                    shortlist_times[mid - 1] + shortlist_times[mid]
-                ) / 2
-            else:
-                metrics.median_time_to_shortlist = shortlist_times[mid]
-        
         return metrics
     
-    def get_ctr_time_series(
+    def get_time_series(
         self,
+        metric: str,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         bucket_size: timedelta = timedelta(days=1),
     ) -> List[TimeSeriesMetric]:
         """
-        Get CTR over time as a time series.
+        Get a metric from ``TIME_SERIES_METRICS`` as a time series.
         
         Args:
-            start_date: Start of period
-            end_date: End of period
+            metric: Series name, e.g. "ctr" or "conversion"
+            start_date: Start of period (default: 30 days before end)
+            end_date: End of period (default: now)
             bucket_size: Time bucket size for aggregation
             
         Returns:
-            List of time series data points
+            One data point per bucket, starting at ``start_date``
+            
+        Raises:
+            ValueError: If the metric is unknown
         """
-        if end_date is None:
-            end_date = datetime.utcnow()
-        if start_date is None:
-            start_date = end_date - timedelta(days=30)
+        definition = self._series_definition(metric)
+        start_date, end_date = self._resolve_period(start_date, end_date)
+        bucket_count = self._bucket_count(start_date, end_date, bucket_size)
         
-        # Create time buckets
-        buckets = []
-        current = start_date
-        while current < end_date:
-            next_bucket = current + bucket_size
-            buckets.append((current, next_bucket))
-            current = next_bucket
+        # Each series bucket takes the minutes that start inside it; the
+        # last one runs through the minute containing end_date, as in get_kpis
+        boundaries = [self._boundary(start_date + index * bucket_size) for index in range(bucket_count)]
+        boundaries.append(self._boundary(end_date, end=True))
+        numerators = [0] * bucket_count
+        denominators = [0] * bucket_count
+        for index in range(bucket_count):
+            for bucket in self._tile(boundaries[index], boundaries[index + 1]):
+                numerators[index] += bucket.counts.get(definition.numerator, 0)
+                if definition.denominator is not None:
+                    denominators[index] += bucket.counts.get(definition.denominator, 0)
         
-        # Calculate CTR for each bucket
+        return self._build_series(definition, start_date, bucket_size, numerators, denominators)
+    
+    @staticmethod
+    def _series_definition(metric: str) -> SeriesDefinition:
+        definition = TIME_SERIES_METRICS.get(metric)
+        if definition is None:
+            raise ValueError(f"Unknown metric: {metric}")
+        return definition
+    
+    @staticmethod
+    def _bucket_count(start_date: datetime, end_date: datetime, bucket_size: timedelta) -> int:
+        """Buckets of ``bucket_size`` from ``start_date`` until one reaches ``end_date``."""
+        step = bucket_size.total_seconds()
+        if step <= 0:
+            raise ValueError("bucket_size must be positive")
+        window = (end_date - start_date).total_seconds()
+        return max(0, -int(-window // step))
+    
+    @staticmethod
+    def _build_series(
+        definition: SeriesDefinition,
+        start_date: datetime,
+        bucket_size: timedelta,
+        numerators: List[int],
+        denominators: List[int],
+    ) -> List[TimeSeriesMetric]:
         time_series = []
-        for bucket_start, bucket_end in buckets:
-            bucket_events = [
-                e for e in self.event_store
-                if bucket_start <= self._parse_timestamp(e.get("timestamp", "")) < bucket_end
-            ]
-            
-            views = sum(
-                1 for e in bucket_events
-                if e.get("event_type") == EventType.RECOMMENDATION_VIEW
-            )
-            clicks = sum(
-                1 for e in bucket_events
-                if e.get("event_type") == EventType.RECOMMENDATION_CLICK
-            )
-            
-            ctr = clicks / views if views > 0 else 0.0
-            
+        for bucket, numerator in enumerate(numerators):
+            if definition.denominator is None:
+                value = float(numerator)
+            else:
+                denominator = denominators[bucket]
+                value = numerator / denominator if denominator > 0 else 0.0
             time_series.append(TimeSeriesMetric(
-                timestamp=bucket_start,
-                value=ctr,
-                label="CTR",
+                timestamp=start_date + bucket * bucket_size,
+                value=value,
+                label=definition.label,
             ))
-        
         return time_series
     
+    def get_ctr_time_series(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        bucket_size: timedelta = timedelta(days=1),
+    ) -> List[TimeSeriesMetric]:
+        """Get CTR over time as a time series."""
+        return self.get_time_series("ctr", start_date, end_date, bucket_size)
+    
     def get_conversion_time_series(
         self,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         bucket_size: timedelta = timedelta(days=1),
     ) -> List[TimeSeriesMetric]:
+        """Get application conversion rate over time."""
+        return self.get_time_series("conversion", start_date, end_date, bucket_size)
+    
+    async def query_kpis(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> KPIMetrics:
         """
-        Get application conversion rate over time.
-        
-        Args:
-            start_date: Start of period
-            end_date: End of period
-            bucket_size: Time bucket size for aggregation
-            
-        Returns:
-            List of time series data points
+        KPIs for the API: aggregated by the backend when it can (so they
+        cover every worker's events), otherwise from the local rollups.
         """
+        if not self.backend.aggregates:
+            return self.get_kpis(start_date, end_date)
+        
+        start_date, end_date = self._resolve_period(start_date, end_date)
+        percentile_operator = await self.backend.supports_percentile()
+        rows = await self.backend.aggregate(kpi_pipeline(start_date, end_date, percentile_operator))
+        result = rows[0] if rows else {}
+        counts = {row["_id"]: row["count"] for row in result.get("counts", [])}
+        users = result.get("users") or [{}]
+        shortlist = (result.get("shortlist") or [{}])[0]
+        shortlist_count = shortlist.get("count", 0)
+        if "ranked" in shortlist:
+            values = {row["rank"]: row["value"] for row in shortlist["ranked"]}
+            percentiles = [values.get(shortlist_rank(q, shortlist_count)) for q in SHORTLIST_QUANTILES]
+        else:
+            percentiles = shortlist.get("percentiles") or [None] * len(SHORTLIST_QUANTILES)
+        return self._build_kpis(
+            start_date,
+            end_date,
+            counts,
+            users[0].get("unique_users", 0),
+            percentiles,
+            # $percentile's approximate method is only exact for a single value
+            shortlist_exact=not percentile_operator or shortlist_count <= 1,
+        )
+    
+    async def query_time_series(
+        self,
+        metric: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        bucket_size: timedelta = timedelta(days=1),
+    ) -> List[TimeSeriesMetric]:
+        """Time series for the API; see ``query_kpis``."""
+        if not self.backend.aggregates:
+            return self.get_time_series(metric, start_date, end_date, bucket_size)
+        
+        definition = self._series_definition(metric)
+        start_date, end_date = self._resolve_period(start_date, end_date)
+        bucket_count = self._bucket_count(start_date, end_date, bucket_size)
+        rows = await self.backend.aggregate(
+            time_series_pipeline(definition, start_date, bucket_size, bucket_count)
+        )
+        numerators = [0] * bucket_count
+        denominators = [0] * bucket_count
+        for row in rows:
+            numerators[int(row["_id"])] = row["numerator"]
+            denominators[int(row["_id"])] = row["denominator"]
+        return self._build_series(definition, start_date, bucket_size, numerators, denominators)
+    
+    def _resolve_period(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> Tuple[datetime, datetime]:
+        """Apply the default 30-day window and normalize to naive UTC."""
         if end_date is None:
             end_date = datetime.utcnow()
         if start_date is None:
             start_date = end_date - timedelta(days=30)
-        
-        # Create time buckets
-        buckets = []
-        current = start_date
-        while current < end_date:
-            next_bucket = current + bucket_size
-            buckets.append((current, next_bucket))
-            current = next_bucket
-        
-        # Calculate conversion for each bucket
-        time_series = []
-        for bucket_start, bucket_end in buckets:
-            bucket_events = [
-                e for e in self.event_store
-                if bucket_start <= self._parse_timestamp(e.get("timestamp", "")) < bucket_end
-            ]
-            
-            clicks = sum(
-                1 for e in bucket_events
-                if e.get("event_type") == EventType.RECOMMENDATION_CLICK
-            )
-            applications = sum(
-                1 for e in bucket_events
-                if e.get("event_type") == EventType.APPLICATION_SUBMITTED
-            )
-            
-            conversion = applications / clicks if clicks > 0 else 0.0
-            
-            time_series.append(TimeSeriesMetric(
-                timestamp=bucket_start,
-                value=conversion,
-                label="Conversion Rate",
-            ))
-        
-        return time_series
+        return self._as_naive_utc(start_date), self._as_naive_utc(end_date)
     
     def _parse_timestamp(self, timestamp_str: str) -> datetime:
         """Parse ISO timestamp string to datetime."""
-        try:
-            return datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-        except (ValueError, AttributeError):
-            return datetime.min
+        return parse_event_timestamp(timestamp_str) or datetime.min
+    
+    @staticmethod
+    def _as_naive_utc(value: datetime) -> datetime:
+        """Normalize aware datetimes to naive UTC, as used by the rollups."""
+        if value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
     
     def clear_events(self):
         """Clear all events from the store (for testing)."""
         self.event_store.clear()
+        for buckets in self._rollups.values():
+            buckets.clear()
 
 
 # Global metrics service instance
-metrics_service = MetricsService()
+metrics_service = MetricsService(backend=create_event_store())
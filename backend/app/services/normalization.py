@@ -1,16 +1,17 @@
 import re
-from typing import Iterable, List
+from typing import TYPE_CHECKING, Iterable, List, NamedTuple, Optional
 
-_SKILL_ALIASES = {
-    "js": "javascript",
-    "py": "python",
-    "node.js": "nodejs",
-    "node": "nodejs",
-    "c sharp": "c#",
-    "c++": "c++",
-    "nlp": "nlp",
-    "ml": "machine learning",
-}
+from app.services.taxonomy import get_skill_taxonomy
+
+if TYPE_CHECKING:
+    from app.services.analyzer import Analyzer
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class AnalyzedText(NamedTuple):
+    text: str  # Whitespace-normalized text, as normalize_text_chunks returns
+    tokens: List[str]  # Tokens of ``text``, as tokenize returns
 
 
 def _dedupe_preserve_order(items: Iterable[str]) -> List[str]:
@@ -24,11 +25,7 @@ def _dedupe_preserve_order(items: Iterable[str]) -> List[str]:
 
 
 def normalize_skill(skill: str) -> str:
-    cleaned = skill.strip().lower()
-    if not cleaned:
-        return ""
-    cleaned = cleaned.replace("_", " ")
-    return _SKILL_ALIASES.get(cleaned, cleaned)
+    return get_skill_taxonomy().normalize(skill)
 
 
 def normalize_skills(skills: Iterable[str]) -> List[str]:
@@ -38,14 +35,26 @@ def normalize_skills(skills: Iterable[str]) -> List[str]:
 
 
 def normalize_title(title: str) -> str:
-    return re.sub(r"\s+", " ", title.strip().lower())
+    return " ".join(title.lower().split())
 
 
 def normalize_text_chunks(*chunks: str) -> str:
-    joined = " ".join(chunk.strip() for chunk in chunks if chunk and chunk.strip())
-    return re.sub(r"\s+", " ", joined).strip()
+    # str.split() collapses the same whitespace as \s+ without a regex pass
+    return " ".join(" ".join(chunk for chunk in chunks if chunk).split())
 
 
 def tokenize(text: str) -> List[str]:
-    return re.findall(r"[a-z0-9]+", text.lower())
+    return _TOKEN_RE.findall(text.lower())
+
+
+def analyze_text(*chunks: str, analyzer: Optional["Analyzer"] = None) -> AnalyzedText:
+    """
+    Normalize text chunks and tokenize the result in a single pass.
+
+    Tokens are passed through ``analyzer`` (stopwords, stemming, skill
+    bigrams) when one is given.
+    """
+    text = normalize_text_chunks(*chunks)
+    tokens = _TOKEN_RE.findall(text.lower())
+    return AnalyzedText(text, analyzer.analyze(tokens) if analyzer is not None else tokens)
 
@@ -0,0 +1,70 @@
+"""
+Parse result cache keyed by resume content hash.
+
+Seekers often upload the same file again. Caching the ``ParsedResume`` by
+SHA-256 of the file lets those uploads skip text extraction entirely.
+Keys include ``PARSER_VERSION`` so results from an older parser are not
+served after the parsing rules change.
+"""
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.services.parsing import PARSER_VERSION, ParsedResume
+
+
+class ParseCache:
+    """Thread-safe LRU cache of parsed resumes."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, ParsedResume]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(content_hash: str) -> str:
+        return f"{PARSER_VERSION}:{content_hash}"
+
+    def get(self, content_hash: Optional[str]) -> Optional[ParsedResume]:
+        if not content_hash:
+            return None
+        key = self._key(content_hash)
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return parsed
+
+    def put(self, content_hash: str, parsed: ParsedResume) -> None:
+        key = self._key(content_hash)
+        with self._lock:
+            self._entries[key] = parsed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+parse_cache = ParseCache()
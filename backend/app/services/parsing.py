@@ -1,10 +1,15 @@
-from dataclasses import dataclass
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Set
+from typing import List, Optional
 import re
 
 from docx import Document as DocxDocument
-from pypdf import PdfReader
+
+from app.services.keyword_matcher import KeywordMatcher
+from app.services.pdf_extraction import PdfExtraction, extract_pdf_text
+from app.services.taxonomy import get_skill_taxonomy
 
 
 class ResumeParsingError(Exception):
@@ -12,40 +17,21 @@ class ResumeParsingError(Exception):
 
 
 SUPPORTED_EXTENSIONS = {".pdf", ".docx"}
-SKILL_KEYWORDS: Set[str] = {
-    "python",
-    "java",
-    "sql",
-    "mongodb",
-    "fastapi",
-    "react",
-    "aws",
-    "docker",
-    "kubernetes",
-    "c++",
-    "c#",
-    "javascript",
-    "typescript",
-    "node",
-    "git",
-    "ci/cd",
-    "ml",
-    "machine learning",
-    "nlp",
-}
-TITLE_KEYWORDS = [
-    "engineer",
-    "developer",
-    "manager",
-    "scientist",
-    "analyst",
-    "consultant",
-    "architect",
-    "specialist",
-    "lead",
-    "intern",
-    "designer",
-]
+# Bump when parsing rules change so cached parse results are not reused
+PARSER_VERSION = 5
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+TITLES_PATH = DATA_DIR / "job_titles.txt"
+
+
+@lru_cache(maxsize=1)
+def get_title_matcher() -> KeywordMatcher:
+    return KeywordMatcher.from_file(TITLES_PATH)
+
+
+def load_matchers() -> None:
+    """Build the keyword matchers ahead of the first parse."""
+    get_skill_taxonomy().matcher
+    get_title_matcher()
 
 
 @dataclass
@@ -53,16 +39,9 @@ class ParsedResume:
     raw_text: str
     skills: List[str]
     titles: List[str]
-
-
-def _extract_text_from_pdf(path: Path) -> str:
-    reader = PdfReader(str(path))
-    chunks: List[str] = []
-    for page in reader.pages:
-        text = page.extract_text() or ""
-        if text:
-            chunks.append(text)
-    return "\n".join(chunks).strip()
+    page_count: Optional[int] = None  # PDF resumes only
+    page_timings: List[float] = field(default_factory=list)  # ms per extracted PDF page
+    truncated: bool = False  # Text extraction stopped at the page or character cap
 
 
 def _extract_text_from_docx(path: Path) -> str:
@@ -83,10 +62,7 @@ def _normalise_text(text: str) -> str:
 
 
 def _parse_skills(raw_text: str) -> List[str]:
-    text_lower = raw_text.lower()
-    found = {skill for skill in SKILL_KEYWORDS if skill in text_lower}
-    ordered = sorted(found)
-    return ordered
+    return get_skill_taxonomy().extract(raw_text)
 
 
 def _clean_title(line: str) -> str:
@@ -95,28 +71,40 @@ def _clean_title(line: str) -> str:
 
 
 def _parse_titles(raw_text: str) -> List[str]:
+    matcher = get_title_matcher()
     candidates = set()
     for line in raw_text.splitlines():
-        lower_line = line.lower()
-        if any(keyword in lower_line for keyword in TITLE_KEYWORDS):
+        if matcher.contains_any(line):
             cleaned = _clean_title(line)
             if cleaned:
                 candidates.add(cleaned)
     return sorted(candidates)
 
 
-def parse_resume(path: Path) -> ParsedResume:
+def parse_resume(path: Path, executor: Optional[Executor] = None) -> ParsedResume:
+    """
+    Extract text, skills and titles from a resume.
+
+    ``executor`` is a process pool to extract PDF pages in; see
+    ``extract_pdf_text``.
+    """
     suffix = path.suffix.lower()
     if suffix not in SUPPORTED_EXTENSIONS:
         raise ResumeParsingError(f"Unsupported resume format: {suffix or 'unknown'}")
 
     if suffix == ".pdf":
-        raw_text = _extract_text_from_pdf(path)
-    elif suffix == ".docx":
-        raw_text = _extract_text_from_docx(path)
-    else:
-        raw_text = _extract_text_from_plain(path)
-
+        extraction = extract_pdf_text(path, executor=executor)
+        return parse_resume_text(extraction.text, extraction)
+    if suffix == ".docx":
+        return parse_resume_text(_extract_text_from_docx(path))
+    return parse_resume_text(_extract_text_from_plain(path))
+
+
+def parse_resume_text(raw_text: str, extraction: Optional[PdfExtraction] = None) -> ParsedResume:
+    """
+    Skills and titles from extracted resume text; the CPU-bound half of
+    ``parse_resume``, which the parse queue runs in its process pool.
+    """
     raw_text_original = raw_text.strip()
     normalised_text = _normalise_text(raw_text_original)
     if not normalised_text:
@@ -124,4 +112,13 @@ def parse_resume(path: Path) -> ParsedResume:
 
     skills = _parse_skills(normalised_text)
     titles = _parse_titles(raw_text_original)
-    return ParsedResume(raw_text=normalised_text, skills=skills, titles=titles)
+    if extraction is None:
+        return ParsedResume(raw_text=normalised_text, skills=skills, titles=titles)
+    return ParsedResume(
+        raw_text=normalised_text,
+        skills=skills,
+        titles=titles,
+        page_count=extraction.page_count,
+        page_timings=extraction.page_timings,
+        truncated=extraction.truncated,
+    )
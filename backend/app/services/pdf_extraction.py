@@ -0,0 +1,129 @@
+"""
+PDF text extraction with page caps and page-parallel workers.
+
+Skills and titles are front-loaded in resumes, so extraction stops after
+``RESUME_PDF_MAX_PAGES`` pages or once ``RESUME_PDF_MAX_CHARS`` characters
+have been read; long portfolios no longer dominate parse time.
+
+Given a process pool (the resume parse queue passes its own), pages are
+extracted there instead of in the calling process: PDFs with at least
+``RESUME_PDF_PARALLEL_MIN_PAGES`` pages to read are split into page ranges
+extracted in parallel (pypdf is pure Python, so threads would not help).
+Ranges are consumed in page order with a bounded number in flight, so
+hitting the character cap stops the remaining ranges from being started.
+"""
+import time
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from pypdf import PdfReader
+
+from app.core.config import settings
+
+# (page text, extraction time in milliseconds)
+PageText = Tuple[str, float]
+
+
+@dataclass
+class PdfExtraction:
+    text: str
+    page_count: int  # Pages in the document
+    page_timings: List[float] = field(default_factory=list)  # ms per extracted page
+    truncated: bool = False  # Stopped at the page or character cap
+
+    @property
+    def pages_extracted(self) -> int:
+        return len(self.page_timings)
+
+
+def _extract_page(reader: PdfReader, index: int) -> PageText:
+    start = time.perf_counter()
+    text = reader.pages[index].extract_text() or ""
+    return text, (time.perf_counter() - start) * 1000
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> List[PageText]:
+    """Extract pages ``[start, stop)``; runs in a page pool worker."""
+    reader = PdfReader(path)
+    return [_extract_page(reader, index) for index in range(start, stop)]
+
+
+def _extract_sequential(reader: PdfReader, page_limit: int, max_chars: int) -> Tuple[List[PageText], bool]:
+    pages: List[PageText] = []
+    chars = 0
+    for index in range(page_limit):
+        page = _extract_page(reader, index)
+        pages.append(page)
+        chars += len(page[0])
+        if max_chars and chars >= max_chars:
+            return pages, index + 1 < page_limit
+    return pages, False
+
+
+def _extract_parallel(
+    path: Path,
+    page_limit: int,
+    max_chars: int,
+    executor: Executor,
+    chunk_pages: int,
+    max_in_flight: int,
+) -> Tuple[List[PageText], bool]:
+    ranges = deque((start, min(start + chunk_pages, page_limit)) for start in range(0, page_limit, chunk_pages))
+    in_flight = deque()
+    pages: List[PageText] = []
+    chars = 0
+    try:
+        while ranges or in_flight:
+            while ranges and len(in_flight) < max_in_flight:
+                start, stop = ranges.popleft()
+                in_flight.append(executor.submit(_extract_page_range, str(path), start, stop))
+            for page in in_flight.popleft().result():
+                pages.append(page)
+                chars += len(page[0])
+                if max_chars and chars >= max_chars:
+                    return pages, len(pages) < page_limit
+        return pages, False
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def extract_pdf_text(
+    path: Path,
+    max_pages: int = settings.RESUME_PDF_MAX_PAGES,
+    max_chars: int = settings.RESUME_PDF_MAX_CHARS,
+    parallel_min_pages: int = settings.RESUME_PDF_PARALLEL_MIN_PAGES,
+    executor: Optional[Executor] = None,
+    chunk_pages: int = 4,
+    max_in_flight: int = settings.RESUME_PARSE_WORKERS,
+) -> PdfExtraction:
+    """
+    Extract text from up to ``max_pages`` pages, stopping early at ``max_chars``.
+
+    A cap of 0 disables it. Without an ``executor`` pages are read in this
+    process; with one, at most ``max_in_flight`` page ranges are submitted
+    ahead of the reader.
+    """
+    reader = PdfReader(str(path))
+    page_count = len(reader.pages)
+    page_limit = min(page_count, max_pages) if max_pages else page_count
+
+    if executor is not None:
+        # Short documents go to the pool as a single range
+        chunk_pages = chunk_pages if page_limit >= parallel_min_pages else max(page_limit, 1)
+        pages, stopped_early = _extract_parallel(
+            path, page_limit, max_chars, executor, chunk_pages, max(1, max_in_flight)
+        )
+    else:
+        pages, stopped_early = _extract_sequential(reader, page_limit, max_chars)
+
+    text = "\n".join(page_text for page_text, _ in pages if page_text).strip()
+    return PdfExtraction(
+        text=text,
+        page_count=page_count,
+        page_timings=[round(elapsed, 2) for _, elapsed in pages],
+        truncated=stopped_early or page_limit < page_count,
+    )
@@ -0,0 +1,360 @@
+"""
+In-memory profile index for employer-side candidate matching.
+
+Seeker profiles are indexed when a resume is uploaded: their tokens go into
+an inverted index and their embeddings into a preallocated float32 matrix.
+A job query scores BM25 only over the posting lists of its own terms, keeps
+the best ``candidate_limit`` profiles and reranks those with a single
+matrix-vector product, so query cost follows the matching postings rather
+than the number of indexed profiles.
+
+Replacing or removing a profile tombstones its row. Once tombstones make up
+``compact_ratio`` of the rows (and at least ``compact_min_rows``) the index
+compacts itself, so a long-running process that keeps re-indexing
+profiles does not accumulate dead postings until the next full ``rebuild``.
+"""
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.scoring import BM25_B, BM25_K1, bm25_idf, normalize_weights
+
+DEFAULT_CANDIDATE_LIMIT = 2000
+
+
+@dataclass
+class ProfileMatch:
+    profile_id: str
+    score: float
+    bm25_score: float
+    vector_score: float
+    matched_terms: List[str] = field(default_factory=list)
+
+
+class _Postings:
+    """Document rows and term frequencies for one term."""
+
+    __slots__ = ("rows", "freqs", "_arrays")
+
+    def __init__(self):
+        self.rows: List[int] = []
+        self.freqs: List[int] = []
+        self._arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def append(self, row: int, freq: int) -> None:
+        self.rows.append(row)
+        self.freqs.append(freq)
+        self._arrays = None
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._arrays is None:
+            self._arrays = (
+                np.asarray(self.rows, dtype=np.int64),
+                np.asarray(self.freqs, dtype=np.float32),
+            )
+        return self._arrays
+
+
+@dataclass
+class _Snapshot:
+    """Index state read by one search."""
+
+    ids: List[str]
+    alive: np.ndarray
+    lengths: np.ndarray
+    embeddings: Optional[np.ndarray]
+    dimensions: Optional[int]
+    postings: Dict[str, Tuple[np.ndarray, np.ndarray]]
+    total_length: float
+    alive_count: int
+
+
+class ProfileIndex:
+    """Inverted index plus embedding matrix over seeker profiles."""
+
+    def __init__(
+        self,
+        dimensions: Optional[int] = None,
+        initial_capacity: int = 1024,
+        compact_ratio: float = 0.25,
+        compact_min_rows: int = 256,
+    ):
+        self._lock = threading.Lock()
+        self.compact_ratio = compact_ratio
+        self.compact_min_rows = compact_min_rows
+        # Adds and removals made while a rebuild is loading profiles, replayed onto the rebuilt index
+        self._changes: Optional[List[Tuple[str, Optional[Sequence[str]], Optional[Sequence[float]]]]] = None
+        self._dimensions = dimensions
+        self._capacity = initial_capacity
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._postings: Dict[str, _Postings] = {}
+        self._lengths = np.zeros(initial_capacity, dtype=np.float32)
+        self._alive = np.zeros(initial_capacity, dtype=bool)
+        self._embeddings: Optional[np.ndarray] = None
+        self._total_length = 0.0
+        self._alive_count = 0
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return self._alive_count
+
+    def __contains__(self, profile_id: str) -> bool:
+        return profile_id in self._rows
+
+    @property
+    def tombstones(self) -> int:
+        return len(self._ids) - self._alive_count
+
+    def _grow(self, size: int) -> None:
+        capacity = self._capacity
+        while capacity < size:
+            capacity *= 2
+        if capacity == self._capacity:
+            return
+        self._lengths = np.concatenate([self._lengths, np.zeros(capacity - self._capacity, dtype=np.float32)])
+        self._alive = np.concatenate([self._alive, np.zeros(capacity - self._capacity, dtype=bool)])
+        if self._embeddings is not None:
+            embeddings = np.zeros((capacity, self._embeddings.shape[1]), dtype=np.float32)
+            embeddings[: self._capacity] = self._embeddings
+            self._embeddings = embeddings
+        self._capacity = capacity
+
+    def add(self, profile_id: str, tokens: Sequence[str], embedding: Optional[Sequence[float]] = None) -> None:
+        """
+        Index a profile, replacing any earlier version of it.
+
+        Replaced rows are tombstoned rather than removed from posting lists
+        and compacted away once there are enough of them.
+        """
+        with self._lock:
+            if self._changes is not None:
+                self._changes.append((profile_id, tokens, embedding))
+            self._remove_locked(profile_id)
+            row = len(self._ids)
+            self._grow(row + 1)
+            self._ids.append(profile_id)
+            self._rows[profile_id] = row
+
+            for term, freq in Counter(tokens).items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = _Postings()
+                postings.append(row, freq)
+            self._lengths[row] = len(tokens)
+            self._total_length += len(tokens)
+            self._alive[row] = True
+            self._alive_count += 1
+
+            if embedding is not None and len(embedding):
+                vector = np.asarray(embedding, dtype=np.float32)
+                if self._embeddings is None:
+                    self._dimensions = self._dimensions or len(vector)
+                    self._embeddings = np.zeros((self._capacity, self._dimensions), dtype=np.float32)
+                if len(vector) == self._dimensions:
+                    norm = np.linalg.norm(vector)
+                    if norm:
+                        self._embeddings[row] = vector / norm
+
+            if self.tombstones >= max(self.compact_min_rows, self.compact_ratio * len(self._ids)):
+                self._compact_locked()
+
+    def remove(self, profile_id: str) -> bool:
+        with self._lock:
+            if self._changes is not None:
+                self._changes.append((profile_id, None, None))
+            return self._remove_locked(profile_id)
+
+    def compact(self) -> None:
+        """Drop tombstoned rows and renumber the live ones."""
+        with self._lock:
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        size = len(self._ids)
+        live = np.flatnonzero(self._alive[:size])
+        renumbered = np.full(size, -1, dtype=np.int64)
+        renumbered[live] = np.arange(len(live))
+
+        postings: Dict[str, _Postings] = {}
+        for term, old in self._postings.items():
+            rows = np.asarray(old.rows, dtype=np.int64)
+            keep = self._alive[rows]
+            if keep.any():
+                fresh = postings[term] = _Postings()
+                fresh.rows = renumbered[rows[keep]].tolist()
+                fresh.freqs = np.asarray(old.freqs)[keep].tolist()
+        self._postings = postings
+
+        count = len(live)
+        self._ids = [self._ids[row] for row in live]
+        self._rows = {profile_id: row for row, profile_id in enumerate(self._ids)}
+        # New arrays rather than renumbering in place: searches may still be
+        # scoring a snapshot of the old ones
+        lengths = np.zeros(self._capacity, dtype=np.float32)
+        lengths[:count] = self._lengths[live]
+        self._lengths = lengths
+        alive = np.zeros(self._capacity, dtype=bool)
+        alive[:count] = True
+        self._alive = alive
+        if self._embeddings is not None:
+            embeddings = np.zeros_like(self._embeddings)
+            embeddings[:count] = self._embeddings[live]
+            self._embeddings = embeddings
+
+    def _remove_locked(self, profile_id: str) -> bool:
+        row = self._rows.pop(profile_id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._total_length -= float(self._lengths[row])
+        self._alive_count -= 1
+        return True
+
+    def _snapshot(self, query_tokens: Sequence[str]) -> _Snapshot:
+        """
+        Capture what a search reads while holding the lock.
+
+        Rows below ``size`` are only rewritten by compaction and rebuilds,
+        which both swap in new arrays, so the snapshot can be scored
+        without the lock. ``alive`` is copied because removals clear rows
+        in place.
+        """
+        with self._lock:
+            size = len(self._ids)
+            postings = {}
+            for term in set(query_tokens):
+                term_postings = self._postings.get(term)
+                if term_postings is not None:
+                    postings[term] = term_postings.arrays()
+            return _Snapshot(
+                ids=self._ids,
+                alive=self._alive[:size].copy(),
+                lengths=self._lengths,
+                embeddings=None if self._embeddings is None else self._embeddings[:size],
+                dimensions=self._dimensions,
+                postings=postings,
+                total_length=self._total_length,
+                alive_count=self._alive_count,
+            )
+
+    @staticmethod
+    def _bm25(snapshot: _Snapshot, query_tokens: Sequence[str]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        scores = np.zeros(len(snapshot.alive), dtype=np.float32)
+        term_rows: Dict[str, np.ndarray] = {}
+        if not snapshot.alive_count:
+            return scores, term_rows
+
+        avg_len = snapshot.total_length / snapshot.alive_count or 1.0
+        for term, query_count in Counter(query_tokens).items():
+            if term not in snapshot.postings:
+                continue
+            rows, freqs = snapshot.postings[term]
+            live = snapshot.alive[rows]
+            rows, freqs = rows[live], freqs[live]
+            if not len(rows):
+                continue
+            idf = bm25_idf(snapshot.alive_count, len(rows))
+            denom = freqs + BM25_K1 * (1 - BM25_B + BM25_B * snapshot.lengths[rows] / avg_len)
+            # Repeated query terms count once per occurrence, as in rank_jobs
+            scores[rows] += query_count * idf * (freqs * (BM25_K1 + 1)) / denom
+            term_rows[term] = rows
+        return scores, term_rows
+
+    def search(
+        self,
+        query_tokens: Sequence[str],
+        query_vector: Optional[Sequence[float]],
+        limit: int,
+        bm25_weight: float,
+        vector_weight: float,
+        candidate_limit: int = DEFAULT_CANDIDATE_LIMIT,
+    ) -> List[ProfileMatch]:
+        """
+        Return the ``limit`` best profiles for a query.
+
+        Candidates are the top ``candidate_limit`` profiles by BM25. When no
+        profile shares a term with the query, every profile is a candidate
+        and ranking is by vector similarity alone.
+        """
+        bm25_weight, vector_weight = normalize_weights(bm25_weight, vector_weight)
+        snapshot = self._snapshot(query_tokens)
+        bm25_scores, term_rows = self._bm25(snapshot, query_tokens)
+
+        candidates = np.flatnonzero(bm25_scores > 0)
+        scan_all = not len(candidates)
+        if scan_all:
+            candidates = np.flatnonzero(snapshot.alive)
+        elif len(candidates) > candidate_limit:
+            top = np.argpartition(-bm25_scores[candidates], candidate_limit)[:candidate_limit]
+            candidates = candidates[top]
+
+        vector_scores = np.zeros(len(candidates), dtype=np.float32)
+        embeddings = snapshot.embeddings
+        if query_vector is not None and embeddings is not None and len(query_vector) == snapshot.dimensions:
+            query = np.asarray(query_vector, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if norm and scan_all:
+                # Multiply the contiguous matrix rather than gathering every row
+                vector_scores = (embeddings @ (query / norm))[candidates]
+            elif norm:
+                vector_scores = embeddings[candidates] @ (query / norm)
+
+        final_scores = bm25_weight * bm25_scores[candidates] + vector_weight * vector_scores
+        if len(candidates) > limit:
+            top = np.argpartition(-final_scores, limit)[:limit]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-final_scores[top], kind="stable")]
+        top_rows = candidates[top]
+        term_hits = {term: np.isin(top_rows, rows) for term, rows in term_rows.items()}
+
+        matches = []
+        for rank, position in enumerate(top):
+            row = int(top_rows[rank])
+            matches.append(
+                ProfileMatch(
+                    profile_id=snapshot.ids[row],
+                    score=float(final_scores[position]),
+                    bm25_score=float(bm25_scores[row]),
+                    vector_score=float(vector_scores[position]),
+                    matched_terms=[term for term, hits in term_hits.items() if hits[rank]],
+                )
+            )
+        return matches
+
+    def track_changes(self, enabled: bool = True) -> None:
+        """
+        Start (or, if a rebuild was abandoned, stop) recording adds and
+        removals for the next ``rebuild``.
+
+        Call it before loading the profiles a rebuild is built from, so
+        profiles indexed while they load are not lost when it swaps in.
+        """
+        with self._lock:
+            self._changes = [] if enabled else None
+
+    def rebuild(self, entries: Sequence[Tuple[str, Sequence[str], Optional[Sequence[float]]]]) -> None:
+        """Replace the index contents, dropping tombstoned rows."""
+        fresh = ProfileIndex(
+            dimensions=self._dimensions,
+            initial_capacity=max(len(entries), 1),
+            compact_ratio=self.compact_ratio,
+            compact_min_rows=self.compact_min_rows,
+        )
+        for profile_id, tokens, embedding in entries:
+            fresh.add(profile_id, tokens, embedding)
+        with self._lock:
+            for profile_id, tokens, embedding in self._changes or ():
+                if tokens is None:
+                    fresh.remove(profile_id)
+                else:
+                    fresh.add(profile_id, tokens, embedding)
+            self.__dict__.update({key: value for key, value in fresh.__dict__.items() if key != "_lock"})
+            self.loaded = True
+
+
+profile_index = ProfileIndex()
@@ -0,0 +1,332 @@
+"""
+MongoDB query profiling via driver command monitoring.
+
+Registers a pymongo ``CommandListener`` on the Motor client and records,
+per request correlation ID, how many queries ran, how long they took and
+how many documents they returned. Slow queries are sampled with their
+filter shape (values stripped) for later inspection.
+"""
+import threading
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+from app.schemas.events import BaseEvent, EventSeverity, EventType
+from app.services.logging import get_correlation_id, logger as event_logger
+
+SLOW_QUERY_THRESHOLD_MS = 100.0
+
+# Commands that read or write documents; handshakes and pings are ignored.
+MONITORED_COMMANDS = {
+    "find",
+    "getMore",
+    "aggregate",
+    "count",
+    "distinct",
+    "insert",
+    "update",
+    "delete",
+    "findAndModify",
+}
+
+# Commands that can be re-run under explain to count examined documents.
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct"}
+
+# Driver-added command fields that are not part of the query itself.
+_COMMAND_METADATA_FIELDS = {"lsid", "$db", "$clusterTime", "$readPreference", "txnNumber"}
+
+
+def filter_shape(value: Any) -> Any:
+    """Replace literal values in a filter with placeholders, keeping the structure."""
+    if isinstance(value, dict):
+        return {key: filter_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, dict) for item in value):
+            return [filter_shape(item) for item in value]
+        return ["?"]
+    return "?"
+
+
+def _command_filter(command_name: str, command: Dict[str, Any]) -> Any:
+    if command_name in ("find", "count", "distinct"):
+        return command.get("filter") or command.get("query") or {}
+    if command_name == "aggregate":
+        pipeline = command.get("pipeline") or []
+        if pipeline and "$match" in pipeline[0]:
+            return pipeline[0]["$match"]
+        return {}
+    if command_name in ("update", "delete"):
+        statements = command.get("updates") or command.get("deletes") or []
+        return statements[0].get("q", {}) if statements else {}
+    if command_name == "findAndModify":
+        return command.get("query", {})
+    return {}
+
+
+def _documents_returned(command_name: str, reply: Dict[str, Any]) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch", []))
+        return len(batch)
+    if command_name == "distinct":
+        return len(reply.get("values", []))
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") else 0
+    return int(reply.get("n", 0) or 0)
+
+
+@dataclass
+class SlowQuerySample:
+    """A slow command captured with its filter shape."""
+
+    correlation_id: Optional[str]
+    command_name: str
+    database: str
+    collection: Optional[str]
+    duration_ms: float
+    filter_shape: Any
+    docs_returned: int
+    docs_examined: Optional[int] = None
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+    # Original command, kept only so the sample can be explained later.
+    command: Optional[Dict[str, Any]] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("command")
+        data["timestamp"] = self.timestamp.isoformat()
+        return data
+
+
+@dataclass
+class RequestQueryStats:
+    """Database activity attributed to one request correlation ID."""
+
+    correlation_id: str
+    query_count: int = 0
+    failed_count: int = 0
+    total_time_ms: float = 0.0
+    docs_returned: int = 0
+    docs_examined: int = 0
+    slow_query_count: int = 0
+    commands: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _PendingCommand:
+    correlation_id: Optional[str]
+    command_name: str
+    database: str
+    collection: Optional[str]
+    command: Dict[str, Any]
+
+
+class QueryProfiler(monitoring.CommandListener):
+    """
+    Command listener aggregating MongoDB activity per request.
+
+    Motor runs driver calls on executor threads with the caller's context
+    copied, so the correlation ID set by the logging middleware is visible
+    in the listener callbacks.
+    """
+
+    def __init__(
+        self,
+        slow_threshold_ms: float = SLOW_QUERY_THRESHOLD_MS,
+        max_requests: int = 500,
+        max_slow_samples: int = 100,
+    ):
+        """
+        Initialize query profiler.
+
+        Args:
+            slow_threshold_ms: Commands slower than this are sampled
+            max_requests: Number of recent requests to keep statistics for
+            max_slow_samples: Number of slow query samples to keep
+        """
+        self.slow_threshold_ms = slow_threshold_ms
+        self.max_requests = max_requests
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[Any, int], _PendingCommand] = {}
+        self._requests: "OrderedDict[str, RequestQueryStats]" = OrderedDict()
+        self._slow_queries: Deque[SlowQuerySample] = deque(maxlen=max_slow_samples)
+        self._totals: Dict[str, Dict[str, float]] = {}
+
+    # pymongo CommandListener interface
+
+    def started(self, event) -> None:
+        if event.command_name not in MONITORED_COMMANDS:
+            return
+        command = event.command
+        collection = command.get(event.command_name)
+        pending = _PendingCommand(
+            correlation_id=get_correlation_id(),
+            command_name=event.command_name,
+            database=event.database_name,
+            collection=collection if isinstance(collection, str) else None,
+            command=command,
+        )
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = pending
+
+    def succeeded(self, event) -> None:
+        self._complete(event, reply=event.reply, failed=False)
+
+    def failed(self, event) -> None:
+        self._complete(event, reply={}, failed=True)
+
+    # Aggregation
+
+    def _complete(self, event, reply: Dict[str, Any], failed: bool) -> None:
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+
+        duration_ms = event.duration_micros / 1000.0
+        docs_returned = 0 if failed else _documents_returned(pending.command_name, reply)
+        is_slow = duration_ms >= self.slow_threshold_ms
+
+        sample = None
+        if is_slow:
+            sample = SlowQuerySample(
+                correlation_id=pending.correlation_id,
+                command_name=pending.command_name,
+                database=pending.database,
+                collection=pending.collection,
+                duration_ms=duration_ms,
+                filter_shape=filter_shape(_command_filter(pending.command_name, pending.command)),
+                docs_returned=docs_returned,
+                command={
+                    key: value for key, value in pending.command.items()
+                    if key not in _COMMAND_METADATA_FIELDS
+                },
+            )
+
+        with self._lock:
+            total_key = f"{pending.collection or pending.database}.{pending.command_name}"
+            totals = self._totals.setdefault(
+                total_key, {"count": 0, "total_time_ms": 0.0, "docs_returned": 0, "slow_count": 0}
+            )
+            totals["count"] += 1
+            totals["total_time_ms"] += duration_ms
+            totals["docs_returned"] += docs_returned
+
+            if pending.correlation_id:
+                stats = self._requests.get(pending.correlation_id)
+                if stats is None:
+                    stats = RequestQueryStats(correlation_id=pending.correlation_id)
+                    self._requests[pending.correlation_id] = stats
+                    while len(self._requests) > self.max_requests:
+                        self._requests.popitem(last=False)
+                stats.query_count += 1
+                stats.total_time_ms += duration_ms
+                stats.docs_returned += docs_returned
+                stats.commands[pending.command_name] = stats.commands.get(pending.command_name, 0) + 1
+                if failed:
+                    stats.failed_count += 1
+                if is_slow:
+                    stats.slow_query_count += 1
+
+            if sample is not None:
+                totals["slow_count"] += 1
+                self._slow_queries.append(sample)
+
+        if sample is not None:
+            event_logger.log_event(
+                BaseEvent(
+                    event_type=EventType.DB_SLOW_QUERY,
+                    severity=EventSeverity.WARNING,
+                    correlation_id=pending.correlation_id,
+                    metadata=sample.to_dict(),
+                )
+            )
+
+    # Read API
+
+    def get_request_stats(self, correlation_id: str) -> Optional[RequestQueryStats]:
+        """Get database statistics for a request correlation ID."""
+        with self._lock:
+            return self._requests.get(correlation_id)
+
+    def recent_requests(self, limit: int = 50) -> List[RequestQueryStats]:
+        """Get statistics for the most recent requests, newest first."""
+        with self._lock:
+            return list(reversed(self._requests.values()))[:limit]
+
+    def slow_queries(self, limit: int = 50) -> List[SlowQuerySample]:
+        """Get the most recent slow query samples, newest first."""
+        with self._lock:
+            return list(reversed(self._slow_queries))[:limit]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Get cumulative totals per ``collection.command``."""
+        with self._lock:
+            return {key: dict(value) for key, value in self._totals.items()}
+
+    def record_docs_examined(self, correlation_id: Optional[str], docs_examined: int):
+        """Attribute examined documents reported by explain to a request."""
+        if not correlation_id:
+            return
+        with self._lock:
+            stats = self._requests.get(correlation_id)
+            if stats is not None:
+                stats.docs_examined += docs_examined
+
+    def reset(self):
+        """Clear all recorded statistics (for testing)."""
+        with self._lock:
+            self._pending.clear()
+            self._requests.clear()
+            self._slow_queries.clear()
+            self._totals.clear()
+
+
+def _total_docs_examined(explain: Dict[str, Any]) -> Optional[int]:
+    stats = explain.get("executionStats")
+    if stats is None:
+        # Aggregate explains report the cursor stage per pipeline stage.
+        for stage in explain.get("stages", []):
+            cursor_stage = stage.get("$cursor")
+            if cursor_stage and "executionStats" in cursor_stage:
+                stats = cursor_stage["executionStats"]
+                break
+    if stats is None:
+        return None
+    return stats.get("totalDocsExamined")
+
+
+async def annotate_slow_queries(client: Any, samples: List[SlowQuerySample]) -> List[SlowQuerySample]:
+    """
+    Fill ``docs_examined`` on slow query samples by re-running them under explain.
+
+    Command replies do not report examined documents, so this is done on
+    demand rather than on the request path. Failures are ignored.
+    """
+    for sample in samples:
+        if sample.docs_examined is not None or sample.command_name not in EXPLAINABLE_COMMANDS:
+            continue
+        if not sample.command:
+            continue
+        try:
+            explain = await client[sample.database].command(
+                {"explain": sample.command, "verbosity": "executionStats"}
+            )
+        except Exception:
+            continue
+        docs_examined = _total_docs_examined(explain)
+        if docs_examined is None:
+            continue
+        sample.docs_examined = docs_examined
+        query_profiler.record_docs_examined(sample.correlation_id, docs_examined)
+    return samples
+
+
+# Global query profiler instance, registered on the Motor client
+query_profiler = QueryProfiler()
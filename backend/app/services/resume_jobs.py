@@ -0,0 +1,284 @@
+"""
+Resume parsing queue.
+
+Text extraction from PDF/DOCX files is CPU-bound, so uploads are queued and
+parsed in a process pool instead of inside the request handler. Each upload
+gets a job handle that can be polled for status; a completion callback
+applies the parsed result (e.g. updates the seeker's profile).
+"""
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.middleware.performance import LatencyTracker
+from app.services.logging import logger as event_logger
+from app.services.parse_cache import ParseCache, parse_cache
+from app.services.parsing import ParsedResume, ResumeParsingError, parse_resume, parse_resume_text
+from app.services.pdf_extraction import extract_pdf_text
+
+logger = get_logger(__name__)
+
+PARSE_LATENCY_KEY = "resume.parse"
+QUEUE_WAIT_KEY = "resume.queue_wait"
+
+
+class ResumeParseStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class ResumeParseJob:
+    """A queued resume parse and its outcome."""
+
+    job_id: str
+    user_id: str
+    path: str
+    content_hash: Optional[str] = None
+    cache_hit: bool = False
+    status: ResumeParseStatus = ResumeParseStatus.QUEUED
+    submitted_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    parse_ms: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[ParsedResume] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (ResumeParseStatus.COMPLETED, ResumeParseStatus.FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status.value,
+            "submitted_at": self.submitted_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "parse_ms": round(self.parse_ms, 2) if self.parse_ms is not None else None,
+            "cache_hit": self.cache_hit,
+            "error": self.error,
+        }
+
+
+CompletionHandler = Callable[[ResumeParseJob], Awaitable[None]]
+
+
+class ResumeParseQueue:
+    """
+    Async job queue in front of a resume parsing process pool.
+
+    ``max_workers`` consumer tasks each hand one file at a time to the pool,
+    so at most that many parses run concurrently and the rest wait in the
+    queue. Finished jobs are kept (up to ``max_jobs``) for status polling.
+    Files whose content hash is in the parse cache bypass the queue.
+
+    With ``split_pdf_pages`` (the default for ``parse_resume``), PDF text is
+    extracted from a thread that fans page ranges out to the pool, so one
+    long PDF uses every worker instead of one, and the extracted text is
+    then analyzed (``parse_resume_text``) in the pool as well. Only opening
+    the PDF and collecting page results happen in the API process.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = settings.RESUME_PARSE_WORKERS,
+        max_jobs: int = 1000,
+        parser: Callable[..., ParsedResume] = parse_resume,
+        executor_factory: Callable[[int], Executor] = ProcessPoolExecutor,
+        cache: Optional[ParseCache] = parse_cache,
+        split_pdf_pages: Optional[bool] = None,
+    ):
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.parser = parser
+        self.executor_factory = executor_factory
+        self.cache = cache
+        self.split_pdf_pages = parser is parse_resume if split_pdf_pages is None else split_pdf_pages
+        self.latencies = LatencyTracker(window_size=500)
+        self.completed_count = 0
+        self.failed_count = 0
+        self._queue: "asyncio.Queue[tuple]" = asyncio.Queue()
+        self._jobs: "OrderedDict[str, ResumeParseJob]" = OrderedDict()
+        self._executor: Optional[Executor] = None
+        self._tasks: List[asyncio.Task] = []
+        self._cached_tasks: "set[asyncio.Task]" = set()
+        self._in_flight = 0
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def start(self) -> None:
+        if self.running:
+            return
+        if self._executor is None:
+            self._executor = self.executor_factory(self.max_workers)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(
+        self,
+        user_id: str,
+        path: Path,
+        on_complete: Optional[CompletionHandler] = None,
+        content_hash: Optional[str] = None,
+    ) -> ResumeParseJob:
+        """Queue a resume for parsing and return its job handle."""
+        self.start()
+        job = ResumeParseJob(job_id=uuid.uuid4().hex, user_id=user_id, path=str(path), content_hash=content_hash)
+        self._jobs[job.job_id] = job
+        while len(self._jobs) > self.max_jobs:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if not oldest.done:
+                break
+            del self._jobs[oldest_id]
+
+        cached = self.cache.get(content_hash) if self.cache is not None else None
+        if cached is not None:
+            # Nothing to parse; apply the cached result without queueing
+            job.result = cached
+            job.cache_hit = True
+            task = asyncio.create_task(self._run_job(asyncio.get_running_loop(), job, on_complete))
+            self._cached_tasks.add(task)
+            task.add_done_callback(self._cached_tasks.discard)
+        else:
+            self._queue.put_nowait((job, on_complete))
+        return job
+
+    def get(self, job_id: str) -> Optional[ResumeParseJob]:
+        return self._jobs.get(job_id)
+
+    def in_use(self, path: str, exclude: Optional[ResumeParseJob] = None) -> bool:
+        """Whether a job other than ``exclude`` has yet to finish with the file at ``path``."""
+        return any(
+            job is not exclude and job.path == path and not job.done
+            for job in self._jobs.values()
+        )
+
+    async def join(self) -> None:
+        """Wait until every queued job has finished."""
+        await self._queue.join()
+        if self._cached_tasks:
+            await asyncio.gather(*self._cached_tasks, return_exceptions=True)
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job, on_complete = await self._queue.get()
+            self._in_flight += 1
+            try:
+                await self._run_job(loop, job, on_complete)
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    async def _run_job(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        job: ResumeParseJob,
+        on_complete: Optional[CompletionHandler],
+    ) -> None:
+        job.status = ResumeParseStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        if not job.cache_hit:
+            wait_ms = (job.started_at - job.submitted_at).total_seconds() * 1000
+            self.latencies.add_measurement(QUEUE_WAIT_KEY, wait_ms, 200)
+
+        start = time.perf_counter()
+        if not job.cache_hit:
+            try:
+                job.result = await self._parse(loop, Path(job.path))
+                if job.content_hash and self.cache is not None:
+                    self.cache.put(job.content_hash, job.result)
+            except ResumeParsingError as exc:
+                job.error = str(exc)
+            except Exception:
+                logger.exception("Resume parsing crashed for job %s", job.job_id)
+                job.error = "Resume could not be parsed"
+        job.parse_ms = (time.perf_counter() - start) * 1000
+
+        # The job only reports completed once its result has been applied
+        if on_complete is not None:
+            try:
+                await on_complete(job)
+            except Exception:
+                logger.exception("Applying parsed resume failed for job %s", job.job_id)
+                job.error = job.error or "Parsed resume could not be saved"
+
+        succeeded = job.error is None
+        job.status = ResumeParseStatus.COMPLETED if succeeded else ResumeParseStatus.FAILED
+        job.finished_at = datetime.utcnow()
+        if succeeded:
+            self.completed_count += 1
+        else:
+            self.failed_count += 1
+        if not job.cache_hit:
+            self.latencies.add_measurement(PARSE_LATENCY_KEY, job.parse_ms, 200 if succeeded else 500)
+        # Page details are reported for PDFs parsed by this job, not cached results
+        pdf = job.result if job.result and job.result.page_count is not None and not job.cache_hit else None
+        event_logger.log_resume_parsed(
+            candidate_id=job.user_id,
+            resume_id=job.job_id,
+            parsing_duration=job.parse_ms / 1000,
+            success=succeeded,
+            page_count=pdf.page_count if pdf else None,
+            page_timings=pdf.page_timings if pdf else None,
+            truncated=pdf.truncated if pdf else None,
+        )
+
+    async def _parse(self, loop: asyncio.AbstractEventLoop, path: Path) -> ParsedResume:
+        if self.split_pdf_pages and path.suffix.lower() == ".pdf":
+            extraction = await asyncio.to_thread(extract_pdf_text, path, executor=self._executor)
+            # Normalization and the skill/title passes would hold the GIL here
+            return await loop.run_in_executor(self._executor, parse_resume_text, extraction.text, extraction)
+        return await loop.run_in_executor(self._executor, self.parser, path)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, throughput counters and latency percentiles."""
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "workers": self.max_workers,
+            "completed": self.completed_count,
+            "failed": self.failed_count,
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "parse_latency_ms": {
+                f"p{percentile}": round(self.latencies.get_percentile(PARSE_LATENCY_KEY, percentile), 2)
+                for percentile in (50, 95, 99)
+            },
+            "queue_wait_ms": {
+                f"p{percentile}": round(self.latencies.get_percentile(QUEUE_WAIT_KEY, percentile), 2)
+                for percentile in (50, 95, 99)
+            },
+        }
+
+
+resume_parse_queue = ResumeParseQueue()
@@ -7,7 +7,13 @@ from typing import Iterable, List, Optional, Sequence
 
 import numpy as np
 from app.models.job import Job
-from app.services.normalization import tokenize
+from app.services.analyzer import get_analyzer
+from app.services.normalization import AnalyzedText, analyze_text, normalize_skills
+from app.services.skill_vocabulary import popcount, shared_skills, skill_vocabulary
+
+
+BM25_K1 = 1.6
+BM25_B = 0.75
 
 
 @dataclass
@@ -28,16 +34,28 @@ def _compute_idf(jobs_tokens: Sequence[List[str]]) -> dict:
             df[token] = df.get(token, 0) + 1
     idf = {}
     for token, freq in df.items():
-        idf[token] = math.log(1 + (num_docs - freq + 0.5) / (freq + 0.5))
+        idf[token] = bm25_idf(num_docs, freq)
     return idf
 
 
+def bm25_idf(num_docs: int, doc_freq: int) -> float:
+    return math.log(1 + (num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+def normalize_weights(bm25_weight: float, vector_weight: float) -> tuple[float, float]:
+    """Scale the BM25 and vector weights to sum to 1 (BM25 only if both are 0)."""
+    weight_sum = bm25_weight + vector_weight
+    if weight_sum == 0:
+        return 1.0, 0.0
+    return bm25_weight / weight_sum, vector_weight / weight_sum
+
+
 def _bm25(
     query_tokens: List[str],
     jobs_tokens: Sequence[List[str]],
     idf: dict,
-    k1: float = 1.6,
-    b: float = 0.75,
+    k1: float = BM25_K1,
+    b: float = BM25_B,
 ) -> tuple[List[float], List[dict]]:
     avg_len = sum(len(tokens) for tokens in jobs_tokens) / max(len(jobs_tokens), 1)
     scores = []
@@ -74,11 +92,13 @@ def _cosine_similarity(query_vector: List[float], job_vector: List[float]) -> fl
     return float(np.dot(q, j) / (norm_q * norm_j))
 
 
+def analyze_query(skills: Iterable[str], titles: Iterable[str], extra_text: Optional[str] = None) -> AnalyzedText:
+    """Query text (for the embedding) and query tokens (for BM25) in one pass."""
+    return analyze_text(" ".join(skills), " ".join(titles), extra_text or "", analyzer=get_analyzer())
+
+
 def build_query_tokens(skills: Iterable[str], titles: Iterable[str], extra_text: Optional[str] = None) -> List[str]:
-    parts = list(skills) + list(titles)
-    if extra_text:
-        parts.append(extra_text)
-    return tokenize(" ".join(parts))
+    return analyze_query(skills, titles, extra_text).tokens
 
 
 def rank_jobs(
@@ -94,24 +114,25 @@ def rank_jobs(
     if not jobs:
         return []
 
-    weight_sum = bm25_weight + vector_weight
-    if weight_sum == 0:
-        bm25_weight = 1.0
-        vector_weight = 0.0
-        weight_sum = 1.0
-
-    normalized_bm25_weight = bm25_weight / weight_sum
-    normalized_vector_weight = vector_weight / weight_sum
+    normalized_bm25_weight, normalized_vector_weight = normalize_weights(bm25_weight, vector_weight)
 
     jobs_tokens = [job.tokens for job in jobs]
     idf = _compute_idf(jobs_tokens)
     bm25_scores, bm25_contributions = _bm25(query_tokens, jobs_tokens, idf)
 
     results: List[RankedJob] = []
-    normalized_skills = profile_skills or []
     normalized_titles = [title.lower() for title in (profile_titles or [])]
 
-    for job, bm25_score, token_contrib in zip(jobs, bm25_scores, bm25_contributions):
+    # Skill overlap for every job at once from the shared skill bitsets
+    skill_overlaps = np.zeros(len(jobs), dtype=np.int64)
+    if profile_skills:
+        # Job skills are registered (jobs indexed by another worker may be new
+        # here); profile skills are only looked up
+        job_bits = skill_vocabulary.encode_many([job.skills for job in jobs], register=True)
+        shared = shared_skills(skill_vocabulary.encode(profile_skills), job_bits)
+        skill_overlaps = popcount(shared)
+
+    for index, (job, bm25_score, token_contrib) in enumerate(zip(jobs, bm25_scores, bm25_contributions)):
         if job.embedding:
             vector_score = _cosine_similarity(query_vector, job.embedding)
         else:
@@ -119,8 +140,10 @@ def rank_jobs(
 
         final_score = (normalized_bm25_weight * bm25_score) + (normalized_vector_weight * vector_score)
         explanations = []
-        if normalized_skills:
-            skill_matches = [skill for skill in job.skills if skill in normalized_skills]
+        if skill_overlaps[index]:
+            # Decoded names are canonical; compare the job's skills in the same form
+            matched = set(skill_vocabulary.decode(shared[index]))
+            skill_matches = [skill for skill in normalize_skills(job.skills) if skill in matched]
             for skill in skill_matches:
                 explanations.append({"label": skill, "weight": 1.0, "source": "skill"})
         if normalized_titles:
@@ -0,0 +1,189 @@
+"""
+Job search query construction.
+
+Builds the MongoDB filter and sort order used by the job search endpoint.
+Kept separate from the route so the index advisor can replay the exact
+query shapes the API produces.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.job import JobStatus
+from app.services.geo import geo_within_radius, geocode, near_sphere
+
+POSTED_WITHIN_HOURS = {"24h": 24, "7d": 168, "30d": 720}
+
+SORT_OPTIONS: Dict[str, List[Tuple[str, int]]] = {
+    "relevance": [("posted_at", -1)],  # Default: newest first
+    "newest": [("posted_at", -1)],
+    "salary": [("salary_max", -1), ("salary_min", -1)],
+    "distance": [],  # Ordered by $nearSphere
+}
+
+DEFAULT_RADIUS_MILES = 50
+
+
+@dataclass
+class SearchQuery:
+    """MongoDB filter and sort for a job search request."""
+
+    filter: Dict[str, Any]
+    sort: List[Tuple[str, int]] = field(default_factory=list)
+    # $nearSphere condition used instead of the $geoWithin filter when
+    # results are ordered by distance. $nearSphere cannot be counted, so
+    # ``filter`` is still used for the total.
+    near: Optional[Dict[str, Any]] = None
+
+    def find_filter(self) -> Dict[str, Any]:
+        """Filter for fetching results, applying distance ordering if requested."""
+        if self.near is None:
+            return self.filter
+        return {**self.filter, "geo_location": self.near}
+
+
+def split_csv(value: Optional[str]) -> List[str]:
+    """Split a comma-separated query parameter into stripped values."""
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",")]
+
+
+def build_search_query(
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    radius: Optional[int] = DEFAULT_RADIUS_MILES,
+    easy_apply: bool = False,
+    remote_only: bool = False,
+    salary_min: Optional[int] = None,
+    salary_max: Optional[int] = None,
+    hide_without_salary: bool = False,
+    posted_within: Optional[str] = None,
+    min_rating: Optional[float] = None,
+    company_sizes: Optional[str] = None,
+    companies: Optional[str] = None,
+    industries: Optional[str] = None,
+    work_types: Optional[str] = None,
+    job_types: Optional[str] = None,
+    experience_levels: Optional[str] = None,
+    cities: Optional[str] = None,
+    states: Optional[str] = None,
+    skills: Optional[str] = None,
+    sort_by: str = "relevance",
+    now: Optional[datetime] = None,
+) -> SearchQuery:
+    """
+    Build the search filter and sort order from search parameters.
+
+    Multi-value parameters are comma-separated strings, exactly as they
+    arrive on the query string. Locations found in the city gazetteer are
+    searched by radius; anything else falls back to a text match.
+    """
+    query: Dict[str, Any] = {"status": JobStatus.ACTIVE}
+    near = None
+
+    # Keyword search - search in title, description, and skills
+    if q:
+        query["$or"] = [
+            {"title": {"$regex": q, "$options": "i"}},
+            {"description": {"$regex": q, "$options": "i"}},
+            {"skills": {"$in": [q]}}
+        ]
+
+    # Location search
+    coordinates = geocode(location) if location else None
+    if coordinates:
+        radius_miles = radius if radius is not None else DEFAULT_RADIUS_MILES
+        query["geo_location"] = geo_within_radius(coordinates, radius_miles)
+        if sort_by == "distance":
+            near = near_sphere(coordinates, radius_miles)
+    elif location:
+        location_query = {
+            "$or": [
+                {"location": {"$regex": location, "$options": "i"}},
+                {"city": {"$regex": location, "$options": "i"}},
+                {"state": {"$regex": location, "$options": "i"}}
+            ]
+        }
+        # Merge with existing query
+        if "$or" in query:
+            query["$and"] = [{"$or": query["$or"]}, location_query]
+            del query["$or"]
+        else:
+            query.update(location_query)
+
+    # Easy apply filter
+    if easy_apply:
+        query["easy_apply"] = True
+
+    # Remote filter
+    if remote_only:
+        query["work_type"] = "remote"
+    elif work_types:
+        query["work_type"] = {"$in": split_csv(work_types)}
+
+    # Salary filter
+    if hide_without_salary:
+        query["salary_min"] = {"$ne": None}
+    elif salary_min is not None or salary_max is not None:
+        salary_conditions = []
+        if salary_min is not None:
+            # Job's max salary should be >= our minimum
+            salary_conditions.append({"salary_max": {"$gte": salary_min}})
+        if salary_max is not None:
+            # Job's min salary should be <= our maximum
+            salary_conditions.append({"salary_min": {"$lte": salary_max}})
+
+        if salary_conditions:
+            if "$and" in query:
+                query["$and"].extend(salary_conditions)
+            else:
+                query["$and"] = salary_conditions
+
+    # Date posted filter
+    if posted_within and posted_within != "any":
+        hours = POSTED_WITHIN_HOURS.get(posted_within, 720)
+        cutoff = (now or datetime.utcnow()) - timedelta(hours=hours)
+        query["posted_at"] = {"$gte": cutoff}
+
+    # Company rating
+    if min_rating:
+        query["company_rating"] = {"$gte": min_rating}
+
+    # Experience level
+    if experience_levels:
+        query["experience_level"] = {"$in": split_csv(experience_levels)}
+
+    # Job types
+    if job_types:
+        query["job_type"] = {"$in": split_csv(job_types)}
+
+    # Cities
+    if cities:
+        query["city"] = {"$in": split_csv(cities)}
+
+    # States
+    if states:
+        query["state"] = {"$in": split_csv(states)}
+
+    # Companies
+    if companies:
+        query["company_name"] = {"$in": split_csv(companies)}
+
+    # Company sizes
+    if company_sizes:
+        query["company_size"] = {"$in": split_csv(company_sizes)}
+
+    # Industries
+    if industries:
+        query["industry"] = {"$in": split_csv(industries)}
+
+    # Skills
+    if skills:
+        query["skills"] = {"$all": split_csv(skills)}
+
+    if sort_by == "distance" and near is None:
+        # Distance ordering needs a geocoded location
+        sort_by = "relevance"
+    sort = SORT_OPTIONS.get(sort_by, SORT_OPTIONS["relevance"])
+    return SearchQuery(filter=query, sort=list(sort), near=near)
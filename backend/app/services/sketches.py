@@ -0,0 +1,365 @@
+"""
+Mergeable probabilistic sketches for metrics rollups.
+
+``HyperLogLog`` estimates the number of distinct items (unique users) in
+a time bucket. Sketches for separate buckets merge by taking the
+register-wise maximum, so a 30-day unique-user count is the merge of 30
+daily sketches instead of a set built from every event.
+
+Small sketches stay sparse (a dict of non-zero registers) and switch to a
+dense ``bytearray`` once that would be smaller, so the many mostly empty
+minute buckets cost a few bytes each.
+
+``QuantileSketch`` answers p50/p90/p99 queries (time-to-shortlist). It
+keeps the exact values while there are few of them, then switches to a
+KLL sketch: a stack of compactors where level ``h`` holds samples of
+weight ``2**h``. Memory stays around ``3 * k`` values however many are
+added, rank error is roughly ``1.7 / k``, and merged sketches are as
+accurate as one sketch fed every value.
+
+``LogHistogram`` is the latency sketch: values fall into logarithmic
+buckets (DDSketch-style, 0.5% relative error by default), recording is one
+dict update and a quantile walks the few hundred buckets a latency range
+needs. ``SlidingHistogram`` keeps the last ``window_size`` values as a
+ring of sub-histograms and subtracts the oldest one when it rotates out.
+"""
+import bisect
+import hashlib
+import math
+import random
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Sequence
+
+
+def _hash64(item: str) -> int:
+    return int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """Distinct count estimator with ~1.04/sqrt(2**precision) relative error."""
+
+    __slots__ = ("precision", "_sparse", "_dense")
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self._sparse: Optional[Dict[int, int]] = {}
+        self._dense: Optional[bytearray] = None
+
+    @property
+    def registers(self) -> int:
+        return 1 << self.precision
+
+    def _set(self, index: int, rank: int) -> None:
+        if self._dense is not None:
+            if rank > self._dense[index]:
+                self._dense[index] = rank
+            return
+        if rank > self._sparse.get(index, 0):
+            self._sparse[index] = rank
+            # A dict entry costs far more than one byte; go dense well before m entries
+            if len(self._sparse) > self.registers // 16:
+                self._densify()
+
+    def _densify(self) -> None:
+        dense = bytearray(self.registers)
+        for index, rank in self._sparse.items():
+            dense[index] = rank
+        self._dense = dense
+        self._sparse = None
+
+    def add(self, item: str) -> None:
+        value = _hash64(item)
+        index = value >> (64 - self.precision)
+        remaining = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        self._set(index, rank)
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Fold ``other`` into this sketch (register-wise max)."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        if other._dense is not None:
+            if self._dense is None:
+                self._densify()
+            self._dense[:] = bytes(map(max, self._dense, other._dense))
+        else:
+            for index, rank in other._sparse.items():
+                self._set(index, rank)
+
+    def copy(self) -> "HyperLogLog":
+        clone = HyperLogLog(self.precision)
+        clone._sparse = dict(self._sparse) if self._sparse is not None else None
+        clone._dense = bytearray(self._dense) if self._dense is not None else None
+        return clone
+
+    def count(self) -> int:
+        m = self.registers
+        if self._dense is not None:
+            ranks = self._dense
+            zeros = ranks.count(0)
+        else:
+            ranks = self._sparse.values()
+            zeros = m - len(self._sparse)
+        if zeros == m:
+            return 0
+
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        harmonic = zeros + sum(2.0 ** -rank for rank in ranks if rank)
+        estimate = alpha * m * m / harmonic
+        # Linear counting is far more accurate while many registers are empty
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def __len__(self) -> int:
+        return self.count()
+
+
+class KLLSketch:
+    """KLL streaming quantile sketch."""
+
+    __slots__ = ("k", "count", "_levels", "_random")
+
+    _DECAY = 2 / 3
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.count = 0
+        self._levels: List[List[float]] = [[]]
+        self._random = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(math.ceil(self.k * self._DECAY ** depth)))
+
+    def _size(self) -> int:
+        return sum(map(len, self._levels))
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self._levels)))
+
+    def _compress(self) -> None:
+        while self._size() >= self._max_size():
+            for level, items in enumerate(self._levels):
+                if len(items) >= self._capacity(level):
+                    if level + 1 == len(self._levels):
+                        self._levels.append([])
+                    items.sort()
+                    # An odd item out stays behind so weights are preserved
+                    keep = [items.pop()] if len(items) % 2 else []
+                    offset = self._random.getrandbits(1)
+                    self._levels[level + 1].extend(items[offset::2])
+                    self._levels[level] = keep
+                    break
+
+    def add(self, value: float) -> None:
+        self._levels[0].append(value)
+        self.count += 1
+        if len(self._levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+        self.count += other.count
+        self._compress()
+
+    def copy(self) -> "KLLSketch":
+        clone = KLLSketch(self.k)
+        clone.count = self.count
+        clone._levels = [list(items) for items in self._levels]
+        return clone
+
+    def quantiles(self, fractions: Sequence[float]) -> List[Optional[float]]:
+        """Nearest-rank estimates for each fraction in [0, 1]."""
+        if not self.count:
+            return [None] * len(fractions)
+        weighted = sorted(
+            (value, 1 << level) for level, items in enumerate(self._levels) for value in items
+        )
+        cumulative: List[int] = []
+        total = 0
+        for _, weight in weighted:
+            total += weight
+            cumulative.append(total)
+        results = []
+        for fraction in fractions:
+            position = bisect.bisect_left(cumulative, max(1, math.ceil(fraction * total)))
+            results.append(weighted[min(position, len(weighted) - 1)][0])
+        return results
+
+
+class QuantileSketch:
+    """
+    Quantiles that are exact for up to ``exact_limit`` values and
+    approximate (KLL) beyond, in bounded memory either way.
+    """
+
+    __slots__ = ("exact_limit", "k", "_values", "_kll")
+
+    def __init__(self, exact_limit: int = 512, k: int = 200):
+        self.exact_limit = exact_limit
+        self.k = k
+        self._values: Optional[List[float]] = []
+        self._kll: Optional[KLLSketch] = None
+
+    @property
+    def exact(self) -> bool:
+        return self._kll is None
+
+    @property
+    def count(self) -> int:
+        return len(self._values) if self._kll is None else self._kll.count
+
+    def _to_kll(self) -> KLLSketch:
+        if self._kll is None:
+            self._kll = KLLSketch(self.k)
+            for value in self._values:
+                self._kll.add(value)
+            self._values = None
+        return self._kll
+
+    def add(self, value: float) -> None:
+        if self._kll is not None:
+            self._kll.add(value)
+            return
+        self._values.append(value)
+        if len(self._values) > self.exact_limit:
+            self._to_kll()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other._kll is None and self._kll is None and self.count + other.count <= self.exact_limit:
+            self._values.extend(other._values)
+        elif other._kll is None:
+            kll = self._to_kll()
+            for value in other._values:
+                kll.add(value)
+        else:
+            self._to_kll().merge(other._kll)
+
+    def quantiles(self, fractions: Sequence[float]) -> List[Optional[float]]:
+        """
+        Quantiles for each fraction. Exact mode interpolates between
+        neighbouring values, so the 0.5 quantile is the usual median.
+        """
+        if self._kll is not None:
+            return self._kll.quantiles(fractions)
+        if not self._values:
+            return [None] * len(fractions)
+        values = sorted(self._values)
+        results = []
+        for fraction in fractions:
+            position = fraction * (len(values) - 1)
+            lower = int(position)
+            upper = min(lower + 1, len(values) - 1)
+            results.append(values[lower] + (values[upper] - values[lower]) * (position - lower))
+        return results
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        return self.quantiles([fraction])[0]
+
+
+class LogHistogram:
+    """
+    Mergeable histogram with logarithmic buckets of bounded relative width.
+
+    Each bucket keeps its count and the sum of its values; quantiles report
+    the bucket mean, so a bucket holding a single distinct value is exact.
+    """
+
+    __slots__ = ("relative_accuracy", "_log_gamma", "counts", "sums", "count")
+
+    def __init__(self, relative_accuracy: float = 0.005):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._log_gamma = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self.counts: Dict[int, int] = {}
+        self.sums: Dict[int, float] = {}
+        self.count = 0
+
+    def bucket(self, value: float) -> int:
+        # Zero and negative values share one bucket below every positive one
+        if value <= 0:
+            return -(1 << 31)
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float, count: int = 1) -> None:
+        index = self.bucket(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.sums[index] = self.sums.get(index, 0.0) + value * count
+        self.count += count
+
+    def merge(self, other: "LogHistogram", sign: int = 1) -> None:
+        """Add (or with ``sign=-1`` remove) another histogram's values."""
+        for index, count in other.counts.items():
+            remaining = self.counts.get(index, 0) + sign * count
+            if remaining:
+                self.counts[index] = remaining
+                self.sums[index] = self.sums.get(index, 0.0) + sign * other.sums[index]
+            else:
+                self.counts.pop(index, None)
+                self.sums.pop(index, None)
+        self.count += sign * other.count
+
+    def values_at_ranks(self, ranks: Sequence[int]) -> List[float]:
+        """Estimated values at 0-based ``ranks`` (ascending order not required)."""
+        if not self.count:
+            return [0.0] * len(ranks)
+        order = sorted(range(len(ranks)), key=ranks.__getitem__)
+        results = [0.0] * len(ranks)
+        position = 0
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            while position < len(order) and ranks[order[position]] < seen:
+                results[order[position]] = self.sums[index] / self.counts[index]
+                position += 1
+            if position == len(order):
+                break
+        last = max(self.counts)
+        for slot in order[position:]:
+            results[slot] = self.sums[last] / self.counts[last]
+        return results
+
+
+class SlidingHistogram:
+    """``LogHistogram`` over the most recent ``window_size`` values."""
+
+    __slots__ = ("window_size", "slot_size", "slots", "total", "_ring")
+
+    def __init__(self, window_size: int = 1000, slots: int = 10, relative_accuracy: float = 0.005):
+        self.window_size = window_size
+        self.slots = max(1, min(slots, window_size))
+        self.slot_size = math.ceil(window_size / self.slots)
+        self.total = LogHistogram(relative_accuracy)
+        self._ring: Deque[LogHistogram] = deque([LogHistogram(relative_accuracy)])
+
+    def add(self, value: float) -> None:
+        current = self._ring[-1]
+        if current.count >= self.slot_size:
+            current = LogHistogram(self.total.relative_accuracy)
+            self._ring.append(current)
+            if len(self._ring) > self.slots:
+                self.total.merge(self._ring.popleft(), sign=-1)
+        current.add(value)
+        self.total.add(value)
+
+    def percentiles(self, percentiles: Sequence[float]) -> List[float]:
+        """Nearest-rank percentiles (0-100) over the window."""
+        count = self.total.count
+        ranks = [min(int(count * percentile / 100), count - 1) for percentile in percentiles]
+        return self.total.values_at_ranks(ranks)
+
+    def __len__(self) -> int:
+        return self.total.count
@@ -0,0 +1,159 @@
+"""
+Global skill vocabulary and skill bitsets.
+
+Every normalized skill gets a stable bit position. Skill lists are encoded
+as fixed-width rows of uint64 words so Jaccard similarity, overlap counts
+and matched skills for a whole candidate set come from bitwise AND/OR and
+a popcount instead of building Python sets per pair.
+
+Only job skills are registered (``add`` or ``register=True``). Query and
+profile skills the vocabulary does not know are left out of their rows:
+they cannot match any job, and registering them would let user input grow
+the vocabulary and the bitset width without bound. Jaccard scores take the
+true set sizes so those skills still count towards the union.
+"""
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.normalization import normalize_skills
+
+WORD_BITS = 64
+
+# Per-byte popcounts for NumPy builds without np.bitwise_count (< 2.0)
+_BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Count set bits per row of a ``(rows, words)`` uint64 array."""
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    as_bytes = words.view(np.uint8).reshape(*words.shape[:-1], -1)
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+class SkillVocabulary:
+    """Maps normalized skill names to bit positions."""
+
+    def __init__(self, skills: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._skills: List[str] = []
+        self.add(skills)
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def __contains__(self, skill: str) -> bool:
+        return skill in self._index
+
+    @property
+    def width(self) -> int:
+        """Number of uint64 words needed to hold every known skill."""
+        return max(1, -(-len(self._skills) // WORD_BITS))
+
+    def add(self, skills: Iterable[str]) -> List[int]:
+        """Register skills (normalized first) and return their bit positions."""
+        positions = []
+        for skill in normalize_skills(skills):
+            position = self._index.get(skill)
+            if position is None:
+                with self._lock:
+                    position = self._index.get(skill)
+                    if position is None:
+                        position = len(self._skills)
+                        self._skills.append(skill)
+                        self._index[skill] = position
+            positions.append(position)
+        return positions
+
+    def _positions(self, skills: Iterable[str], register: bool) -> Tuple[List[int], int]:
+        """Bit positions of the known skills and the number of distinct skills."""
+        normalized = normalize_skills(skills)
+        if register:
+            return self.add(normalized), len(normalized)
+        index = self._index
+        return [index[skill] for skill in normalized if skill in index], len(normalized)
+
+    def encode_sets(
+        self, skill_lists: Sequence[Iterable[str]], width: int = None, register: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bitset rows for skill lists plus the number of distinct skills in
+        each list, counting skills left out of the rows as unknown.
+
+        ``register=True`` adds unknown skills first; use it for job skills
+        only, never for query or profile input.
+        """
+        positions = []
+        sizes = np.zeros(len(skill_lists), dtype=np.int64)
+        for row, skills in enumerate(skill_lists):
+            row_positions, sizes[row] = self._positions(skills, register)
+            positions.append(row_positions)
+        matrix = np.zeros((len(positions), max(width or 1, self.width)), dtype=np.uint64)
+        for row, row_positions in enumerate(positions):
+            for position in row_positions:
+                matrix[row, position // WORD_BITS] |= np.uint64(1 << (position % WORD_BITS))
+        return matrix, sizes
+
+    def encode_many(
+        self, skill_lists: Sequence[Iterable[str]], width: int = None, register: bool = False
+    ) -> np.ndarray:
+        """Encode skill lists as one bitset row each, at least ``width`` words wide."""
+        return self.encode_sets(skill_lists, width, register)[0]
+
+    def encode(self, skills: Iterable[str], width: int = None, register: bool = False) -> np.ndarray:
+        """Encode one skill list as a row of at least ``width`` uint64 words."""
+        return self.encode_many([skills], width, register)[0]
+
+    def decode(self, row: np.ndarray) -> List[str]:
+        """Skill names of the bits set in a single bitset row."""
+        bits = np.unpackbits(np.ascontiguousarray(row, dtype=np.uint64).view(np.uint8), bitorder="little")
+        return [self._skills[position] for position in np.flatnonzero(bits) if position < len(self._skills)]
+
+
+def _align(query: np.ndarray, candidates: np.ndarray) -> tuple:
+    """Pad a query row and candidate matrix to the same number of words."""
+    width = max(query.shape[-1], candidates.shape[-1])
+    if query.shape[-1] < width:
+        query = np.pad(query, (0, width - query.shape[-1]))
+    if candidates.shape[-1] < width:
+        candidates = np.pad(candidates, ((0, 0), (0, width - candidates.shape[-1])))
+    return query, candidates
+
+
+def shared_skills(query: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """Bitsets of the skills each candidate row shares with the query row."""
+    query, candidates = _align(query, candidates)
+    return candidates & query
+
+
+def overlap_counts(query: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """Number of skills each candidate row shares with the query row."""
+    return popcount(shared_skills(query, candidates))
+
+
+def jaccard_scores(
+    query: np.ndarray,
+    candidates: np.ndarray,
+    query_size: Optional[int] = None,
+    candidate_sizes: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Jaccard similarity of the query row against every candidate row.
+
+    Pass the set sizes from ``encode_sets`` when rows may have left out
+    unknown skills; otherwise the union is counted from the rows.
+    """
+    query, candidates = _align(query, candidates)
+    intersection = popcount(candidates & query).astype(np.float64)
+    if query_size is None or candidate_sizes is None:
+        union = popcount(candidates | query).astype(np.float64)
+    else:
+        union = query_size + np.asarray(candidate_sizes, dtype=np.float64) - intersection
+    return np.divide(intersection, union, out=np.zeros_like(union), where=union > 0)
+
+
+skill_vocabulary = SkillVocabulary()
@@ -0,0 +1,91 @@
+"""
+Streaming storage for uploaded files.
+
+Uploads are copied in fixed-size chunks. The size limit is enforced and a
+SHA-256 content hash computed in the same pass, so oversized files are
+rejected without being fully written. Data goes to a temporary file in the
+destination directory and is renamed into place, so readers never see a
+partial file. Files are named by content hash, which makes repeated uploads
+of the same file resolve to the file already stored.
+"""
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+from app.core.config import settings
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """Raised when an upload cannot be stored."""
+
+
+class UploadTooLargeError(UploadError):
+    """Raised when an upload exceeds the size limit."""
+
+
+class EmptyUploadError(UploadError):
+    """Raised when an upload has no content."""
+
+
+class AsyncReadable(Protocol):
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+@dataclass
+class StoredUpload:
+    path: Path
+    size: int
+    sha256: str
+    deduplicated: bool = False  # Identical content was already stored
+
+
+async def store_upload(
+    upload: AsyncReadable,
+    storage_dir: Path,
+    name_prefix: str,
+    extension: str,
+    max_size: int = settings.MAX_UPLOAD_SIZE,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> StoredUpload:
+    """
+    Stream an upload to ``storage_dir/<name_prefix>_<sha256><extension>``.
+
+    Raises UploadTooLargeError as soon as more than ``max_size`` bytes have
+    been read, and EmptyUploadError for zero-byte uploads. No file is left
+    behind when either is raised.
+    """
+    storage_dir.mkdir(parents=True, exist_ok=True)
+    hasher = hashlib.sha256()
+    size = 0
+
+    handle = tempfile.NamedTemporaryFile(dir=storage_dir, prefix=".upload-", suffix=extension, delete=False)
+    temp_path = Path(handle.name)
+    try:
+        with handle:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(f"Upload exceeds the {max_size} byte limit")
+                hasher.update(chunk)
+                handle.write(chunk)
+        if size == 0:
+            raise EmptyUploadError("Uploaded file is empty")
+
+        digest = hasher.hexdigest()
+        dest_path = storage_dir / f"{name_prefix}_{digest}{extension}"
+        if dest_path.exists():
+            temp_path.unlink()
+            return StoredUpload(path=dest_path, size=size, sha256=digest, deduplicated=True)
+        os.replace(temp_path, dest_path)
+        return StoredUpload(path=dest_path, size=size, sha256=digest)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
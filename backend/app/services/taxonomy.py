@@ -0,0 +1,142 @@
+"""
+Skill taxonomy: one alias -> canonical skill map for the whole backend.
+
+The source of truth is a tab-separated file (``app/data/skill_taxonomy.tsv``)
+with one canonical skill per line followed by its aliases. Resume parsing
+extracts skills with a compiled matcher over every alias, and
+``normalize_skills`` (and through it scoring and the skill bitsets) resolves
+aliases with a dict lookup, so "JS", "node.js" and "Postgres" mean the same
+thing everywhere.
+
+``scripts/build_skill_taxonomy.py`` pickles the parsed map next to the TSV.
+Loading the pickle skips TSV parsing, and the matcher is an
+``AliasMatcher`` built from the map with set operations rather than a
+compiled pattern, which keeps startup fast for taxonomies with tens of
+thousands of aliases. The pickle is ignored when it no longer matches the
+TSV.
+"""
+import hashlib
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.keyword_matcher import AliasMatcher
+
+logger = get_logger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+TAXONOMY_PATH = DATA_DIR / "skill_taxonomy.tsv"
+COMPILED_SUFFIX = ".pkl"
+COMPILED_FORMAT = 3
+
+
+def skill_key(skill: str) -> str:
+    """Lowercase a skill name and collapse underscores and whitespace."""
+    return " ".join(skill.lower().replace("_", " ").split())
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class SkillTaxonomy:
+    """Alias -> canonical skill lookups and skill extraction from text."""
+
+    def __init__(self, aliases: Dict[str, str]):
+        self.aliases = aliases
+        self._matcher: Optional[AliasMatcher] = None
+
+    def __len__(self) -> int:
+        return len(self.aliases)
+
+    def __contains__(self, skill: str) -> bool:
+        return skill_key(skill) in self.aliases
+
+    @property
+    def canonical_skills(self) -> Set[str]:
+        return set(self.aliases.values())
+
+    @property
+    def matcher(self) -> AliasMatcher:
+        # Built on first use; normalization alone never needs it
+        if self._matcher is None:
+            self._matcher = AliasMatcher(self.aliases)
+        return self._matcher
+
+    def resolve(self, skill: str) -> Optional[str]:
+        """Canonical name for a known skill or alias, otherwise None."""
+        return self.aliases.get(skill_key(skill))
+
+    def normalize(self, skill: str) -> str:
+        """Canonical name for known skills; unknown skills are only cleaned up."""
+        key = skill_key(skill)
+        return self.aliases.get(key, key)
+
+    def extract(self, text: str) -> List[str]:
+        """Sorted canonical skills mentioned anywhere in ``text``."""
+        return sorted({self.aliases[alias] for alias in self.matcher.find_all(text)})
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[List[str]]) -> "SkillTaxonomy":
+        """Build from ``[canonical, alias, ...]`` rows; the first row claiming an alias wins."""
+        aliases: Dict[str, str] = {}
+        for row in rows:
+            names = [skill_key(name) for name in row if name.strip()]
+            if not names:
+                continue
+            canonical = names[0]
+            for name in names:
+                aliases.setdefault(name, canonical)
+        return cls(aliases)
+
+    @classmethod
+    def from_tsv(cls, path: Path) -> "SkillTaxonomy":
+        with path.open(encoding="utf-8") as handle:
+            rows = [line.rstrip("\n").split("\t") for line in handle if line.strip() and not line.startswith("#")]
+        return cls.from_rows(rows)
+
+    def dump(self, path: Path, source_digest: str) -> None:
+        """Pickle the alias map."""
+        payload = {
+            "format": COMPILED_FORMAT,
+            "source_digest": source_digest,
+            "aliases": self.aliases,
+        }
+        with path.open("wb") as handle:
+            pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: Path, source_digest: Optional[str] = None) -> Optional["SkillTaxonomy"]:
+        """Load a pickled taxonomy; None if it is missing, unreadable or stale."""
+        try:
+            with path.open("rb") as handle:
+                payload = pickle.load(handle)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if payload.get("format") != COMPILED_FORMAT:
+            return None
+        if source_digest is not None and payload.get("source_digest") != source_digest:
+            return None
+        return cls(payload["aliases"])
+
+
+def compiled_path(source: Path) -> Path:
+    return source.with_suffix(COMPILED_SUFFIX)
+
+
+def load_skill_taxonomy(source: Path = TAXONOMY_PATH) -> SkillTaxonomy:
+    """Load the taxonomy, preferring an up-to-date compiled pickle."""
+    compiled = SkillTaxonomy.load(compiled_path(source), source_digest=file_digest(source))
+    if compiled is not None:
+        return compiled
+    logger.info("Compiled skill taxonomy missing or stale; loading %s", source)
+    return SkillTaxonomy.from_tsv(source)
+
+
+@lru_cache(maxsize=1)
+def get_skill_taxonomy() -> SkillTaxonomy:
+    source = Path(settings.SKILL_TAXONOMY_PATH) if settings.SKILL_TAXONOMY_PATH else TAXONOMY_PATH
+    return load_skill_taxonomy(source)
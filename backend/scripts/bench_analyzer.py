@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Index size and ranking latency with and without the token analyzer.
+
+Builds a synthetic corpus of job postings, then compares plain ``tokenize``
+output against the analyzer chain (stopwords, stemming, skill bigrams):
+tokens per document, vocabulary size and posting count in the profile
+index, BM25 search latency in the profile index, and ``rank_jobs``-style
+BM25 latency over per-job token lists.
+
+Usage:
+    python scripts/bench_analyzer.py
+    python scripts/bench_analyzer.py --docs 50000 --queries 200
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, List, Sequence
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from bench_normalization import make_docs
+
+from app.services.analyzer import Analyzer
+from app.services.normalization import analyze_text, normalize_title
+from app.services.profile_index import ProfileIndex
+from app.services.scoring import _bm25, _compute_idf
+
+QUERIES = [
+    "senior python engineer with fastapi and mongodb",
+    "machine learning engineer building recommendation systems",
+    "frontend developer react typescript",
+    "devops lead kubernetes docker ci/cd pipelines",
+    "data scientist with nlp experience",
+]
+
+
+def corpus_tokens(docs, analyzer) -> List[List[str]]:
+    return [
+        analyze_text(normalize_title(title), description, skills, location, analyzer=analyzer).tokens
+        for title, description, skills, location in docs
+    ]
+
+
+def query_tokens(analyzer) -> List[List[str]]:
+    return [analyze_text(query, analyzer=analyzer).tokens for query in QUERIES]
+
+
+def latency_ms(func: Callable[[Sequence[str]], object], queries: List[List[str]], rounds: int) -> float:
+    timings = []
+    for index in range(rounds):
+        start = time.perf_counter()
+        func(queries[index % len(queries)])
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def measure(label: str, docs, analyzer, query_rounds: int, rank_docs: int) -> dict:
+    tokens = corpus_tokens(docs, analyzer)
+    queries = query_tokens(analyzer)
+
+    index = ProfileIndex()
+    index.rebuild([(str(row), doc_tokens, None) for row, doc_tokens in enumerate(tokens)])
+    postings = sum(len(posting.rows) for posting in index._postings.values())
+    search_ms = latency_ms(
+        lambda query: index.search(query, None, limit=20, bm25_weight=1.0, vector_weight=0.0),
+        queries,
+        query_rounds,
+    )
+
+    rank_tokens = tokens[:rank_docs]
+    idf = _compute_idf(rank_tokens)
+    rank_ms = latency_ms(lambda query: _bm25(query, rank_tokens, idf), queries, max(10, query_rounds // 4))
+
+    return {
+        "label": label,
+        "tokens_per_doc": sum(map(len, tokens)) / len(tokens),
+        "vocabulary": len(index._postings),
+        "postings": postings,
+        "search_ms": search_ms,
+        "rank_ms": rank_ms,
+    }
+
+
+def main(doc_count: int, query_rounds: int, rank_docs: int) -> None:
+    docs = make_docs(doc_count)
+    plain = measure("tokenize only", docs, None, query_rounds, rank_docs)
+    analyzed = measure("analyzer chain", docs, Analyzer(), query_rounds, rank_docs)
+
+    print(f"📊 {doc_count} job postings; rank_jobs BM25 over {min(rank_docs, doc_count)} jobs")
+    print(f"  {'':16} {'tokens/doc':>10} {'vocab':>8} {'postings':>10} {'search ms':>10} {'rank ms':>9}")
+    for row in (plain, analyzed):
+        print(
+            f"  {row['label']:16} {row['tokens_per_doc']:10.1f} {row['vocabulary']:8d} "
+            f"{row['postings']:10d} {row['search_ms']:10.2f} {row['rank_ms']:9.2f}"
+        )
+    print(f"  postings: {analyzed['postings'] / plain['postings']:.0%} of plain, "
+          f"rank_jobs BM25: {plain['rank_ms'] / analyzed['rank_ms']:.2f}x faster")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=100, help="Search rounds per configuration")
+    parser.add_argument("--rank-docs", type=int, default=2000, help="Jobs scored per rank_jobs BM25 call")
+    args = parser.parse_args()
+    main(args.docs, args.queries, args.rank_docs)
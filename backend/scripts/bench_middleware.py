@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Per-request overhead of the observability middleware stack.
+
+Serves a small JSON endpoint through three configurations and drives it
+concurrently in-process with httpx's ASGI transport:
+
+- no middleware (baseline)
+- the previous stack: logging, metrics and performance middleware as
+  three ``BaseHTTPMiddleware`` subclasses
+- ``ObservabilityMiddleware``, the single pure ASGI layer
+
+and reports the added time per request over the baseline.
+
+Usage:
+    python scripts/bench_middleware.py
+    python scripts/bench_middleware.py --requests 20000 --concurrency 100
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.middleware import ObservabilityMiddleware, _log_error, _log_request
+from app.middleware.performance import latency_tracker, record_request
+from app.services.logging import clear_correlation_id, set_correlation_id
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        correlation_id = set_correlation_id(request.headers.get("X-Correlation-ID"))
+        start_time = time.time()
+        try:
+            response = await call_next(request)
+            _log_request(request.scope, response.status_code, time.time() - start_time, correlation_id)
+            response.headers["X-Correlation-ID"] = correlation_id
+            return response
+        except Exception as e:
+            _log_error(request.scope, e)
+            raise
+        finally:
+            clear_correlation_id()
+
+
+class LegacyMetricsMiddleware(BaseHTTPMiddleware):
+    request_count = 0
+    error_count = 0
+
+    async def dispatch(self, request: Request, call_next):
+        self.request_count += 1
+        start_time = time.time()
+        response = await call_next(request)
+        if response.status_code >= 400:
+            self.error_count += 1
+        response.headers["X-Response-Time"] = f"{time.time() - start_time:.4f}"
+        return response
+
+
+class LegacyPerformanceMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            record_request(request.scope, (time.time() - start_time) * 1000, status_code)
+
+
+def make_app(middleware) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/jobs/{job_id}")
+    async def get_job(job_id: str):
+        return {"id": job_id, "title": "Backend Engineer", "skills": ["python", "fastapi"]}
+
+    for middleware_class in middleware:
+        app.add_middleware(middleware_class)
+    return app
+
+
+async def drive(app: FastAPI, requests: int, concurrency: int) -> float:
+    """Seconds to serve ``requests`` requests with ``concurrency`` in flight."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(index: int):
+            async with semaphore:
+                response = await client.get(f"/api/v1/jobs/{index:024x}")
+                response.raise_for_status()
+
+        await asyncio.gather(*(one(index) for index in range(min(200, requests))))  # warm up
+        start = time.perf_counter()
+        await asyncio.gather(*(one(index) for index in range(requests)))
+        return time.perf_counter() - start
+
+
+async def main(requests: int, concurrency: int, rounds: int) -> None:
+    # Error responses are the only ones logged; keep stdout quiet regardless
+    logging.getLogger("job_portal").setLevel(logging.CRITICAL)
+    configurations = [
+        ("no middleware", []),
+        ("BaseHTTPMiddleware x3", [LegacyPerformanceMiddleware, LegacyMetricsMiddleware, LegacyLoggingMiddleware]),
+        ("ObservabilityMiddleware", [ObservabilityMiddleware]),
+    ]
+    timings = {}
+    for label, middleware in configurations:
+        app = make_app(middleware)
+        timings[label] = min([await drive(app, requests, concurrency) for _ in range(rounds)])
+        latency_tracker.clear()
+
+    baseline = timings["no middleware"]
+    print(f"📊 {requests} requests, {concurrency} concurrent, best of {rounds}")
+    for label, elapsed in timings.items():
+        overhead = (elapsed - baseline) / requests * 1e6
+        print(f"  - {label:24} {requests / elapsed:8.0f} req/s   {overhead:7.1f} µs/request overhead")
+    legacy = timings["BaseHTTPMiddleware x3"] - baseline
+    pure = timings["ObservabilityMiddleware"] - baseline
+    if pure > 0:
+        print(f"  - overhead reduction:      {legacy / pure:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.rounds))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for job text normalization and tokenization.
+
+Compares the previous multi-pass pipeline (``re.sub``/``re.findall`` with
+string patterns, then a separate tokenize pass) against ``analyze_text``
+on synthetic job postings, and checks both produce the same output.
+
+Usage:
+    python scripts/bench_normalization.py
+    python scripts/bench_normalization.py --docs 5000 --repeat 5
+"""
+import argparse
+import random
+import re
+import time
+from typing import List, Tuple
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.normalization import analyze_text, normalize_title
+
+TITLES = ["Senior  Python Engineer", "Data Scientist", "Frontend Developer (React)", "DevOps / SRE Lead"]
+SENTENCES = [
+    "Build and operate FastAPI services backed by MongoDB and Redis.",
+    "Own CI/CD pipelines with Docker, Kubernetes and GitHub Actions.",
+    "Partner with product   and design to ship features weekly.\n",
+    "Experience with machine learning, NLP or recommendation systems is a plus.",
+    "Competitive salary, 401(k) match and remote-first culture.\t",
+]
+SKILLS = ["python", "fastapi", "mongodb", "docker", "kubernetes", "react", "typescript", "sql"]
+LOCATIONS = ["Austin, TX", "Remote", "New York, NY", "Seattle, WA", None]
+
+
+def legacy_analyze(title: str, description: str, skills: str, location: str) -> Tuple[str, List[str]]:
+    """The pipeline before analyze_text: one regex pass per step."""
+    parts = [re.sub(r"\s+", " ", title.strip().lower()), description.strip(), skills]
+    if location:
+        parts.append(location)
+    joined = " ".join(part.strip() for part in parts if part and part.strip())
+    text = re.sub(r"\s+", " ", joined).strip()
+    return text, re.findall(r"[a-z0-9]+", text.lower())
+
+
+def make_docs(count: int, seed: int = 7) -> List[Tuple[str, str, str, str]]:
+    rng = random.Random(seed)
+    return [
+        (
+            rng.choice(TITLES),
+            " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(8, 30))),
+            " ".join(rng.sample(SKILLS, 4)),
+            rng.choice(LOCATIONS) or "",
+        )
+        for _ in range(count)
+    ]
+
+
+def best_of(repeat: int, func, docs) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc in docs:
+            func(*doc)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def fused_analyze(title: str, description: str, skills: str, location: str):
+    return analyze_text(normalize_title(title), description, skills, location)
+
+
+def main(doc_count: int, repeat: int) -> None:
+    docs = make_docs(doc_count)
+    for doc in docs:
+        assert tuple(fused_analyze(*doc)) == legacy_analyze(*doc), doc
+
+    legacy = best_of(repeat, legacy_analyze, docs)
+    fused = best_of(repeat, fused_analyze, docs)
+    print(f"📊 {doc_count} job postings, best of {repeat}")
+    print(f"  - legacy multi-pass: {legacy * 1e6 / doc_count:8.1f} µs/doc")
+    print(f"  - analyze_text:      {fused * 1e6 / doc_count:8.1f} µs/doc")
+    print(f"  - speedup:           {legacy / fused:8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.docs, args.repeat)
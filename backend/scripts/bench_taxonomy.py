@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark skill taxonomy startup on a large synthetic taxonomy.
+
+Writes a TSV with ``--aliases`` aliases, compiles it with
+``build_skill_taxonomy``'s pickle format and times what a fresh worker
+pays before it can extract skills: loading the pickle and building the
+``AliasMatcher``. For comparison it also times the trie build and
+``re.compile`` of the equivalent ``KeywordMatcher`` pattern, which is what
+startup used to cost, and checks both matchers extract the same skills.
+
+Usage:
+    python scripts/bench_taxonomy.py
+    python scripts/bench_taxonomy.py --aliases 100000 --repeat 5
+"""
+import argparse
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path for imports
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.keyword_matcher import KeywordMatcher
+from app.services.taxonomy import SkillTaxonomy, compiled_path, file_digest
+
+SUFFIXES = ["", ".js", " framework", "-cli", " db", "#", "++"]
+FILLER = ["built", "services", "with", "and", "led", "a", "team", "using", "Also,", "experience."]
+
+
+def write_taxonomy(path: Path, alias_count: int, seed: int = 7) -> List[str]:
+    """Write a TSV of skills with three aliases each; returns every alias."""
+    rng = random.Random(seed)
+    aliases = []
+    with path.open("w", encoding="utf-8") as handle:
+        for number in range(alias_count // 3):
+            row = [f"skill{number}{rng.choice(SUFFIXES)}", f"s{number}", f"sk {number}"]
+            aliases.extend(row)
+            handle.write("\t".join(row) + "\n")
+    return aliases
+
+
+def make_resume(aliases: List[str], rng: random.Random, words: int = 1500) -> str:
+    return " ".join(rng.choice(aliases) if rng.random() < 0.1 else rng.choice(FILLER) for _ in range(words))
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(alias_count: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        source = Path(workdir) / "skills.tsv"
+        aliases = write_taxonomy(source, alias_count)
+        compiled = compiled_path(source)
+        SkillTaxonomy.from_tsv(source).dump(compiled, source_digest=file_digest(source))
+
+        load = best_of(repeat, lambda: SkillTaxonomy.load(compiled).matcher)
+        taxonomy = SkillTaxonomy.load(compiled)
+        trie_build = best_of(1, lambda: KeywordMatcher(taxonomy.aliases))
+        pattern = KeywordMatcher(taxonomy.aliases).pattern.pattern
+
+        def cold_compile():
+            re.purge()
+            re.compile(pattern)
+
+        compile_seconds = best_of(repeat, cold_compile)
+
+        rng = random.Random(11)
+        resumes = [make_resume(aliases, rng) for _ in range(50)]
+        regex_matcher = KeywordMatcher(taxonomy.aliases, pattern=pattern)
+        for resume in resumes:
+            assert taxonomy.matcher.find_all(resume) == regex_matcher.find_all(resume)
+        alias_scan = best_of(repeat, lambda: [taxonomy.matcher.find_all(resume) for resume in resumes])
+        regex_scan = best_of(repeat, lambda: [regex_matcher.find_all(resume) for resume in resumes])
+
+    print(f"📊 {len(taxonomy)} aliases, best of {repeat}")
+    print(f"  - load pickle + AliasMatcher: {load * 1000:8.1f} ms")
+    print(f"  - trie build (no pickle):     {trie_build * 1000:8.1f} ms")
+    print(f"  - re.compile of trie pattern: {compile_seconds * 1000:8.1f} ms")
+    print(f"  - extract, AliasMatcher:      {alias_scan * 1000 / len(resumes):8.2f} ms/resume")
+    print(f"  - extract, KeywordMatcher:    {regex_scan * 1000 / len(resumes):8.2f} ms/resume")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--aliases", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.aliases, args.repeat)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Compile the skill taxonomy TSV into the pickle loaded at startup.
+
+The pickle holds the alias -> canonical map, so the API and parse workers
+skip TSV parsing; the skill matcher is built from the map directly. It
+records the TSV's SHA-256 and is ignored once the TSV changes, so
+forgetting to rerun this script only costs startup time.
+
+Usage:
+    python scripts/build_skill_taxonomy.py
+    python scripts/build_skill_taxonomy.py --source /path/to/taxonomy.tsv
+"""
+import argparse
+import time
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.taxonomy import TAXONOMY_PATH, SkillTaxonomy, compiled_path, file_digest
+
+
+def build_skill_taxonomy(source: Path, output: Path) -> None:
+    started = time.perf_counter()
+    taxonomy = SkillTaxonomy.from_tsv(source)
+    taxonomy.dump(output, source_digest=file_digest(source))
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    SkillTaxonomy.load(output).matcher
+    load_seconds = time.perf_counter() - started
+
+    print(f"✅ Compiled {len(taxonomy.canonical_skills)} skills / {len(taxonomy)} aliases")
+    print(f"   {source} -> {output}")
+    print(f"   build {build_seconds * 1000:.1f} ms, load {load_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", type=Path, default=TAXONOMY_PATH, help="Taxonomy TSV")
+    parser.add_argument("--output", type=Path, default=None, help="Pickle path (defaults to the TSV path with .pkl)")
+    args = parser.parse_args()
+    build_skill_taxonomy(args.source, args.output or compiled_path(args.source))
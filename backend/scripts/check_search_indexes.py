@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Index advisor benchmark for the job search endpoint.
+
+Replays the common search filter combinations against a local MongoDB,
+prints the winning plan and the ESR-ordered index proposed for each one,
+and exits non-zero if any of them falls back to a collection scan.
+
+Usage:
+    python scripts/check_search_indexes.py
+"""
+import asyncio
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.models.job import Job
+from app.services.index_advisor import (
+    audit_search_indexes,
+    collscan_scenarios,
+    is_index_covered,
+    recommended_indexes,
+)
+
+
+async def check_search_indexes() -> int:
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    try:
+        # init_beanie creates the indexes declared on Job.Settings
+        await init_beanie(database=client[settings.DATABASE_NAME], document_models=[Job])
+
+        results = await audit_search_indexes(Job.get_motor_collection())
+
+        print("🔍 Search query plans:")
+        for result in results:
+            status = "❌ COLLSCAN" if result.uses_collscan else "✅"
+            print(f"  {status} {result.scenario}: {result.shape.describe()}")
+            print(f"      plan: {' <- '.join(result.winning_stages)}")
+            print(f"      proposed index: {result.proposed_index}")
+
+        declared = Job.Settings.indexes
+        missing = [keys for keys in recommended_indexes() if not is_index_covered(keys, declared)]
+        if missing:
+            print("\n⚠️  Recommended indexes not declared on Job.Settings.indexes:")
+            for keys in missing:
+                print(f"  - {keys}")
+
+        failures = collscan_scenarios(results)
+        if failures:
+            print(f"\n❌ {len(failures)} search shape(s) scan the whole collection: {', '.join(failures)}")
+            return 1
+
+        print(f"\n🎉 All {len(results)} search shapes use an index")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(check_search_indexes()))
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Bulk resume import for staffing agency and employer onboarding.
+
+Reads PDF/DOCX resumes from a directory (searched recursively) or a zip
+archive, parses them in a process pool with the same parser as uploads,
+and inserts Profile documents in batches with batched embeddings. Each
+imported candidate gets a placeholder user id derived from the resume's
+content hash, so importing the same file twice never duplicates a profile.
+
+Progress is checkpointed to a JSON-lines state file after every batch.
+Rerunning the same command skips resumes that were already imported and
+retries the ones that failed.
+
+Usage:
+    python scripts/ingest_resumes.py /path/to/resumes
+    python scripts/ingest_resumes.py agency_export.zip --workers 8 --batch-size 200
+    python scripts/ingest_resumes.py agency_export.zip --dry-run
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+# Add parent directory to path for imports
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.models.profile import Profile
+from app.services.embedding import embed_texts
+from app.services.indexer import build_profile_text
+from app.services.parsing import SUPPORTED_EXTENSIONS, ParsedResume, ResumeParsingError, parse_resume
+
+IMPORT_PREFIX = "import"
+
+
+@dataclass
+class ResumeFile:
+    name: str  # Path inside the source directory or archive
+    size: int
+    read: Callable[[], bytes]
+
+
+@dataclass
+class ParsedFile:
+    name: str
+    sha256: str
+    path: Path
+    parsed: ParsedResume
+
+
+@dataclass
+class IngestStats:
+    seen: int = 0
+    imported: int = 0
+    skipped: int = 0
+    failures: Counter = field(default_factory=Counter)
+    failed_files: List[Tuple[str, str]] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def failed(self) -> int:
+        return sum(self.failures.values())
+
+    def fail(self, name: str, error: str) -> None:
+        self.failures[error] += 1
+        self.failed_files.append((name, error))
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return (self.imported + self.failed) / elapsed if elapsed else 0.0
+
+
+class IngestState:
+    """Append-only checkpoint of processed resumes, keyed by content hash."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.imported: Set[str] = set()
+        if path.exists():
+            with path.open(encoding="utf-8") as handle:
+                for line in handle:
+                    entry = json.loads(line)
+                    if entry["status"] == "imported":
+                        self.imported.add(entry["sha256"])
+
+    def record(self, entries: List[Dict[str, str]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            for entry in entries:
+                handle.write(json.dumps(entry) + "\n")
+                if entry["status"] == "imported":
+                    self.imported.add(entry["sha256"])
+
+
+def iter_resume_files(source: Path) -> Iterator[ResumeFile]:
+    """Yield supported resumes from a directory tree or a zip archive."""
+    if source.is_dir():
+        for path in sorted(source.rglob("*")):
+            if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS:
+                yield ResumeFile(str(path.relative_to(source)), path.stat().st_size, path.read_bytes)
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and Path(info.filename).suffix.lower() in SUPPORTED_EXTENSIONS:
+                    yield ResumeFile(info.filename, info.file_size, partial(archive.read, info))
+    else:
+        raise SystemExit(f"❌ {source} is not a directory or zip archive")
+
+
+def imported_user_id(sha256: str) -> str:
+    return f"{IMPORT_PREFIX}-{sha256[:24]}"
+
+
+async def insert_profiles(batch: List[ParsedFile]) -> int:
+    """Insert profiles for a batch of parsed resumes, skipping ones already stored."""
+    user_ids = [imported_user_id(item.sha256) for item in batch]
+    existing = {profile.user_id for profile in await Profile.find({"user_id": {"$in": user_ids}}).to_list()}
+    now = datetime.utcnow()
+    profiles = [
+        Profile(
+            user_id=user_id,
+            skills=item.parsed.skills,
+            titles=item.parsed.titles,
+            raw_text=item.parsed.raw_text,
+            resume_path=str(item.path),
+            parsed_at=now,
+        )
+        for user_id, item in zip(user_ids, batch)
+        if user_id not in existing
+    ]
+    embeddings = embed_texts([build_profile_text(profile) for profile in profiles])
+    for profile, embedding in zip(profiles, embeddings):
+        profile.profile_embedding = embedding
+    if profiles:
+        await Profile.insert_many(profiles)
+    return len(profiles)
+
+
+async def ingest_resumes(
+    source: Path,
+    state_path: Path,
+    workers: int,
+    batch_size: int,
+    dry_run: bool = False,
+) -> IngestStats:
+    state = IngestState(state_path)
+    stats = IngestStats()
+    storage_dir = Path(tempfile.mkdtemp(prefix="resume-import-")) if dry_run else Path(settings.resume_storage_dir)
+    storage_dir.mkdir(parents=True, exist_ok=True)
+    loop = asyncio.get_running_loop()
+    queued: Set[str] = set()
+    pending: Dict[asyncio.Future, Tuple[str, str, Path]] = {}
+    batch: List[ParsedFile] = []
+    failed_entries: List[Dict[str, str]] = []
+
+    async def flush() -> None:
+        if not batch and not failed_entries:
+            return
+        if batch and not dry_run:
+            await insert_profiles(batch)
+        stats.imported += len(batch)
+        if not dry_run:
+            state.record(
+                [{"sha256": item.sha256, "name": item.name, "status": "imported"} for item in batch]
+                + failed_entries
+            )
+        batch.clear()
+        failed_entries.clear()
+        print(
+            f"✅ {stats.imported} imported, {stats.failed} failed, {stats.skipped} skipped "
+            f"({stats.rate():.1f} resumes/s)"
+        )
+
+    async def harvest(return_when: str) -> None:
+        done, _ = await asyncio.wait(pending, return_when=return_when)
+        for future in done:
+            name, sha256, path = pending.pop(future)
+            try:
+                batch.append(ParsedFile(name, sha256, path, future.result()))
+            except ResumeParsingError as exc:
+                stats.fail(name, str(exc))
+                failed_entries.append({"sha256": sha256, "name": name, "status": "failed", "error": str(exc)})
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+                stats.fail(name, type(exc).__name__)
+                failed_entries.append({"sha256": sha256, "name": name, "status": "failed", "error": error})
+        if len(batch) + len(failed_entries) >= batch_size:
+            await flush()
+
+    try:
+        with ProcessPoolExecutor(workers) as executor:
+            for resume in iter_resume_files(source):
+                stats.seen += 1
+                if resume.size > settings.MAX_UPLOAD_SIZE:
+                    stats.fail(resume.name, "File too large")
+                    continue
+                data = resume.read()
+                sha256 = hashlib.sha256(data).hexdigest()
+                if sha256 in state.imported or sha256 in queued:
+                    stats.skipped += 1
+                    continue
+                queued.add(sha256)
+
+                path = storage_dir / f"{IMPORT_PREFIX}_{sha256}{Path(resume.name).suffix.lower()}"
+                if not path.exists():
+                    path.write_bytes(data)
+                future = loop.run_in_executor(executor, parse_resume, path)
+                pending[future] = (resume.name, sha256, path)
+
+                # Bound memory: only a few files per worker are read ahead
+                if len(pending) >= workers * 4:
+                    await harvest(asyncio.FIRST_COMPLETED)
+
+            if pending:
+                await harvest(asyncio.ALL_COMPLETED)
+            await flush()
+    finally:
+        if dry_run:
+            shutil.rmtree(storage_dir, ignore_errors=True)
+    return stats
+
+
+def print_summary(stats: IngestStats, dry_run: bool) -> None:
+    elapsed = time.perf_counter() - stats.started
+    print(f"\n🎉 {'Parsed' if dry_run else 'Imported'} {stats.imported} of {stats.seen} resumes in {elapsed:.1f}s")
+    print(f"  - Throughput: {stats.rate():.1f} resumes/s")
+    print(f"  - Skipped (already imported or duplicate): {stats.skipped}")
+    print(f"  - Failed: {stats.failed}")
+    for error, count in stats.failures.most_common():
+        print(f"      {count:>6}  {error}")
+    for name, error in stats.failed_files[:20]:
+        print(f"      ⚠️  {name}: {error}")
+    if len(stats.failed_files) > 20:
+        print(f"      ... and {len(stats.failed_files) - 20} more (see the state file)")
+
+
+async def main(args: argparse.Namespace) -> int:
+    state_path = args.state or args.source.with_name(f"{args.source.name}.ingest.jsonl")
+    client: Optional[AsyncIOMotorClient] = None
+    if not args.dry_run:
+        client = AsyncIOMotorClient(settings.MONGODB_URL)
+        await init_beanie(database=client[settings.DATABASE_NAME], document_models=[Profile])
+    try:
+        print(f"📥 Importing resumes from {args.source} with {args.workers} workers")
+        stats = await ingest_resumes(args.source, state_path, args.workers, args.batch_size, args.dry_run)
+        print_summary(stats, args.dry_run)
+        if not args.dry_run:
+            print(f"\n💾 Progress saved to {state_path}; rerun the same command to resume")
+    finally:
+        if client is not None:
+            client.close()
+    return 1 if stats.failed and not stats.imported else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", type=Path, help="Directory or zip archive of PDF/DOCX resumes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Parsing processes")
+    parser.add_argument("--batch-size", type=int, default=100, help="Profiles inserted per batch")
+    parser.add_argument("--state", type=Path, default=None, help="Checkpoint file (defaults to <source>.ingest.jsonl)")
+    parser.add_argument("--dry-run", action="store_true", help="Parse and report without writing to the database")
+    sys.exit(asyncio.run(main(parser.parse_args())))
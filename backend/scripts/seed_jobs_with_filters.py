@@ -30,6 +30,7 @@ from app.models.job import (
     JobStatus
 )
 from app.core.config import settings
+from app.services.geo import assign_job_coordinates
 
 
 # Sample data for generating realistic jobs
@@ -270,6 +271,7 @@ async def create_sample_jobs():
                 created_at=datetime.utcnow(),
                 updated_at=datetime.utcnow(),
             )
+            assign_job_coordinates(job)
             
             await job.insert()
             jobs_created += 1
@@ -0,0 +1,78 @@
+"""
+Tests for the BM25 token analyzer chain.
+"""
+from app.services.analyzer import Analyzer, stem
+from app.services.normalization import tokenize
+from app.services.taxonomy import SkillTaxonomy
+
+
+def _analyzer(**kwargs):
+    taxonomy = SkillTaxonomy.from_rows([
+        ["machine learning", "ml"],
+        ["pandas"],
+        ["kubernetes", "k8s"],
+        ["gcp", "google cloud"],
+    ])
+    return Analyzer(taxonomy=taxonomy, **kwargs)
+
+
+class TestStem:
+    def test_plurals_and_ing(self):
+        """Test the light stemmer rules."""
+        assert stem("engineers") == "engineer"
+        assert stem("engineering") == "engineer"
+        assert stem("libraries") == "library"
+        assert stem("services") == "service"
+        assert stem("programming") == "program"
+        assert stem("processing") == "process"
+        assert stem("status") == "status"
+        assert stem("class") == "class"
+
+    def test_sses_and_is_endings(self):
+        """Test that singular and plural forms of -ss and -is words share a stem."""
+        assert stem("classes") == stem("class") == "class"
+        assert stem("processes") == stem("process") == "process"
+        assert stem("addresses") == "address"
+        assert stem("analyses") == stem("analysis") == "analysis"
+        assert stem("basis") == "basis"
+        assert stem("databases") == "database"
+        assert stem("apis") == "api"
+
+    def test_short_words_are_kept(self):
+        """Test that stems shorter than four letters are not produced."""
+        assert stem("string") == "string"
+        assert stem("aws") == "aws"
+        assert stem("something") == "something"
+
+
+class TestAnalyzer:
+    def test_full_chain(self):
+        """Test stopwords, stemming and skill bigrams together."""
+        tokens = tokenize("Building the machine learning platforms with Pandas on Google Cloud")
+
+        assert _analyzer().analyze(tokens) == [
+            "build", "machine_learning", "machine", "learn", "platform", "pandas", "gcp", "google", "cloud",
+        ]
+
+    def test_chain_is_configurable(self):
+        """Test disabling each stage."""
+        tokens = tokenize("The engineers and machine learning")
+
+        assert _analyzer(stopwords=False, stemming=False, skill_bigrams=False).analyze(tokens) == tokens
+        assert _analyzer(stemming=False, skill_bigrams=False).analyze(tokens) == [
+            "engineers", "machine", "learning",
+        ]
+
+    def test_signature_reflects_configuration(self):
+        """Test that differently configured analyzers have different signatures."""
+        assert _analyzer().signature != _analyzer(stemming=False).signature
+        assert _analyzer(stopwords=False, stemming=False, skill_bigrams=False).signature.endswith(":plain")
+
+    def test_stopwords_shrink_token_lists(self):
+        """Test that typical description text loses its filler words."""
+        tokens = tokenize("You will work with the team to design and build APIs for our customers")
+
+        analyzed = _analyzer().analyze(tokens)
+
+        assert analyzed == ["work", "team", "design", "build", "api", "customer"]
+        assert len(analyzed) < len(tokens) / 2
@@ -0,0 +1,261 @@
+"""
+Tests for durable metrics event stores.
+"""
+import os
+import time
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+from app.schemas.events import EventType
+from app.services.event_store import EventStore, MongoEventStore, SegmentedFileEventStore
+from app.services.metrics import DAY, MINUTE, MetricsService
+
+pytestmark = pytest.mark.asyncio
+
+
+def _view(actor_id, timestamp=None):
+    return {
+        "event_type": EventType.RECOMMENDATION_VIEW,
+        "timestamp": (timestamp or datetime.utcnow()).isoformat(),
+        "actor_id": actor_id,
+    }
+
+
+class TestSegmentedFileEventStore:
+    async def test_workers_read_each_others_events(self, tmp_path):
+        """Test that each writer sees events appended by the other writers only."""
+        first = SegmentedFileEventStore(tmp_path, writer_id="worker-a")
+        second = SegmentedFileEventStore(tmp_path, writer_id="worker-b")
+
+        first.append(_view("user_1"))
+        first.append(_view("user_2"))
+        await first.flush()
+
+        events = await second.read_new()
+        assert [event["actor_id"] for event in events] == ["user_1", "user_2"]
+        assert events[0]["event_type"] == EventType.RECOMMENDATION_VIEW.value
+        assert await second.read_new() == []
+        assert await first.read_new() == []
+
+    async def test_partial_line_is_left_for_next_read(self, tmp_path):
+        """Test that a line still being written is not parsed early."""
+        reader = SegmentedFileEventStore(tmp_path, writer_id="reader")
+        segment = tmp_path / "writer-000001.jsonl"
+        segment.write_text('{"actor_id": "user_1"}\n{"actor_id": "us')
+
+        assert [event["actor_id"] for event in await reader.read_new()] == ["user_1"]
+
+        with segment.open("a") as handle:
+            handle.write('er_2"}\n')
+        assert [event["actor_id"] for event in await reader.read_new()] == ["user_2"]
+
+    async def test_segments_rotate_and_expire(self, tmp_path):
+        """Test size-based rotation and retention by last write."""
+        store = SegmentedFileEventStore(tmp_path, segment_max_bytes=200, writer_id="worker-a")
+        for index in range(10):
+            store.append(_view(f"user_{index}"))
+        await store.close()
+
+        segments = sorted(tmp_path.glob("*.jsonl"))
+        assert len(segments) > 1
+        old = time.time() - 3 * 86400
+        os.utime(segments[0], (old, old))
+
+        removed = await store.prune(datetime.utcnow() - timedelta(days=1))
+
+        assert removed == 1
+        assert len(list(tmp_path.glob("*.jsonl"))) == len(segments) - 1
+
+
+class TestMetricsServiceBackend:
+    async def test_kpis_cover_all_workers(self, tmp_path):
+        """Test that a worker's KPIs include events recorded by another worker."""
+        first = MetricsService(backend=SegmentedFileEventStore(tmp_path, writer_id="worker-a"))
+        second = MetricsService(backend=SegmentedFileEventStore(tmp_path, writer_id="worker-b"))
+
+        first.add_event(_view("user_1"))
+        second.add_event(_view("user_2"))
+        await first.sync()
+        await second.sync()
+        await first.sync()
+
+        assert first.get_kpis().recommendation_views == 2
+        assert second.get_kpis().unique_users == 2
+
+    async def test_restart_replays_retained_events(self, tmp_path):
+        """Test that a new process rebuilds its rollups from disk."""
+        before = MetricsService(backend=SegmentedFileEventStore(tmp_path))
+        before.add_event(_view("user_1"))
+        await before.stop()
+
+        after = MetricsService(backend=SegmentedFileEventStore(tmp_path))
+        await after.load()
+
+        assert after.get_kpis().recommendation_views == 1
+
+    async def test_memory_is_bounded(self):
+        """Test raw event eviction and retention pruning of the rollups."""
+        service = MetricsService(max_events=5, retention=timedelta(days=7))
+        now = datetime.utcnow()
+        for day in range(10):
+            service.add_event(_view(f"user_{day}", now - timedelta(days=day)))
+
+        assert len(service.event_store) == 5
+        await service.prune(now)
+
+        # Days 0-7 are inside the window; the event at the cutoff is kept
+        assert service.get_kpis(start_date=now - timedelta(days=30)).recommendation_views == 8
+        assert len(service._rollups[DAY]) == 8
+
+    async def test_minute_rollups_expire_first(self):
+        """Test that old windows fall back to hour buckets once minutes are pruned."""
+        service = MetricsService(retention=timedelta(days=7), minute_retention=timedelta(hours=2))
+        now = datetime(2024, 1, 10, 12, 0)
+        old = datetime(2024, 1, 9, 8, 30)
+        for minute in range(30):
+            service.add_event(_view("user_1", old + timedelta(minutes=minute)))
+        service.add_event(_view("user_2", now - timedelta(minutes=5)))
+
+        await service.prune(now)
+
+        assert len(service._rollups[MINUTE]) == 1  # Only the recent event's minute
+        # 08:40-08:50 widens to the 08:00-09:00 hour
+        kpis = service.get_kpis(start_date=old + timedelta(minutes=10), end_date=old + timedelta(minutes=20))
+        assert kpis.recommendation_views == 30
+        series = service.get_time_series("views", start_date=old, end_date=now, bucket_size=timedelta(hours=1))
+        assert series[0].value == 30
+        assert sum(point.value for point in series) == 31
+
+
+class _MongomockEventStore(MongoEventStore):
+    """MongoEventStore writing to an in-process mongomock collection."""
+
+    def __init__(self):
+        super().__init__()
+        self.collection = mongomock.MongoClient().db.metric_events
+
+    async def flush(self):
+        if self._buffer:
+            self.collection.insert_many(self._buffer)
+            self._buffer = []
+
+    async def aggregate(self, pipeline):
+        await self.flush()
+        return list(self.collection.aggregate(pipeline))
+
+
+class _CannedKpiStore(EventStore):
+    aggregates = True
+
+    def __init__(self, rows, percentile_operator=True):
+        self.rows = rows
+        self.pipelines = []
+        self.percentile_operator = percentile_operator
+
+    async def supports_percentile(self):
+        return self.percentile_operator
+
+    async def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return self.rows
+
+
+class TestServerSideAggregation:
+    async def test_mongo_documents_use_time_series_shape(self):
+        """Test that buffered events carry timestamp and meta fields."""
+        store = MongoEventStore()
+        store.append({
+            "event_type": EventType.INBOX_CANDIDATE_SHORTLISTED,
+            "timestamp": "2024-01-01T12:00:00Z",
+            "actor_id": "emp_1",
+            "time_since_application": 60.0,
+            "job_id": "job_1",
+        })
+        store.append({"event_type": EventType.RECOMMENDATION_VIEW, "timestamp": "not a date"})
+
+        assert store._buffer == [{
+            "timestamp": datetime(2024, 1, 1, 12),
+            "meta": {"event_type": "inbox.candidate_shortlisted", "actor_id": "emp_1"},
+            "time_since_application": 60.0,
+            "data": {"job_id": "job_1"},
+        }]
+
+    async def test_time_series_aggregated_by_backend(self):
+        """Test the time series pipeline against stored events."""
+        service = MetricsService(backend=_MongomockEventStore())
+        start = datetime(2024, 1, 1)
+        for hours, event_type in ((1, EventType.RECOMMENDATION_VIEW), (2, EventType.RECOMMENDATION_VIEW),
+                                  (3, EventType.RECOMMENDATION_CLICK), (50, EventType.RECOMMENDATION_VIEW)):
+            service.add_event({"event_type": event_type, "timestamp": (start + timedelta(hours=hours)).isoformat()})
+
+        time_series = await service.query_time_series("ctr", start, start + timedelta(days=3))
+
+        assert [point.value for point in time_series] == [0.5, 0.0, 0.0]
+        assert [point.timestamp for point in time_series] == [start + timedelta(days=day) for day in range(3)]
+
+    async def test_kpis_built_from_aggregation_rows(self):
+        """Test mapping the KPI pipeline's facets onto KPIMetrics."""
+        store = _CannedKpiStore([{
+            "counts": [
+                {"_id": EventType.RECOMMENDATION_VIEW.value, "count": 20},
+                {"_id": EventType.RECOMMENDATION_CLICK.value, "count": 5},
+                {"_id": EventType.APPLICATION_SUBMITTED.value, "count": 1},
+            ],
+            "users": [{"unique_users": 7}],
+            "shortlist": [{"_id": None, "count": 40, "percentiles": [900.0, 3600.0, 7200.0]}],
+        }])
+        service = MetricsService(backend=store)
+        start, end = datetime(2024, 1, 1), datetime(2024, 3, 31)
+
+        kpis = await service.query_kpis(start, end)
+
+        assert kpis.ctr == 0.25
+        assert kpis.application_conversion_rate == 0.2
+        assert kpis.total_events == 26
+        assert kpis.unique_users == 7
+        assert kpis.median_time_to_shortlist == 900.0
+        assert kpis.p99_time_to_shortlist == 7200.0
+        assert kpis.time_to_shortlist_exact is False
+        assert store.pipelines[0][0] == {"$match": {"timestamp": {"$gte": start, "$lte": end}}}
+
+    async def test_kpis_without_percentile_operator(self):
+        """Test the $setWindowFields fallback used before MongoDB 7.0."""
+        store = _CannedKpiStore([{
+            "counts": [{"_id": EventType.INBOX_CANDIDATE_SHORTLISTED.value, "count": 10}],
+            "users": [],
+            # Nearest ranks of 0.5, 0.9 and 0.99 among 10 values
+            "shortlist": [{"_id": None, "count": 10, "ranked": [
+                {"rank": 5, "value": 500.0}, {"rank": 9, "value": 900.0}, {"rank": 10, "value": 1000.0},
+            ]}],
+        }], percentile_operator=False)
+        service = MetricsService(backend=store)
+
+        kpis = await service.query_kpis()
+
+        assert kpis.median_time_to_shortlist == 500.0
+        assert kpis.p90_time_to_shortlist == 900.0
+        assert kpis.p99_time_to_shortlist == 1000.0
+        assert kpis.time_to_shortlist_exact is True
+        stages = store.pipelines[0][1]["$facet"]["shortlist"]
+        assert "$setWindowFields" in stages[1]
+        assert "$percentile" not in str(stages)
+
+    async def test_percentile_support_follows_server_version(self):
+        """Test that $percentile is only used on MongoDB 7.0 and later."""
+        store = MongoEventStore()
+        store._server_version = (6, 0)
+        assert await store.supports_percentile() is False
+        store._server_version = (7, 0)
+        assert await store.supports_percentile() is True
+        assert await EventStore().supports_percentile() is False
+
+    async def test_kpis_with_no_events(self):
+        """Test empty facets from the KPI pipeline."""
+        service = MetricsService(backend=_CannedKpiStore([{"counts": [], "users": [], "shortlist": []}]))
+
+        kpis = await service.query_kpis()
+
+        assert kpis.total_events == 0
+        assert kpis.median_time_to_shortlist is None
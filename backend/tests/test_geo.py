@@ -0,0 +1,134 @@
+"""
+Tests for gazetteer geocoding and geo radius search.
+"""
+from types import SimpleNamespace
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from app.models.job import JobLocation
+from app.services.geo import assign_job_coordinates, geo_point, geocode, haversine_miles
+from app.services.indexer import backfill_job_coordinates
+from app.services.search_query import build_search_query
+
+
+class TestGeocode:
+    """Test gazetteer lookups."""
+
+    def test_city_and_state_abbreviation(self):
+        """Test that "City, ST" strings resolve to coordinates."""
+        longitude, latitude = geocode("Austin, TX")
+
+        assert longitude == pytest.approx(-97.74, abs=0.1)
+        assert latitude == pytest.approx(30.27, abs=0.1)
+
+    def test_full_state_name(self):
+        """Test that full state names are normalized to abbreviations."""
+        assert geocode("Austin, Texas") == geocode("Austin, TX")
+
+    def test_state_disambiguates_duplicate_city(self):
+        """Test that the state picks between cities sharing a name."""
+        oregon = geocode("Portland, OR")
+        maine = geocode(city="Portland", state="ME")
+
+        assert oregon != maine
+        # A bare name resolves to the most populous city
+        assert geocode("Portland") == oregon
+
+    def test_unknown_location(self):
+        """Test that unknown locations return None."""
+        assert geocode("Remote") is None
+        assert geocode("") is None
+
+    def test_haversine_distance(self):
+        """Test great-circle distance between two cities."""
+        distance = haversine_miles(geocode("Austin, TX"), geocode("Dallas, TX"))
+
+        assert distance == pytest.approx(182, abs=10)
+
+
+class TestAssignJobCoordinates:
+    """Test geocoding jobs onto GeoJSON points."""
+
+    def test_string_location(self):
+        """Test jobs with a "City, ST" location string."""
+        job = SimpleNamespace(location="Denver, CO", geo_location=None)
+
+        assert assign_job_coordinates(job) is True
+        assert job.geo_location["type"] == "Point"
+        assert job.geo_location["coordinates"] == list(geocode("Denver, CO"))
+
+    def test_structured_location(self):
+        """Test jobs with a JobLocation."""
+        job = SimpleNamespace(location=JobLocation(city="Seattle", state="WA"), geo_location=None)
+
+        assert assign_job_coordinates(job) is True
+        assert job.geo_location["coordinates"] == list(geocode("Seattle, WA"))
+
+    def test_unresolved_location_clears_point(self):
+        """Test that stale coordinates are cleared."""
+        job = SimpleNamespace(location="Remote", geo_location={"type": "Point"})
+
+        assert assign_job_coordinates(job) is False
+        assert job.geo_location is None
+
+
+class TestGeoSearchQuery:
+    """Test radius search query construction."""
+
+    def test_known_location_uses_radius(self):
+        """Test that a geocoded location becomes a $geoWithin filter."""
+        search_query = build_search_query(location="Austin, TX", radius=25)
+
+        center, radians = search_query.filter["geo_location"]["$geoWithin"]["$centerSphere"]
+        assert center == list(geocode("Austin, TX"))
+        assert radians == pytest.approx(25 / 3963.2)
+        assert "$or" not in search_query.filter
+        assert search_query.near is None
+
+    def test_unknown_location_falls_back_to_text(self):
+        """Test that locations missing from the gazetteer use a text match."""
+        search_query = build_search_query(location="Remote")
+
+        assert "geo_location" not in search_query.filter
+        assert search_query.filter["$or"][0] == {"location": {"$regex": "Remote", "$options": "i"}}
+
+    def test_distance_sort_uses_near_sphere(self):
+        """Test that distance ordering fetches with $nearSphere."""
+        search_query = build_search_query(location="Austin, TX", radius=10, sort_by="distance")
+
+        assert search_query.sort == []
+        near = search_query.find_filter()["geo_location"]["$nearSphere"]
+        assert near["$maxDistance"] == pytest.approx(10 * 1609.344)
+        # Counting keeps the $geoWithin filter
+        assert "$geoWithin" in search_query.filter["geo_location"]
+
+    def test_distance_sort_without_location(self):
+        """Test that distance ordering falls back to newest first."""
+        search_query = build_search_query(sort_by="distance")
+
+        assert search_query.sort == [("posted_at", -1)]
+        assert search_query.near is None
+
+
+class TestBackfillJobCoordinates:
+    """Test geocoding jobs stored before geo_location existed."""
+
+    @pytest.mark.asyncio
+    async def test_legacy_job_without_coordinates(self):
+        """Test that a legacy job gets a point and is skipped on the next run."""
+        collection = AsyncMongoMockClient()["jobs_test"]["jobs"]
+        await collection.insert_many([
+            {"_id": "legacy", "title": "Engineer", "location": {"city": "Austin", "state": "TX"}},
+            {"_id": "remote", "title": "Engineer", "location": "Remote"},
+            {"_id": "current", "title": "Engineer", "location": "Denver, CO",
+             "geo_location": geo_point(geocode("Denver, CO"))},
+        ])
+
+        assert await backfill_job_coordinates(collection) == 2
+
+        legacy = await collection.find_one({"_id": "legacy"})
+        assert legacy["geo_location"] == geo_point(geocode("Austin, TX"))
+        remote = await collection.find_one({"_id": "remote"})
+        assert "geo_location" in remote and remote["geo_location"] is None
+        assert await backfill_job_coordinates(collection) == 0
@@ -0,0 +1,124 @@
+"""
+Tests for the job search index advisor.
+"""
+from app.models.job import Job
+from app.services.index_advisor import (
+    COMMON_SEARCH_SCENARIOS,
+    extract_shape,
+    is_index_covered,
+    propose_index,
+    recommended_indexes,
+    winning_plan_stages,
+)
+from app.services.search_query import build_search_query
+
+
+class TestQueryShape:
+    """Test classification of search filters."""
+
+    def test_default_search_shape(self):
+        """Test that the default search is an equality on status sorted by date."""
+        shape = extract_shape(build_search_query())
+
+        assert shape.equality == ["status"]
+        assert shape.sort == [("posted_at", -1)]
+        assert shape.range == []
+
+    def test_salary_filters_are_ranges(self):
+        """Test that salary bounds nested under $and are range fields."""
+        shape = extract_shape(build_search_query(salary_min=50000, salary_max=90000))
+
+        assert shape.range == ["salary_max", "salary_min"]
+
+    def test_keyword_search_is_unindexed(self):
+        """Test that regex alternatives are not proposed as index keys."""
+        # Locations outside the gazetteer fall back to regex matching
+        shape = extract_shape(build_search_query(q="python", location="Remote"))
+
+        assert "title" in shape.unindexed
+        assert "city" in shape.unindexed
+        assert "title" not in propose_index(shape)
+
+    def test_radius_search_is_geo(self):
+        """Test that radius search proposes a 2dsphere key after equality."""
+        shape = extract_shape(build_search_query(location="Austin, TX", radius=25))
+
+        assert shape.geo == ["geo_location"]
+        assert propose_index(shape) == [
+            ("status", 1), ("geo_location", "2dsphere"), ("posted_at", -1)
+        ]
+
+
+class TestProposeIndex:
+    """Test ESR ordering of proposed indexes."""
+
+    def test_equality_sort_range_order(self):
+        """Test that equality fields precede sort keys, which precede ranges."""
+        search_query = build_search_query(
+            experience_levels="senior",
+            salary_min=100000,
+        )
+
+        assert propose_index(extract_shape(search_query)) == [
+            ("status", 1),
+            ("experience_level", 1),
+            ("posted_at", -1),
+            ("salary_max", 1),
+        ]
+
+    def test_range_on_sort_field_is_not_duplicated(self):
+        """Test that a range on the sort field reuses the sort key."""
+        search_query = build_search_query(posted_within="7d")
+
+        assert propose_index(extract_shape(search_query)) == [("status", 1), ("posted_at", -1)]
+
+    def test_recommended_indexes_drop_prefixes(self):
+        """Test that indexes covered by a longer proposal are dropped."""
+        indexes = recommended_indexes()
+
+        assert [("status", 1), ("posted_at", -1)] not in indexes
+        assert is_index_covered([("status", 1), ("posted_at", -1)], indexes)
+
+
+class TestDeclaredIndexes:
+    """Test that the Job model declares the recommended indexes."""
+
+    def test_common_scenarios_are_covered(self):
+        """Test every common search scenario has a declared compound index."""
+        for params in COMMON_SEARCH_SCENARIOS.values():
+            keys = propose_index(extract_shape(build_search_query(**params)))
+            assert is_index_covered(keys, Job.Settings.indexes), keys
+
+
+class TestExplainParsing:
+    """Test detection of collection scans in explain output."""
+
+    def test_detects_collscan(self):
+        """Test that a COLLSCAN below a SORT stage is found."""
+        explain = {
+            "queryPlanner": {
+                "winningPlan": {
+                    "stage": "SORT",
+                    "inputStage": {"stage": "COLLSCAN"},
+                }
+            }
+        }
+
+        assert winning_plan_stages(explain) == ["SORT", "COLLSCAN"]
+
+    def test_index_scan_under_sbe_plan(self):
+        """Test stage collection from slot-based engine explain output."""
+        explain = {
+            "queryPlanner": {
+                "winningPlan": {
+                    "queryPlan": {
+                        "stage": "FETCH",
+                        "inputStage": {"stage": "IXSCAN"},
+                    }
+                }
+            }
+        }
+
+        stages = winning_plan_stages(explain)
+        assert "IXSCAN" in stages
+        assert "COLLSCAN" not in stages
@@ -0,0 +1,98 @@
+"""
+Tests for the compiled keyword matcher and resume keyword extraction.
+"""
+from app.services.keyword_matcher import AliasMatcher, KeywordMatcher, load_keywords
+from app.services.parsing import _parse_skills, _parse_titles
+
+
+class TestKeywordMatcher:
+    def test_matches_on_word_boundaries(self):
+        """Test that keywords inside longer words are not matched."""
+        matcher = KeywordMatcher(["ml", "java", "node"])
+
+        assert matcher.find_all("HTML and JavaScript with node.js") == set()
+        assert matcher.find_all("ML, Java and Node") == {"ml", "java", "node"}
+
+    def test_sentence_ending_dot(self):
+        """Test that a dot ending a sentence is a boundary but ".js" is not."""
+        matcher = KeywordMatcher(["python", "sql", "node"])
+
+        assert matcher.find_all("Wrote python.Also led SQL.Experience with node.js") == {"python", "sql"}
+        assert matcher.find_all("Node.2 shipped; python.3 no") == set()
+        assert matcher.contains_any("Five years of SQL.")
+
+    def test_symbols_are_part_of_keywords(self):
+        """Test keywords containing +, # and dots."""
+        matcher = KeywordMatcher(["c", "c++", "c#", ".net", "ci/cd"])
+
+        assert matcher.find_all("C++ and C# on .NET with CI/CD") == {"c++", "c#", ".net", "ci/cd"}
+        assert matcher.find_all("Plan C.") == {"c"}
+
+    def test_prefers_longest_keyword(self):
+        """Test that overlapping keywords resolve to the longest match."""
+        matcher = KeywordMatcher(["machine", "machine learning", "react", "react native"])
+
+        assert matcher.find_all("Machine\n  Learning, React Native") == {"machine learning", "react native"}
+        assert matcher.find_all("machine learner") == {"machine"}
+
+    def test_large_vocabulary(self):
+        """Test that a large vocabulary compiles and matches."""
+        matcher = KeywordMatcher([f"skill{i}" for i in range(20_000)])
+
+        assert len(matcher) == 20_000
+        assert matcher.find_all("skill42 skill19999 skill200000") == {"skill42", "skill19999"}
+
+    def test_empty_vocabulary(self):
+        """Test that an empty matcher never matches."""
+        assert KeywordMatcher([]).find_all("anything") == set()
+
+    def test_load_keywords_skips_comments(self, tmp_path):
+        """Test reading a keyword file."""
+        path = tmp_path / "skills.txt"
+        path.write_text("# Languages\npython\n\nc#\n")
+
+        assert load_keywords(path) == ["python", "c#"]
+
+
+class TestAliasMatcher:
+    def test_matches_like_keyword_matcher(self):
+        """Test that set lookups find the same keywords as the compiled pattern."""
+        keywords = [
+            "ml", "java", "node", "node.js", "c", "c++", "c#", ".net", "asp.net", "ci/cd",
+            "machine", "machine learning", "react native", "python", "sql",
+        ]
+        texts = [
+            "HTML and JavaScript with node.js",
+            "C++ and C# on .NET and ASP.NET with CI/CD. Plan C.",
+            "Machine\n  Learning, React Native; machine learner",
+            "Wrote python.Also led SQL.Experience (Java/ML) on Node.2",
+            "ci/ cd, react-native, CI/CD/ML",
+        ]
+        alias_matcher = AliasMatcher(keywords)
+        keyword_matcher = KeywordMatcher(keywords)
+
+        for text in texts:
+            assert alias_matcher.find_all(text) == keyword_matcher.find_all(text), text
+        assert alias_matcher.find_all(texts[2]) == {"machine learning", "react native", "machine"}
+
+    def test_contains_any(self):
+        """Test the early-exit check and an empty vocabulary."""
+        matcher = AliasMatcher(["react native"])
+
+        assert matcher.contains_any("Built with React  Native.")
+        assert not matcher.contains_any("React and native apps")
+        assert AliasMatcher([]).find_all("anything") == set()
+
+
+class TestResumeKeywords:
+    def test_parse_skills(self):
+        """Test skill extraction from the bundled taxonomy."""
+        text = "Skills: Python, FastAPI, MongoDB, Docker. Built ML pipelines for XHTML dashboards."
+
+        assert _parse_skills(text) == ["docker", "fastapi", "machine learning", "mongodb", "python"]
+
+    def test_parse_titles(self):
+        """Test that only lines with a whole-word title keyword are titles."""
+        text = "Senior Software Engineer\nLeadership training\nTeam Lead, Payments"
+
+        assert _parse_titles(text) == ["Senior Software Engineer", "Team Lead Payments"]
@@ -0,0 +1,93 @@
+"""
+Tests for applicant match scoring.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.ai.matching import calculate_match_score
+from app.models.job import ExperienceLevel, JobLocation
+from app.models.profile import JobPreferences
+from app.services.match_scores import (
+    job_match_data,
+    profile_match_data,
+    score_applicants,
+)
+
+
+def _job(**overrides):
+    fields = {
+        "skills_required": ["Python", "SQL"],
+        "experience_level": ExperienceLevel.SENIOR,
+        "location": JobLocation(city="Austin", state="TX"),
+        "job_embedding": [1.0, 0.0],
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+class TestMatchData:
+    """Test document to matching-input adaptation."""
+
+    def test_structured_job(self):
+        """Test jobs with enum levels and a JobLocation."""
+        data = job_match_data(_job())
+
+        assert data["skills_required"] == ["Python", "SQL"]
+        assert data["experience_level"] == "senior"
+        assert data["location"]["city"] == "Austin"
+        assert data["location"]["is_remote"] is False
+
+    def test_flat_job(self):
+        """Test jobs with a location string, skills and work type."""
+        job = SimpleNamespace(location="Denver, CO", skills=["go"], work_type="remote")
+
+        data = job_match_data(job)
+
+        assert data["skills_required"] == ["go"]
+        assert data["experience_level"] == "mid"
+        assert data["location"] == {"city": "Denver, CO", "is_remote": True}
+
+    def test_profile_preferences_model(self):
+        """Test that preference models become plain dicts."""
+        profile = SimpleNamespace(
+            skills=["python"],
+            preferences=JobPreferences(preferred_locations=["Austin"]),
+        )
+
+        data = profile_match_data(profile)
+
+        assert data["preferences"]["preferred_locations"] == ["Austin"]
+        assert data["experience_level"] == "mid"
+
+
+class TestScoreApplicants:
+    """Test batch scoring of a job's applicants."""
+
+    def test_matches_pairwise_scores(self):
+        """Test that batch scores equal calculate_match_score per applicant."""
+        job = _job()
+        profiles = [
+            SimpleNamespace(skills=["python", "sql"], experience_level="senior",
+                            preferences={"preferred_locations": ["Austin"]}, profile_embedding=[1.0, 0.0]),
+            SimpleNamespace(skills=["react"], experience_level="entry",
+                            preferences={}, profile_embedding=[0.0, 1.0]),
+        ]
+
+        scores = score_applicants(job, profiles)
+
+        for profile, score in zip(profiles, scores):
+            expected = calculate_match_score(
+                job_match_data(job), profile_match_data(profile),
+                job.job_embedding, profile.profile_embedding,
+            )
+            assert score["total_score"] == pytest.approx(expected["total_score"], abs=0.01)
+            assert score["explanation"]
+        assert scores[0]["total_score"] > scores[1]["total_score"]
+
+    def test_applicant_without_profile(self):
+        """Test that applicants without a profile still get a score."""
+        scores = score_applicants(_job(), [None])
+
+        assert len(scores) == 1
+        assert scores[0]["skills_score"] == 0.0
@@ -0,0 +1,115 @@
+"""
+Tests for batch match scoring.
+"""
+import random
+
+import pytest
+
+from app.ai.matching import (
+    calculate_match_score,
+    match_experience_level,
+    score_jobs_for_profile,
+    score_profiles_for_job,
+)
+
+SKILLS = ["Python", "FastAPI", "React", "SQL", "Docker", "AWS", "Go", "Kubernetes"]
+LEVELS = ["entry", "mid", "senior", "lead", "executive", "unknown"]
+CITIES = ["Austin", "Denver", "Seattle", "Boston"]
+
+
+def _job(rng):
+    return {
+        "skills_required": rng.sample(SKILLS, rng.randint(0, 4)),
+        "experience_level": rng.choice(LEVELS),
+        "location": {"city": rng.choice(CITIES), "is_remote": rng.random() < 0.3},
+    }
+
+
+def _profile(rng):
+    return {
+        "skills": [skill.lower() for skill in rng.sample(SKILLS, rng.randint(0, 5))],
+        "experience_level": rng.choice(LEVELS),
+        "preferences": {
+            "willing_to_relocate": rng.random() < 0.2,
+            "preferred_locations": rng.sample(CITIES, rng.randint(0, 2)),
+        },
+    }
+
+
+def _embedding(rng, dimensions=8):
+    if rng.random() < 0.2:
+        return None
+    return [rng.uniform(-1, 1) for _ in range(dimensions)]
+
+
+def _assert_same_scores(batch, expected):
+    assert len(batch) == len(expected)
+    for actual, single in zip(batch, expected):
+        assert actual.keys() == single.keys()
+        for key in single:
+            assert actual[key] == pytest.approx(single[key], abs=0.01)
+
+
+class TestExperienceLevel:
+    """Test the experience lookup table."""
+
+    def test_level_distances(self):
+        """Test scores by distance between levels."""
+        assert match_experience_level("mid", "mid") == 1.0
+        assert match_experience_level("Mid", "senior") == 0.7
+        assert match_experience_level("entry", "senior") == 0.4
+        assert match_experience_level("entry", "executive") == 0.1
+
+    def test_unknown_level(self):
+        """Test the default for levels outside the ladder."""
+        assert match_experience_level("guru", "mid") == 0.5
+
+
+class TestBatchScoring:
+    """Test that batch scoring matches pairwise scoring."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.rng = random.Random(7)
+
+    def test_score_jobs_for_profile(self):
+        """Test one profile against many jobs."""
+        profile = _profile(self.rng)
+        profile_embedding = _embedding(self.rng)
+        jobs = [_job(self.rng) for _ in range(50)]
+        job_embeddings = [_embedding(self.rng) for _ in jobs]
+
+        batch = score_jobs_for_profile(profile, jobs, profile_embedding, job_embeddings)
+
+        expected = [
+            calculate_match_score(job, profile, embedding, profile_embedding)
+            for job, embedding in zip(jobs, job_embeddings)
+        ]
+        _assert_same_scores(batch, expected)
+
+    def test_score_profiles_for_job(self):
+        """Test many profiles against one job."""
+        job = _job(self.rng)
+        job_embedding = [0.5] * 8
+        profiles = [_profile(self.rng) for _ in range(50)]
+        profile_embeddings = [_embedding(self.rng) for _ in profiles]
+
+        batch = score_profiles_for_job(job, profiles, job_embedding, profile_embeddings)
+
+        expected = [
+            calculate_match_score(job, profile, job_embedding, embedding)
+            for profile, embedding in zip(profiles, profile_embeddings)
+        ]
+        _assert_same_scores(batch, expected)
+
+    def test_mismatched_embedding_dimensions(self):
+        """Test that vectors of another dimension score zero similarity."""
+        scores = score_jobs_for_profile({}, [{}, {}], [1.0, 0.0], [[1.0, 0.0], [1.0, 0.0, 0.0]])
+
+        assert scores[0]["semantic_score"] == 100.0
+        assert scores[1]["semantic_score"] == 0.0
+
+    def test_empty_batch(self):
+        """Test that an empty batch returns no scores."""
+        assert score_jobs_for_profile({"skills": ["python"]}, []) == []
+        assert score_profiles_for_job({"skills_required": ["python"]}, []) == []
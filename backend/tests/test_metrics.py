@@ -277,3 +277,108 @@ class TestMetricsService:
         )
         
         assert len(time_series) >= 1
+    
+    def test_kpis_merge_rollup_buckets(self):
+        """Test KPIs over a window spanning day, hour and minute buckets."""
+        now = datetime.utcnow()
+        
+        for days_ago in (0, 3, 10, 40):
+            self.service.add_event({
+                "event_type": EventType.RECOMMENDATION_VIEW,
+                "timestamp": (now - timedelta(days=days_ago)).isoformat(),
+                "actor_id": f"user_{days_ago}",
+            })
+        
+        kpis = self.service.get_kpis()
+        
+        assert kpis.recommendation_views == 3
+        assert kpis.unique_users == 3
+    
+    def test_rollups_rebuilt_from_existing_store(self):
+        """Test that a pre-populated event store is rolled up on init."""
+        events = [{
+            "event_type": EventType.RECOMMENDATION_CLICK.value,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "actor_id": "user_1",
+        }]
+        
+        service = MetricsService(event_store=events)
+        
+        assert service.get_kpis().recommendation_clicks == 1
+    
+    def test_time_series_single_pass_values(self):
+        """Test per-bucket CTR values from the rollup buckets."""
+        start = datetime(2024, 1, 1)
+        
+        # Added out of order: day 2 first, then day 0
+        for day, clicks in ((2, 3), (0, 1)):
+            day_time = start + timedelta(days=day, hours=12)
+            for _ in range(10):
+                self.service.add_event({
+                    "event_type": EventType.RECOMMENDATION_VIEW,
+                    "timestamp": day_time.isoformat(),
+                })
+            for _ in range(clicks):
+                self.service.add_event({
+                    "event_type": EventType.RECOMMENDATION_CLICK,
+                    "timestamp": day_time.isoformat(),
+                })
+        
+        time_series = self.service.get_ctr_time_series(
+            start_date=start,
+            end_date=start + timedelta(days=3),
+        )
+        
+        assert [point.value for point in time_series] == [0.1, 0.0, 0.3]
+        assert time_series[1].timestamp == start + timedelta(days=1)
+    
+    def test_generic_count_series(self):
+        """Test a count metric through get_time_series."""
+        start = datetime(2024, 1, 1)
+        for hour in (0, 0, 5):
+            self.service.add_event({
+                "event_type": EventType.INBOX_CANDIDATE_SHORTLISTED,
+                "timestamp": (start + timedelta(hours=hour, minutes=30)).isoformat(),
+            })
+        
+        time_series = self.service.get_time_series(
+            "shortlists",
+            start_date=start,
+            end_date=start + timedelta(hours=6),
+            bucket_size=timedelta(hours=3),
+        )
+        
+        assert [point.value for point in time_series] == [2.0, 1.0]
+        assert time_series[0].label == "Shortlists"
+        with pytest.raises(ValueError):
+            self.service.get_time_series("bounce_rate")
+    
+    def test_time_to_shortlist_percentiles(self):
+        """Test exact and sketched time-to-shortlist percentiles."""
+        now = datetime.utcnow()
+        for index in range(1, 101):
+            self.service.add_event({
+                "event_type": EventType.INBOX_CANDIDATE_SHORTLISTED,
+                "timestamp": (now - timedelta(minutes=index % 7)).isoformat(),
+                "time_since_application": float(index * 60),
+            })
+        
+        kpis = self.service.get_kpis()
+        
+        assert kpis.time_to_shortlist_exact is True
+        assert kpis.median_time_to_shortlist == 3030.0
+        assert kpis.p90_time_to_shortlist == pytest.approx(5406.0)
+        assert kpis.p99_time_to_shortlist == pytest.approx(5940.6)
+        
+        for index in range(2000):
+            self.service.add_event({
+                "event_type": EventType.INBOX_CANDIDATE_SHORTLISTED,
+                "timestamp": now.isoformat(),
+                "time_since_application": float(index),
+            })
+        
+        kpis = self.service.get_kpis()
+        
+        assert kpis.time_to_shortlist_exact is False
+        assert kpis.candidates_shortlisted == 2100
+        assert 900 <= kpis.median_time_to_shortlist <= 1150
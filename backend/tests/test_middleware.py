@@ -0,0 +1,103 @@
+"""
+Tests for the pure ASGI observability middleware.
+"""
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from app.core.middleware import LoggingMiddleware, MetricsMiddleware, ObservabilityMiddleware
+from app.middleware.performance import PerformanceMonitoringMiddleware, latency_tracker
+
+pytestmark = pytest.mark.asyncio
+
+
+def _app(*middleware):
+    app = FastAPI()
+
+    @app.get("/api/v1/jobs/{job_id}")
+    async def get_job(job_id: str):
+        return {"id": job_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for index in range(3):
+                yield f"chunk{index};".encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    for middleware_class in middleware:
+        app.add_middleware(middleware_class)
+    return app
+
+
+async def _get(app, path, **kwargs):
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path, **kwargs)
+
+
+class TestObservabilityMiddleware:
+    def setup_method(self):
+        latency_tracker.clear()
+
+    async def test_headers_and_latency(self):
+        """Test correlation and timing headers plus latency tracking."""
+        response = await _get(
+            _app(ObservabilityMiddleware), "/api/v1/jobs/123", headers={"X-Correlation-ID": "abc"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["x-correlation-id"] == "abc"
+        assert float(response.headers["x-response-time"]) >= 0
+        assert latency_tracker.request_counts["/api/v1/jobs/{job_id}"] == 1
+
+    async def test_streaming_response_passes_through(self):
+        """Test that streamed bodies are forwarded unchanged."""
+        response = await _get(_app(ObservabilityMiddleware), "/stream")
+
+        assert response.text == "chunk0;chunk1;chunk2;"
+        assert "x-correlation-id" in response.headers
+
+    async def test_errors_counted(self):
+        """Test 404s and unhandled exceptions in the counters and tracker."""
+        app = _app(ObservabilityMiddleware)
+        assert (await _get(app, "/missing")).status_code == 404
+        assert (await _get(app, "/boom")).status_code == 500
+
+        assert latency_tracker.error_counts["/boom"] == 1
+        assert latency_tracker.error_counts["/missing"] == 1
+
+    async def test_route_template_keys(self):
+        """Test that matched requests are keyed by route template, unmatched ones by normalized path."""
+        app = _app(ObservabilityMiddleware)
+        await _get(app, "/api/v1/jobs/senior-engineer-42")
+        await _get(app, "/api/v1/jobs/engineer")
+        await _get(app, "/api/v1/unknown/507f1f77bcf86cd799439011")
+
+        assert dict(latency_tracker.request_counts) == {
+            "/api/v1/jobs/{job_id}": 2,
+            "/api/v1/unknown/:id": 1,
+        }
+
+
+class TestSingleMiddlewares:
+    async def test_logging_and_metrics_headers(self):
+        """Test the standalone logging and metrics middleware headers."""
+        response = await _get(_app(LoggingMiddleware, MetricsMiddleware), "/api/v1/jobs/1")
+
+        assert response.status_code == 200
+        assert "x-correlation-id" in response.headers
+        assert "x-response-time" in response.headers
+
+    async def test_performance_middleware_records(self):
+        """Test that the performance middleware records failed requests."""
+        latency_tracker.clear()
+
+        await _get(_app(PerformanceMonitoringMiddleware), "/boom")
+
+        assert latency_tracker.error_counts["/boom"] == 1
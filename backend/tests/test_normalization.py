@@ -0,0 +1,35 @@
+"""
+Tests for text normalization and tokenization.
+"""
+import re
+
+from app.services.normalization import analyze_text, normalize_text_chunks, normalize_title, tokenize
+from app.services.scoring import analyze_query, build_query_tokens
+
+
+class TestNormalization:
+    def test_normalize_title(self):
+        """Test that titles are lowercased with whitespace collapsed."""
+        assert normalize_title("  Senior\tPython\n Engineer ") == "senior python engineer"
+
+    def test_normalize_text_chunks_skips_empty_chunks(self):
+        """Test joining chunks with whitespace collapsed."""
+        assert normalize_text_chunks(" Build  APIs\n", "", None, "\tin Python ") == "Build APIs in Python"
+
+    def test_analyze_text_matches_separate_passes(self):
+        """Test that the fused pass equals normalize_text_chunks then tokenize."""
+        chunks = ("data  scientist", "Own CI/CD,\n ML (NLP) & 401(k).", "python sql", "Austin, TX")
+
+        text, tokens = analyze_text(*chunks)
+
+        assert text == normalize_text_chunks(*chunks)
+        assert tokens == tokenize(text) == re.findall(r"[a-z0-9]+", text.lower())
+        assert tokens[:6] == ["data", "scientist", "own", "ci", "cd", "ml"]
+
+    def test_query_analysis(self):
+        """Test that query text and analyzed tokens come from one call."""
+        query = analyze_query(["python"], ["Backend Engineers"], "remote  only")
+
+        assert query.text == "python Backend Engineers remote only"
+        assert query.tokens == ["python", "backend", "engineer", "remote"]
+        assert build_query_tokens(["python"], ["Backend Engineers"], "remote  only") == query.tokens
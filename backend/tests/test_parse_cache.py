@@ -0,0 +1,45 @@
+"""
+Tests for the parse result cache.
+"""
+from app.services import parse_cache as parse_cache_module
+from app.services.parse_cache import ParseCache
+from app.services.parsing import ParsedResume
+
+
+def _parsed(text: str) -> ParsedResume:
+    return ParsedResume(raw_text=text, skills=["python"], titles=[])
+
+
+class TestParseCache:
+    """Test cache lookups and eviction."""
+
+    def test_hit_and_miss(self):
+        """Test that lookups are counted."""
+        cache = ParseCache()
+        cache.put("abc", _parsed("resume"))
+
+        assert cache.get("abc").raw_text == "resume"
+        assert cache.get("def") is None
+        assert cache.get(None) is None
+        assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    def test_least_recently_used_is_evicted(self):
+        """Test LRU eviction once the cache is full."""
+        cache = ParseCache(max_entries=2)
+        cache.put("a", _parsed("a"))
+        cache.put("b", _parsed("b"))
+        cache.get("a")
+        cache.put("c", _parsed("c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_parser_version_invalidates(self, monkeypatch):
+        """Test that results from an older parser version are not served."""
+        cache = ParseCache()
+        cache.put("abc", _parsed("old"))
+
+        monkeypatch.setattr(parse_cache_module, "PARSER_VERSION", 999)
+
+        assert cache.get("abc") is None
@@ -0,0 +1,103 @@
+"""
+Tests for capped and page-parallel PDF text extraction.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from app.services.parsing import parse_resume
+from app.services.pdf_extraction import extract_pdf_text
+
+
+def _write_pdf(path, pages):
+    """Write a PDF with one line of Helvetica text per page."""
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    for text in pages:
+        page = writer.add_blank_page(612, 792)
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font}),
+        })
+    with open(path, "wb") as handle:
+        writer.write(handle)
+    return path
+
+
+class TestExtractPdfText:
+    def test_sequential_extraction(self, tmp_path):
+        """Test that short PDFs are read page by page with timings."""
+        path = _write_pdf(tmp_path / "resume.pdf", ["Page one", "Page two"])
+
+        extraction = extract_pdf_text(path, max_pages=0, max_chars=0, parallel_min_pages=8)
+
+        assert extraction.text == "Page one\nPage two"
+        assert extraction.page_count == 2
+        assert extraction.pages_extracted == 2
+        assert extraction.truncated is False
+
+    def test_page_cap(self, tmp_path):
+        """Test that pages past the cap are not read."""
+        path = _write_pdf(tmp_path / "resume.pdf", [f"Page {i}" for i in range(10)])
+
+        extraction = extract_pdf_text(path, max_pages=3, max_chars=0, parallel_min_pages=100)
+
+        assert extraction.text == "Page 0\nPage 1\nPage 2"
+        assert extraction.page_count == 10
+        assert extraction.truncated is True
+
+    def test_char_cap_stops_early(self, tmp_path):
+        """Test that extraction stops once enough text has been read."""
+        path = _write_pdf(tmp_path / "resume.pdf", ["x" * 40 for _ in range(5)])
+
+        extraction = extract_pdf_text(path, max_pages=0, max_chars=100, parallel_min_pages=100)
+
+        assert extraction.pages_extracted == 3
+        assert extraction.truncated is True
+
+    def test_parallel_extraction_keeps_page_order(self, tmp_path):
+        """Test page ranges extracted in a process pool."""
+        pages = [f"Page {i}" for i in range(12)]
+        path = _write_pdf(tmp_path / "portfolio.pdf", pages)
+
+        with ProcessPoolExecutor(2) as executor:
+            extraction = extract_pdf_text(
+                path, max_pages=0, max_chars=0, parallel_min_pages=4, executor=executor, chunk_pages=3
+            )
+
+        assert extraction.text.split("\n") == pages
+        assert extraction.pages_extracted == 12
+        assert extraction.truncated is False
+
+    def test_parallel_char_cap(self, tmp_path):
+        """Test that the character cap also applies to parallel extraction."""
+        path = _write_pdf(tmp_path / "portfolio.pdf", ["y" * 50 for _ in range(12)])
+
+        with ProcessPoolExecutor(2) as executor:
+            extraction = extract_pdf_text(
+                path, max_pages=0, max_chars=120, parallel_min_pages=4, executor=executor,
+                chunk_pages=2, max_in_flight=2,
+            )
+
+        assert extraction.pages_extracted == 3
+        assert extraction.truncated is True
+
+
+class TestParsePdfResume:
+    def test_page_details_on_parsed_resume(self, tmp_path):
+        """Test that PDF page timings are reported with the parse result."""
+        path = _write_pdf(tmp_path / "resume.pdf", ["Software Engineer", "Python and Docker"])
+
+        parsed = parse_resume(path)
+
+        assert parsed.skills == ["docker", "python"]
+        assert parsed.page_count == 2
+        assert len(parsed.page_timings) == 2
+        assert parsed.truncated is False
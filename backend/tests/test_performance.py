@@ -4,7 +4,15 @@ Tests for performance monitoring and SLA budgets (ST-013).
 Tests latency tracking, error rate monitoring, and SLA budget compliance.
 """
 import pytest
-from app.middleware.performance import LatencyTracker, LATENCY_BUDGETS, ERROR_RATE_BUDGET
+from app.middleware.performance import (
+    LatencyTracker,
+    SLAEvaluator,
+    LATENCY_BUDGETS,
+    ERROR_RATE_BUDGET,
+    OVERFLOW_ENDPOINT,
+    normalize_endpoint,
+)
+from app.schemas.events import EventType
 
 
 class TestLatencyTracker:
@@ -141,12 +149,8 @@ class TestWindowSize:
         tracker.add_measurement("/api/v1/jobs", 300, 200)
         tracker.add_measurement("/api/v1/jobs", 400, 200)  # Should remove 100
         
-        latencies = list(tracker.latencies["/api/v1/jobs"])
-        assert len(latencies) == 3
-        assert 100 not in latencies
-        assert 200 in latencies
-        assert 300 in latencies
-        assert 400 in latencies
+        assert len(tracker.latencies["/api/v1/jobs"]) == 3
+        assert tracker.get_percentiles("/api/v1/jobs", [0, 50, 100]) == [200, 300, 400]
 
 
 class TestSLABudgets:
@@ -239,3 +243,133 @@ class TestEdgeCases:
         assert metrics["request_count"] == 0
         assert metrics["error_count"] == 0
         assert metrics["error_rate"] == 0.0
+
+
+class TestLatencyHistogram:
+    """Test the histogram-backed percentile estimates."""
+    
+    def test_percentiles_within_relative_error(self):
+        """Test percentile accuracy on a wide latency distribution."""
+        import random
+        
+        rng = random.Random(11)
+        values = [rng.lognormvariate(4, 1) for _ in range(1000)]
+        tracker = LatencyTracker(window_size=1000)
+        for value in values:
+            tracker.add_measurement("/api/v1/jobs", value, 200)
+        
+        ordered = sorted(values)
+        for percentile, estimate in zip((50, 95, 99), tracker.get_percentiles("/api/v1/jobs", (50, 95, 99))):
+            exact = ordered[int(len(ordered) * percentile / 100)]
+            assert abs(estimate - exact) / exact <= 0.006
+    
+    def test_window_rotates_sub_histograms(self):
+        """Test that old slots are dropped as the window slides."""
+        tracker = LatencyTracker(window_size=100, slots=4)
+        for _ in range(100):
+            tracker.add_measurement("/api/v1/jobs", 1000.0, 200)
+        for _ in range(100):
+            tracker.add_measurement("/api/v1/jobs", 10.0, 200)
+        
+        window = len(tracker.latencies["/api/v1/jobs"])
+        assert 75 <= window <= 100
+        assert tracker.get_percentile("/api/v1/jobs", 99) == pytest.approx(10.0)
+        assert tracker.request_counts["/api/v1/jobs"] == 200
+
+
+class TestEndpointKeys:
+    """Test path normalization for unmatched requests and the endpoint limit."""
+    
+    @pytest.mark.parametrize("path,expected", [
+        ("/api/v1/jobs/123", "/api/v1/jobs/:id"),
+        ("/api/v1/jobs/507f1f77bcf86cd799439011", "/api/v1/jobs/:id"),
+        ("/api/v1/jobs/550e8400-e29b-41d4-a716-446655440000/apply", "/api/v1/jobs/:id/apply"),
+        ("/api/v1/jobs/senior-engineer-42", "/api/v1/jobs/:id"),
+        ("/api/v1/auth/login", "/api/v1/auth/login"),
+    ])
+    def test_normalize_endpoint(self, path, expected):
+        """Test that ID-like segments are replaced and names are kept."""
+        assert normalize_endpoint(path) == expected
+    
+    def test_unmatched_endpoint_limit(self):
+        """Test that unmatched paths beyond the limit share the overflow key."""
+        tracker = LatencyTracker(window_size=100, max_unmatched_endpoints=2)
+        for path in ("/a", "/b", "/c", "/d", "/a"):
+            tracker.add_measurement(path, 10, 404, matched=False)
+        
+        assert set(tracker.latencies) == {"/a", "/b", OVERFLOW_ENDPOINT}
+        assert tracker.request_counts["/a"] == 2
+        assert tracker.request_counts[OVERFLOW_ENDPOINT] == 2
+    
+    def test_route_templates_never_overflow(self):
+        """Test that a flood of unmatched paths cannot merge route templates."""
+        tracker = LatencyTracker(window_size=100, max_unmatched_endpoints=2)
+        for index in range(10):
+            tracker.add_measurement(f"/probe-{index}", 10, 404, matched=False)
+        tracker.add_measurement("/api/v1/jobs", 900, 200)
+        
+        assert tracker.request_counts["/api/v1/jobs"] == 1
+        assert tracker.request_counts[OVERFLOW_ENDPOINT] == 8
+    
+    def test_metrics_lookup_does_not_add_endpoints(self):
+        """Test that querying an untracked endpoint leaves the tracker unchanged."""
+        tracker = LatencyTracker(window_size=100)
+        
+        assert tracker.get_metrics("/nope")["request_count"] == 0
+        assert not tracker.request_counts and not tracker.latencies
+
+
+class TestSLAEvaluator:
+    """Test background SLA evaluation with deduplication and hysteresis."""
+    
+    def _evaluator(self, **kwargs):
+        tracker = LatencyTracker(window_size=20, slots=2)
+        return tracker, SLAEvaluator(tracker, realert_seconds=60, clear_evaluations=2, **kwargs)
+    
+    def test_breach_alerts_once(self):
+        """Test that an ongoing breach is logged once, then re-alerted later."""
+        tracker, evaluator = self._evaluator()
+        for _ in range(20):
+            tracker.add_measurement("/api/v1/jobs", 900, 200)
+        
+        first = evaluator.evaluate(now=0)
+        assert {event.metadata.get("budget_p95") for event in first} == {200, None}
+        assert len(first) == 2  # p95 and p99
+        assert evaluator.evaluate(now=10) == []
+        assert len(evaluator.evaluate(now=61)) == 2
+    
+    def test_recovery_needs_consecutive_healthy_checks(self):
+        """Test that alerts clear only after sustained recovery below budget."""
+        tracker, evaluator = self._evaluator()
+        for _ in range(20):
+            tracker.add_measurement("/api/v1/jobs", 900, 200)
+        evaluator.evaluate(now=0)
+        
+        # 190ms is within the p95 budget (200) but not below 90% of it, so
+        # only the p99 alert (budget 500) clears, after two healthy checks
+        for _ in range(20):
+            tracker.add_measurement("/api/v1/jobs", 190, 200)
+        assert evaluator.evaluate(now=1) == []
+        resolved = evaluator.evaluate(now=2)
+        assert [event.metadata.get("budget_p99") for event in resolved] == [500]
+        assert evaluator.alerts[("/api/v1/jobs", "p95")].active
+        
+        for _ in range(20):
+            tracker.add_measurement("/api/v1/jobs", 50, 200)
+        assert evaluator.evaluate(now=3) == []
+        resolved = evaluator.evaluate(now=4)
+        
+        assert [event.metadata.get("budget_p95") for event in resolved] == [200]
+        assert resolved[0].metadata["resolved"] is True
+        assert resolved[0].severity == "info"
+    
+    def test_error_budget(self):
+        """Test error budget alerts for endpoints without a latency budget."""
+        tracker, evaluator = self._evaluator()
+        tracker.add_measurement("/api/v1/other", 10, 200)
+        tracker.add_measurement("/api/v1/other", 10, 500)
+        
+        events = evaluator.evaluate(now=0)
+        
+        assert [event.event_type for event in events] == [EventType.SLA_ERROR_BUDGET_EXCEEDED]
+        assert events[0].metadata["error_rate"] == 0.5
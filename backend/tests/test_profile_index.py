@@ -0,0 +1,214 @@
+"""
+Tests for the employer-side profile index.
+"""
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.embedding import LocalEmbeddingClient
+from app.services.indexer import ProfileIndexLoader, build_profile_text
+from app.services.profile_index import ProfileIndex, profile_index
+from app.services.scoring import _bm25, _compute_idf
+
+PROFILES = {
+    "alice": ["python", "fastapi", "mongodb", "backend", "engineer"],
+    "bob": ["react", "typescript", "frontend", "engineer"],
+    "carol": ["python", "python", "machine", "learning", "pytorch"],
+    "dave": ["sales", "manager"],
+}
+
+
+class TestProfileIndex:
+    """Test hybrid search over indexed profiles."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.index = ProfileIndex(initial_capacity=2)
+        for profile_id, tokens in PROFILES.items():
+            self.index.add(profile_id, tokens)
+
+    def test_bm25_matches_rank_jobs_scoring(self):
+        """Test that BM25 scores equal the job-side implementation."""
+        query = ["python", "backend", "engineer"]
+        corpus = list(PROFILES.values())
+        expected, _ = _bm25(query, corpus, _compute_idf(corpus))
+
+        matches = self.index.search(query, None, limit=4, bm25_weight=1.0, vector_weight=0.0)
+
+        scores = {match.profile_id: match.bm25_score for match in matches}
+        for profile_id, expected_score in zip(PROFILES, expected):
+            if expected_score:
+                assert scores[profile_id] == pytest.approx(expected_score, rel=1e-5)
+            else:
+                assert profile_id not in scores
+        assert matches[0].profile_id == "alice"
+        assert set(matches[0].matched_terms) == {"python", "backend", "engineer"}
+
+    def test_reindex_replaces_profile(self):
+        """Test that re-adding a profile drops its old terms."""
+        self.index.add("dave", ["python", "backend"])
+
+        matches = self.index.search(["sales"], None, limit=5, bm25_weight=1.0, vector_weight=0.0)
+
+        assert "dave" not in [match.profile_id for match in matches if match.bm25_score]
+        assert len(self.index) == 4
+
+    def test_remove(self):
+        """Test that removed profiles are not returned."""
+        assert self.index.remove("alice") is True
+        assert self.index.remove("alice") is False
+
+        matches = self.index.search(["fastapi"], None, limit=5, bm25_weight=1.0, vector_weight=0.0)
+
+        assert "alice" not in [match.profile_id for match in matches]
+
+    def test_candidate_limit_and_vector_rerank(self):
+        """Test that vectors rerank the BM25 candidates."""
+        index = ProfileIndex()
+        index.add("a", ["python"], [1.0, 0.0])
+        index.add("b", ["python"], [0.0, 1.0])
+        index.add("c", ["java"], [0.0, 1.0])
+
+        matches = index.search(["python"], [0.0, 1.0], limit=3, bm25_weight=0.5, vector_weight=0.5)
+
+        assert [match.profile_id for match in matches] == ["b", "a"]
+        assert matches[0].vector_score == pytest.approx(1.0)
+
+    def test_vector_only_fallback(self):
+        """Test ranking by embedding when no profile shares a query term."""
+        index = ProfileIndex()
+        index.add("a", ["python"], [1.0, 0.0])
+        index.add("b", ["react"], [0.6, 0.8])
+
+        matches = index.search(["golang"], [0.0, 1.0], limit=1, bm25_weight=0.5, vector_weight=0.5)
+
+        assert [match.profile_id for match in matches] == ["b"]
+
+    def test_profile_text(self):
+        """Test the text indexed for a profile."""
+        profile = SimpleNamespace(skills=["JS", "Python"], titles=["Senior  Engineer"], raw_text="Built APIs")
+
+        assert build_profile_text(profile) == "javascript python senior engineer Built APIs"
+
+    def test_compacts_tombstones(self):
+        """Test that re-indexing compacts dead rows once they pass the threshold."""
+        index = ProfileIndex(initial_capacity=2, compact_ratio=0.5, compact_min_rows=2)
+        index.add("a", ["python"], [1.0, 0.0])
+        index.add("b", ["react"], [0.0, 1.0])
+        index.add("a", ["golang"], [1.0, 0.0])
+        index.add("b", ["rust"], [0.0, 1.0])
+
+        assert index.tombstones == 0
+        assert len(index._ids) == 2
+        assert set(index._postings) == {"golang", "rust"}
+        matches = index.search(["rust"], [0.0, 1.0], limit=2, bm25_weight=0.5, vector_weight=0.5)
+        assert matches[0].profile_id == "b"
+        assert matches[0].vector_score == pytest.approx(1.0)
+
+    def test_rebuild_keeps_changes_made_while_loading(self):
+        """Test that profiles indexed during a rebuild survive the swap."""
+        index = ProfileIndex()
+        index.add("old", ["sales"])
+        index.track_changes()
+        index.add("new", ["python"])
+        index.remove("old")
+
+        index.rebuild([("old", ["sales"], None), ("stored", ["java"], None)])
+
+        assert sorted(index._rows) == ["new", "stored"]
+
+    def test_search_during_rebuild_and_compaction(self):
+        """Test that searches see consistent rows while another thread swaps them."""
+        def entry(number):
+            # Even profiles know python and point at the query; odd ones do not
+            if number % 2 == 0:
+                return f"p{number}", ["python", "engineer"], [1.0, 0.0]
+            return f"p{number}", ["react", "engineer"], [0.0, 1.0]
+
+        index = ProfileIndex(initial_capacity=4, compact_ratio=0.1, compact_min_rows=2)
+        index.rebuild([entry(number) for number in range(40)])
+        done = threading.Event()
+        errors = []
+
+        def writer():
+            try:
+                for round_number in range(60):
+                    index.rebuild([entry(number) for number in range(round_number % 7, 40 + round_number)])
+                    for number in range(10):
+                        # Re-adding tombstones rows and triggers compaction
+                        index.add(*entry(number))
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                done.set()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        searches = 0
+        while not done.is_set() or not searches:
+            for match in index.search(["python"], [1.0, 0.0], limit=5, bm25_weight=0.5, vector_weight=0.5):
+                number = int(match.profile_id[1:])
+                assert number % 2 == 0
+                assert match.bm25_score > 0
+                assert match.vector_score == pytest.approx(1.0)
+            searches += 1
+        thread.join()
+
+        assert not errors
+        assert searches > 0
+
+
+class TestProfileIndexLoader:
+    """Test loading the shared index from stored profiles."""
+
+    @pytest.fixture(autouse=True)
+    def _no_embeddings(self, monkeypatch):
+        monkeypatch.setattr("app.services.indexer.embed_texts", lambda texts: [None] * len(texts))
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        profile_index.rebuild([])
+        profile_index.loaded = False
+        self.calls = 0
+
+    def teardown_method(self):
+        """Tear down test fixtures."""
+        profile_index.rebuild([])
+        profile_index.loaded = False
+
+    async def _load(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return [SimpleNamespace(user_id="alice", skills=["Python"], titles=[], raw_text="APIs")]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_requests_build_once(self):
+        """Test that concurrent callers share a single rebuild."""
+        loader = ProfileIndexLoader(refresh_seconds=300)
+
+        await asyncio.gather(*(loader.ensure_loaded(self._load) for _ in range(5)))
+
+        assert self.calls == 1
+        assert "alice" in profile_index
+
+    @pytest.mark.asyncio
+    async def test_stale_index_refreshes_in_background(self):
+        """Test that a stale index is rebuilt without blocking the caller."""
+        loader = ProfileIndexLoader(refresh_seconds=0)
+        await loader.ensure_loaded(self._load)
+
+        await loader.ensure_loaded(self._load)
+        await loader._refresh
+
+        assert self.calls == 2
+
+
+class TestBatchEmbedding:
+    def test_embed_many_matches_embed(self):
+        """Test that batched profile embeddings equal one-at-a-time embeddings."""
+        client = LocalEmbeddingClient(dimensions=32)
+        texts = ["python docker engineer", "", "data analyst sql sql sql"]
+
+        assert client.embed_many(texts) == [client.embed(text) for text in texts]
@@ -0,0 +1,134 @@
+"""
+Tests for MongoDB query profiling.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.logging import clear_correlation_id, set_correlation_id
+from app.services.query_profiler import QueryProfiler, annotate_slow_queries, filter_shape
+
+
+def _started(command_name, command, request_id=1, database="job_portal"):
+    return SimpleNamespace(
+        command_name=command_name,
+        command=command,
+        request_id=request_id,
+        connection_id=("localhost", 27017),
+        database_name=database,
+    )
+
+
+def _succeeded(command_name, reply, duration_ms, request_id=1):
+    return SimpleNamespace(
+        command_name=command_name,
+        reply=reply,
+        request_id=request_id,
+        connection_id=("localhost", 27017),
+        duration_micros=int(duration_ms * 1000),
+    )
+
+
+class TestFilterShape:
+    """Test filter value stripping."""
+
+    def test_replaces_values(self):
+        """Test that literal values become placeholders."""
+        shape = filter_shape({"status": "active", "salary_max": {"$gte": 100000}})
+
+        assert shape == {"status": "?", "salary_max": {"$gte": "?"}}
+
+    def test_keeps_nested_clauses(self):
+        """Test that $and/$or clauses keep their structure."""
+        shape = filter_shape({"$or": [{"title": {"$regex": "py"}}, {"skills": {"$in": ["a", "b"]}}]})
+
+        assert shape == {"$or": [{"title": {"$regex": "?"}}, {"skills": {"$in": ["?"]}}]}
+
+
+class TestQueryProfiler:
+    """Test per-request query aggregation."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.profiler = QueryProfiler(slow_threshold_ms=50)
+
+    def teardown_method(self):
+        """Clean up after tests."""
+        clear_correlation_id()
+
+    def test_records_per_request_stats(self):
+        """Test that queries are attributed to the active correlation ID."""
+        set_correlation_id("req-1")
+        self.profiler.started(_started("find", {"find": "jobs", "filter": {"status": "active"}}))
+        self.profiler.succeeded(
+            _succeeded("find", {"cursor": {"firstBatch": [{}, {}, {}]}}, duration_ms=12)
+        )
+        self.profiler.started(_started("count", {"count": "jobs", "query": {}}, request_id=2))
+        self.profiler.succeeded(_succeeded("count", {"n": 42}, duration_ms=3, request_id=2))
+
+        stats = self.profiler.get_request_stats("req-1")
+        assert stats.query_count == 2
+        assert stats.total_time_ms == pytest.approx(15)
+        assert stats.docs_returned == 3 + 42
+        assert stats.commands == {"find": 1, "count": 1}
+        assert stats.slow_query_count == 0
+
+    def test_ignores_unmonitored_commands(self):
+        """Test that handshake and ping commands are not counted."""
+        set_correlation_id("req-2")
+        self.profiler.started(_started("ping", {"ping": 1}))
+        self.profiler.succeeded(_succeeded("ping", {"ok": 1}, duration_ms=1))
+
+        assert self.profiler.get_request_stats("req-2") is None
+
+    def test_samples_slow_queries(self):
+        """Test that slow queries are sampled with their filter shape."""
+        set_correlation_id("req-3")
+        command = {"find": "jobs", "filter": {"city": "Austin"}, "lsid": {"id": "x"}}
+        self.profiler.started(_started("find", command))
+        self.profiler.succeeded(_succeeded("find", {"cursor": {"firstBatch": []}}, duration_ms=80))
+
+        samples = self.profiler.slow_queries()
+        assert len(samples) == 1
+        assert samples[0].correlation_id == "req-3"
+        assert samples[0].collection == "jobs"
+        assert samples[0].filter_shape == {"city": "?"}
+        assert "lsid" not in samples[0].command
+        assert "command" not in samples[0].to_dict()
+        assert self.profiler.summary()["jobs.find"]["slow_count"] == 1
+
+    def test_failed_commands(self):
+        """Test that failed commands are counted as failures."""
+        set_correlation_id("req-4")
+        self.profiler.started(_started("find", {"find": "jobs", "filter": {}}))
+        self.profiler.failed(_succeeded("find", {}, duration_ms=5))
+
+        stats = self.profiler.get_request_stats("req-4")
+        assert stats.query_count == 1
+        assert stats.failed_count == 1
+
+    def test_request_history_is_bounded(self):
+        """Test that only the most recent requests are kept."""
+        profiler = QueryProfiler(max_requests=2)
+        for index in range(3):
+            set_correlation_id(f"req-{index}")
+            profiler.started(_started("find", {"find": "jobs"}, request_id=index))
+            profiler.succeeded(_succeeded("find", {}, duration_ms=1, request_id=index))
+
+        assert [stats.correlation_id for stats in profiler.recent_requests()] == ["req-2", "req-1"]
+
+    @pytest.mark.asyncio
+    async def test_annotate_slow_queries_with_explain(self):
+        """Test that explain output fills documents examined."""
+        set_correlation_id("req-5")
+        self.profiler.started(_started("find", {"find": "jobs", "filter": {}}))
+        self.profiler.succeeded(_succeeded("find", {"cursor": {"firstBatch": [{}]}}, duration_ms=90))
+
+        class FakeDatabase:
+            async def command(self, command):
+                assert command["verbosity"] == "executionStats"
+                return {"executionStats": {"totalDocsExamined": 500}}
+
+        samples = await annotate_slow_queries({"job_portal": FakeDatabase()}, self.profiler.slow_queries())
+
+        assert samples[0].docs_examined == 500
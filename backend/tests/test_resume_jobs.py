@@ -0,0 +1,194 @@
+"""
+Tests for the resume parsing queue.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pytest
+from docx import Document as DocxDocument
+
+from app.services.parse_cache import ParseCache
+from app.services.parsing import ParsedResume, ResumeParsingError, parse_resume_text
+from app.services.resume_jobs import ResumeParseQueue, ResumeParseStatus
+from tests.test_pdf_extraction import _write_pdf
+
+pytestmark = pytest.mark.asyncio
+
+
+def _fake_parser(path):
+    if path.name.startswith("bad"):
+        raise ResumeParsingError("Unable to extract text from resume")
+    if path.name.startswith("crash"):
+        raise RuntimeError("parser crashed")
+    return ParsedResume(raw_text=path.name, skills=["python"], titles=[])
+
+
+def _thread_queue(**kwargs):
+    return ResumeParseQueue(parser=_fake_parser, executor_factory=ThreadPoolExecutor, **kwargs)
+
+
+async def test_completed_job_runs_callback(tmp_path):
+    """Test that a parsed resume is applied before the job completes."""
+    queue = _thread_queue(max_workers=1)
+    applied = []
+
+    async def on_complete(job):
+        assert job.status == ResumeParseStatus.RUNNING
+        applied.append(job.result.raw_text)
+
+    job = queue.submit("user-1", tmp_path / "resume.docx", on_complete=on_complete)
+    assert job.status == ResumeParseStatus.QUEUED
+    await queue.join()
+    await queue.stop()
+
+    assert queue.get(job.job_id).status == ResumeParseStatus.COMPLETED
+    assert applied == ["resume.docx"]
+    assert job.parse_ms is not None
+    metrics = queue.metrics()
+    assert metrics["completed"] == 1
+    assert metrics["queue_depth"] == 0
+
+
+async def test_parse_errors_fail_the_job(tmp_path):
+    """Test that parser errors are reported on the job handle."""
+    queue = _thread_queue(max_workers=2)
+
+    bad = queue.submit("user-1", tmp_path / "bad.pdf")
+    crash = queue.submit("user-1", tmp_path / "crash.pdf")
+    await queue.join()
+    await queue.stop()
+
+    assert bad.status == ResumeParseStatus.FAILED
+    assert bad.error == "Unable to extract text from resume"
+    assert crash.status == ResumeParseStatus.FAILED
+    assert crash.error == "Resume could not be parsed"
+    assert queue.metrics()["failed"] == 2
+
+
+async def test_failing_callback_fails_the_job(tmp_path):
+    """Test that a result which cannot be saved is not reported as completed."""
+    queue = _thread_queue(max_workers=1)
+
+    async def on_complete(job):
+        raise RuntimeError("database unavailable")
+
+    job = queue.submit("user-1", tmp_path / "resume.pdf", on_complete=on_complete)
+    await queue.join()
+    await queue.stop()
+
+    assert job.status == ResumeParseStatus.FAILED
+
+
+async def test_in_use_tracks_unfinished_jobs(tmp_path):
+    """Test that a shared resume file counts as in use until every job is done."""
+    queue = _thread_queue(max_workers=1)
+    path = tmp_path / "resume.pdf"
+    seen = []
+
+    async def on_complete(job):
+        seen.append(queue.in_use(job.path, exclude=job))
+
+    queue.submit("user-1", path, on_complete=on_complete)
+    queue.submit("user-1", path, on_complete=on_complete)
+    await queue.join()
+    await queue.stop()
+
+    assert seen == [True, False]
+    assert not queue.in_use(str(path))
+
+
+async def test_finished_jobs_are_bounded(tmp_path):
+    """Test that old finished jobs are evicted."""
+    queue = _thread_queue(max_workers=1, max_jobs=2)
+
+    first = queue.submit("user-1", tmp_path / "a.pdf")
+    await queue.join()
+    queue.submit("user-1", tmp_path / "b.pdf")
+    queue.submit("user-1", tmp_path / "c.pdf")
+    await queue.join()
+    await queue.stop()
+
+    assert queue.get(first.job_id) is None
+
+
+async def test_process_pool_parses_docx(tmp_path):
+    """Test parsing a real resume in the process pool."""
+    document = DocxDocument()
+    document.add_paragraph("Software Engineer")
+    document.add_paragraph("Skills: Python, Docker")
+    buffer = BytesIO()
+    document.save(buffer)
+    path = tmp_path / "resume.docx"
+    path.write_bytes(buffer.getvalue())
+
+    queue = ResumeParseQueue(max_workers=1)
+    job = queue.submit("user-1", path)
+    await queue.join()
+    await queue.stop()
+
+    assert job.status == ResumeParseStatus.COMPLETED
+    assert "python" in job.result.skills
+
+
+async def test_cache_hit_skips_parsing(tmp_path):
+    """Test that a known content hash is applied without parsing."""
+    calls = []
+
+    def counting_parser(path):
+        calls.append(path)
+        return _fake_parser(path)
+
+    queue = ResumeParseQueue(
+        parser=counting_parser,
+        executor_factory=ThreadPoolExecutor,
+        cache=ParseCache(),
+        max_workers=1,
+    )
+    first = queue.submit("user-1", tmp_path / "resume.pdf", content_hash="abc")
+    await queue.join()
+    second = queue.submit("user-2", tmp_path / "copy.pdf", content_hash="abc")
+    await queue.join()
+    await queue.stop()
+
+    assert len(calls) == 1
+    assert first.cache_hit is False
+    assert second.cache_hit is True
+    assert second.status == ResumeParseStatus.COMPLETED
+    assert second.result.raw_text == "resume.pdf"
+    assert queue.metrics()["cache"]["hits"] == 1
+
+
+async def test_pdf_pages_split_across_pool(tmp_path):
+    """Test that a long PDF is parsed with its pages spread over the pool."""
+    path = _write_pdf(tmp_path / "portfolio.pdf", ["Data Engineer"] + [f"Python project {i}" for i in range(11)])
+
+    queue = ResumeParseQueue(max_workers=2, cache=None)
+    assert queue.split_pdf_pages is True
+    job = queue.submit("user-1", path)
+    await queue.join()
+    await queue.stop()
+
+    assert job.status == ResumeParseStatus.COMPLETED
+    assert job.result.page_count == 12
+    assert len(job.result.page_timings) == 12
+    assert job.result.skills == ["python"]
+    assert job.result.titles == ["Data Engineer"]
+
+
+async def test_pdf_text_analyzed_in_pool(tmp_path):
+    """Test that PDF skill/title parsing runs in the pool, not the API process."""
+    submitted = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(fn)
+            return super().submit(fn, *args, **kwargs)
+
+    path = _write_pdf(tmp_path / "resume.pdf", ["Data Engineer", "Python"])
+    queue = ResumeParseQueue(max_workers=1, cache=None, executor_factory=RecordingExecutor)
+    job = queue.submit("user-1", path)
+    await queue.join()
+    await queue.stop()
+
+    assert job.result.skills == ["python"]
+    assert parse_resume_text in submitted
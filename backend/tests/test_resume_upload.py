@@ -7,6 +7,7 @@ from docx import Document as DocxDocument
 from app.core.config import settings
 from app.models.profile import Profile
 from app.models.user import User
+from app.services.resume_jobs import resume_parse_queue
 
 pytestmark = pytest.mark.asyncio
 
@@ -61,8 +62,15 @@ async def test_resume_upload_creates_profile(app_client, tmp_path, monkeypatch):
             )
         },
     )
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+
+    await resume_parse_queue.join()
+    response = await app_client.get(job["status_url"], headers={"Authorization": f"Bearer {token}"})
     assert response.status_code == 200
-    payload = response.json()
+    assert response.json()["status"] == "completed"
+    payload = response.json()["profile"]
     assert payload["user_id"] == str((await User.find_one(User.email == email)).id)
     assert "python" in payload["skills"]
     assert any("Software Engineer" in title for title in payload["titles"])
@@ -89,3 +97,20 @@ async def test_resume_upload_rejects_unsupported_type(app_client, tmp_path, monk
     )
     assert response.status_code == 400
     assert "Unsupported resume format" in response.json()["detail"]
+
+
+async def test_resume_upload_rejects_oversized_file(app_client, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "resume_storage_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 1024)
+    email = "too-large@example.com"
+    password = "StrongPass!123"
+    await register(app_client, email, password, "seeker")
+    token = await login(app_client, email, password)
+
+    response = await app_client.post(
+        "/api/v1/uploads/resume",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": ("resume.pdf", b"%PDF" + b"0" * 4096, "application/pdf")},
+    )
+    assert response.status_code == 413
+    assert list(tmp_path.iterdir()) == []
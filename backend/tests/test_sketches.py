@@ -0,0 +1,107 @@
+"""
+Tests for mergeable metrics sketches.
+"""
+import random
+
+import pytest
+
+from app.services.sketches import HyperLogLog, KLLSketch, QuantileSketch
+
+
+def _rank(values, estimate):
+    return sum(1 for value in values if value <= estimate) / len(values)
+
+
+class TestHyperLogLog:
+    def test_small_counts_are_exact(self):
+        """Test that small cardinalities are counted exactly."""
+        sketch = HyperLogLog()
+        sketch.update(["user_1", "user_2", "user_3", "user_1"])
+
+        assert sketch.count() == 3
+        assert HyperLogLog().count() == 0
+
+    def test_large_count_within_error(self):
+        """Test estimation error on a large cardinality."""
+        sketch = HyperLogLog()
+        sketch.update(f"user_{i}" for i in range(50_000))
+
+        assert abs(sketch.count() - 50_000) / 50_000 < 0.05
+
+    def test_merge_counts_union(self):
+        """Test that merged sketches count the union, sparse or dense."""
+        first, second = HyperLogLog(), HyperLogLog()
+        first.update(f"user_{i}" for i in range(0, 6000))
+        second.update(f"user_{i}" for i in range(4000, 10_000))
+        small = HyperLogLog()
+        small.update(["user_1", "someone_else"])
+
+        merged = first.copy()
+        merged.merge(second)
+        merged.merge(small)
+
+        assert abs(merged.count() - 10_001) / 10_001 < 0.05
+        assert abs(first.count() - 6000) / 6000 < 0.05
+
+    def test_merge_rejects_different_precision(self):
+        """Test that sketches with different register counts cannot merge."""
+        with pytest.raises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+
+class TestKLLSketch:
+    def test_quantiles_within_rank_error(self):
+        """Test p50/p90/p99 rank error and bounded memory."""
+        rng = random.Random(3)
+        values = [rng.expovariate(1 / 3600) for _ in range(50_000)]
+        sketch = KLLSketch(seed=3)
+        for value in values:
+            sketch.add(value)
+
+        for fraction, estimate in zip((0.5, 0.9, 0.99), sketch.quantiles([0.5, 0.9, 0.99])):
+            assert abs(_rank(values, estimate) - fraction) < 0.02
+        assert sketch.count == 50_000
+        assert sum(map(len, sketch._levels)) < 3 * sketch.k
+
+    def test_merged_sketches_match_single_stream(self):
+        """Test that per-bucket sketches merge into an accurate whole."""
+        rng = random.Random(5)
+        values = [rng.uniform(0, 1000) for _ in range(20_000)]
+        buckets = [KLLSketch(seed=index) for index in range(10)]
+        for index, value in enumerate(values):
+            buckets[index % 10].add(value)
+
+        merged = buckets[0].copy()
+        for bucket in buckets[1:]:
+            merged.merge(bucket)
+
+        assert merged.count == 20_000
+        assert abs(_rank(values, merged.quantiles([0.9])[0]) - 0.9) < 0.02
+
+
+class TestQuantileSketch:
+    def test_exact_mode_interpolates(self):
+        """Test exact quantiles for small inputs, including an even-sized median."""
+        sketch = QuantileSketch()
+        for value in (4000.0, 1000.0, 3000.0, 2000.0):
+            sketch.add(value)
+
+        assert sketch.exact is True
+        assert sketch.quantiles([0.5, 1.0]) == [2500.0, 4000.0]
+        assert QuantileSketch().quantile(0.5) is None
+
+    def test_switches_to_kll_past_limit(self):
+        """Test that merging past the exact limit falls back to the sketch."""
+        first, second = QuantileSketch(exact_limit=100), QuantileSketch(exact_limit=100)
+        for value in range(80):
+            first.add(float(value))
+            second.add(float(value + 80))
+
+        combined = QuantileSketch(exact_limit=100)
+        combined.merge(first)
+        assert combined.exact is True
+        combined.merge(second)
+
+        assert combined.exact is False
+        assert combined.count == 160
+        assert abs(combined.quantile(0.5) - 80) <= 4
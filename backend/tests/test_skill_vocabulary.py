@@ -0,0 +1,157 @@
+"""
+Tests for the skill vocabulary and bitset scoring.
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.ai.matching import jaccard_similarity, skill_jaccard_similarity
+from app.services.scoring import rank_jobs
+from app.services.skill_vocabulary import (
+    SkillVocabulary,
+    jaccard_scores,
+    overlap_counts,
+    popcount,
+    shared_skills,
+)
+
+
+class TestSkillVocabulary:
+    """Test skill encoding."""
+
+    def test_skills_are_normalized(self):
+        """Test that aliases and case map to one bit."""
+        vocabulary = SkillVocabulary()
+
+        assert vocabulary.add(["JS", "javascript", "Python"]) == [0, 1]
+        assert len(vocabulary) == 2
+        assert "javascript" in vocabulary
+
+    def test_round_trip(self):
+        """Test that decoding returns the encoded skills."""
+        vocabulary = SkillVocabulary(["go", "rust"])
+
+        row = vocabulary.encode(["rust", "python"], register=True)
+
+        assert sorted(vocabulary.decode(row)) == ["python", "rust"]
+
+    def test_encode_does_not_register_unknown_skills(self):
+        """Test that query and profile skills never grow the vocabulary."""
+        vocabulary = SkillVocabulary(["go", "rust"])
+
+        rows, sizes = vocabulary.encode_sets([["rust", "made-up skill", "another one"]])
+
+        assert len(vocabulary) == 2
+        assert vocabulary.decode(rows[0]) == ["rust"]
+        assert sizes.tolist() == [3]
+
+    def test_width_grows_past_one_word(self):
+        """Test encoding once the vocabulary exceeds 64 skills."""
+        vocabulary = SkillVocabulary(f"skill {index}" for index in range(70))
+
+        row = vocabulary.encode(["skill 0", "skill 69"])
+
+        assert vocabulary.width == 2
+        assert row.shape == (2,)
+        assert vocabulary.decode(row) == ["skill 0", "skill 69"]
+
+    def test_popcount(self):
+        """Test set-bit counts per row."""
+        words = np.array([[0, 0], [0xFF, 1], [2**64 - 1, 2**64 - 1]], dtype=np.uint64)
+
+        assert popcount(words).tolist() == [0, 9, 128]
+
+
+class TestBitsetScores:
+    """Test overlap and Jaccard over candidate sets."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vocabulary = SkillVocabulary(["python", "sql", "docker", "react"])
+
+    def test_jaccard_and_overlap(self):
+        """Test scores for several candidates at once."""
+        query = self.vocabulary.encode(["python", "sql", "docker"])
+        candidates = self.vocabulary.encode_many([
+            ["python", "sql", "docker"],
+            ["python", "react"],
+            [],
+        ])
+
+        assert overlap_counts(query, candidates).tolist() == [3, 1, 0]
+        assert jaccard_scores(query, candidates).tolist() == pytest.approx([1.0, 0.25, 0.0])
+
+    def test_rows_of_different_width(self):
+        """Test that rows encoded before the vocabulary grew still align."""
+        query = self.vocabulary.encode(["python"])
+        candidates = self.vocabulary.encode_many([["python"] + [f"tool {i}" for i in range(80)]], register=True)
+
+        shared = shared_skills(query, candidates)
+
+        assert self.vocabulary.decode(shared[0]) == ["python"]
+
+    def test_pairwise_jaccard(self):
+        """Test the pairwise helper used by calculate_match_score."""
+        assert skill_jaccard_similarity(["Python", "SQL"], ["python", "react"]) == pytest.approx(1 / 3)
+        assert skill_jaccard_similarity(["py"], ["python"]) == 1.0
+        assert skill_jaccard_similarity([], ["python"]) == 0.0
+
+    def test_plain_jaccard_does_not_normalize(self):
+        """Test that jaccard_similarity only lowercases, as before normalization."""
+        assert jaccard_similarity(["Python", "SQL"], ["python", "react"]) == pytest.approx(1 / 3)
+        assert jaccard_similarity(["py"], ["python"]) == 0.0
+        assert jaccard_similarity(["ML"], ["ml", "Machine Learning"]) == pytest.approx(1 / 2)
+
+    def test_unknown_skills_count_towards_union(self):
+        """Test that unregistered profile skills still lower the Jaccard score."""
+        query, query_size = self.vocabulary.encode_sets([["python", "sql"]])
+        candidates, sizes = self.vocabulary.encode_sets([["python", "brainfuck"], ["python", "sql"]])
+
+        scores = jaccard_scores(query[0], candidates, query_size[0], sizes)
+
+        assert scores.tolist() == pytest.approx([1 / 3, 1.0])
+
+
+class TestRankJobsSkillExplanations:
+    """Test matched-skill explanations in rank_jobs."""
+
+    def test_matched_skills_in_job_order(self):
+        """Test that shared skills are explained in the job's skill order."""
+        jobs = [
+            SimpleNamespace(title="Backend", tokens=["python"], embedding=None, skills=["sql", "go", "python"]),
+            SimpleNamespace(title="Frontend", tokens=["react"], embedding=None, skills=["react"]),
+        ]
+
+        results = rank_jobs(
+            jobs,
+            query_tokens=["python"],
+            query_vector=[],
+            limit=2,
+            bm25_weight=1.0,
+            vector_weight=0.0,
+            profile_skills=["python", "sql"],
+        )
+
+        by_title = {result.job.title: result for result in results}
+        backend_skills = [e["label"] for e in by_title["Backend"].explanations if e["source"] == "skill"]
+        frontend_skills = [e["label"] for e in by_title["Frontend"].explanations if e["source"] == "skill"]
+        assert backend_skills == ["sql", "python"]
+        assert frontend_skills == []
+
+    def test_aliased_job_skills_are_explained(self):
+        """Test that job skills written as aliases are matched by canonical name."""
+        jobs = [SimpleNamespace(title="Web", tokens=["react"], embedding=None, skills=["Python", "JS", "ReactJS"])]
+
+        results = rank_jobs(
+            jobs,
+            query_tokens=["react"],
+            query_vector=[],
+            limit=1,
+            bm25_weight=1.0,
+            vector_weight=0.0,
+            profile_skills=["python", "javascript", "react"],
+        )
+
+        labels = [e["label"] for e in results[0].explanations if e["source"] == "skill"]
+        assert labels == ["python", "javascript", "react"]
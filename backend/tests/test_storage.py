@@ -0,0 +1,68 @@
+"""
+Tests for streaming upload storage.
+"""
+import hashlib
+from io import BytesIO
+
+import pytest
+
+from app.services.storage import EmptyUploadError, UploadTooLargeError, store_upload
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeUpload:
+    """Async reader over in-memory bytes that records chunk reads."""
+
+    def __init__(self, data: bytes):
+        self._buffer = BytesIO(data)
+        self.bytes_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        chunk = self._buffer.read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+async def test_stores_file_named_by_hash(tmp_path):
+    """Test that content is written under its SHA-256 digest."""
+    data = b"resume contents" * 1000
+
+    stored = await store_upload(FakeUpload(data), tmp_path, "user1", ".pdf", chunk_size=1024)
+
+    digest = hashlib.sha256(data).hexdigest()
+    assert stored.sha256 == digest
+    assert stored.size == len(data)
+    assert stored.path == tmp_path / f"user1_{digest}.pdf"
+    assert stored.path.read_bytes() == data
+    assert stored.deduplicated is False
+    assert list(tmp_path.iterdir()) == [stored.path]
+
+
+async def test_repeated_upload_is_deduplicated(tmp_path):
+    """Test that identical content reuses the stored file."""
+    first = await store_upload(FakeUpload(b"same"), tmp_path, "user1", ".pdf")
+    second = await store_upload(FakeUpload(b"same"), tmp_path, "user1", ".pdf")
+
+    assert second.deduplicated is True
+    assert second.path == first.path
+    assert list(tmp_path.iterdir()) == [first.path]
+
+
+async def test_size_limit_stops_reading(tmp_path):
+    """Test that oversized uploads are rejected mid-stream."""
+    upload = FakeUpload(b"x" * 10_000)
+
+    with pytest.raises(UploadTooLargeError):
+        await store_upload(upload, tmp_path, "user1", ".pdf", max_size=2048, chunk_size=1024)
+
+    assert upload.bytes_read == 3072
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_empty_upload(tmp_path):
+    """Test that empty uploads leave no file behind."""
+    with pytest.raises(EmptyUploadError):
+        await store_upload(FakeUpload(b""), tmp_path, "user1", ".docx")
+
+    assert list(tmp_path.iterdir()) == []
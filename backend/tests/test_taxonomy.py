@@ -0,0 +1,79 @@
+"""
+Tests for the skill taxonomy service.
+"""
+from app.services.normalization import normalize_skills
+from app.services.parsing import _parse_skills
+from app.services.taxonomy import SkillTaxonomy, get_skill_taxonomy
+
+
+def _taxonomy():
+    return SkillTaxonomy.from_rows([
+        ["javascript", "js", "ecmascript"],
+        ["nodejs", "node", "node.js"],
+        ["machine learning", "ml"],
+        ["postgresql", "postgres"],
+    ])
+
+
+class TestSkillTaxonomy:
+    def test_resolves_aliases(self):
+        """Test alias lookups regardless of case, underscores and spacing."""
+        taxonomy = _taxonomy()
+
+        assert taxonomy.resolve("JS") == "javascript"
+        assert taxonomy.resolve("Node.js") == "nodejs"
+        assert taxonomy.resolve("machine_learning") == "machine learning"
+        assert taxonomy.resolve("cobol") is None
+        assert taxonomy.normalize(" Cobol ") == "cobol"
+
+    def test_extracts_canonical_skills(self):
+        """Test that aliases in text are reported by canonical name."""
+        taxonomy = _taxonomy()
+
+        text = "Built Node.js services on Postgres; ML and JS tooling."
+        assert taxonomy.extract(text) == ["javascript", "machine learning", "nodejs", "postgresql"]
+
+    def test_first_row_claims_alias(self):
+        """Test that duplicate aliases keep their first canonical skill."""
+        taxonomy = SkillTaxonomy.from_rows([["golang", "go lang"], ["go lang"]])
+
+        assert taxonomy.resolve("go lang") == "golang"
+
+    def test_tsv_round_trip(self, tmp_path):
+        """Test loading a TSV and a compiled pickle."""
+        source = tmp_path / "skills.tsv"
+        source.write_text("# canonical\taliases\npython\tpy\npostgresql\tpostgres\tpsql\n")
+        compiled = tmp_path / "skills.pkl"
+
+        taxonomy = SkillTaxonomy.from_tsv(source)
+        taxonomy.dump(compiled, source_digest="abc")
+        loaded = SkillTaxonomy.load(compiled, source_digest="abc")
+
+        assert loaded.aliases == taxonomy.aliases
+        assert loaded.extract("psql and py") == ["postgresql", "python"]
+
+    def test_stale_pickle_is_ignored(self, tmp_path):
+        """Test that a pickle built from another TSV is not used."""
+        compiled = tmp_path / "skills.pkl"
+        _taxonomy().dump(compiled, source_digest="old")
+
+        assert SkillTaxonomy.load(compiled, source_digest="new") is None
+        assert SkillTaxonomy.load(tmp_path / "missing.pkl") is None
+
+
+class TestSharedTaxonomy:
+    def test_parsing_and_normalization_agree(self):
+        """Test that parsed resume skills are already normalized."""
+        skills = _parse_skills("Python, JS, Node.js, Postgres and k8s")
+
+        assert skills == ["javascript", "kubernetes", "nodejs", "postgresql", "python"]
+        assert normalize_skills(["py", "JavaScript", "node", "PostgreSQL", "Kubernetes"]) == [
+            "python", "javascript", "nodejs", "postgresql", "kubernetes"
+        ]
+
+    def test_bundled_taxonomy_loads(self):
+        """Test the bundled taxonomy file."""
+        taxonomy = get_skill_taxonomy()
+
+        assert taxonomy.resolve("C Sharp") == "c#"
+        assert "machine learning" in taxonomy.canonical_skills